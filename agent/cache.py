@@ -0,0 +1,368 @@
+"""
+Persistent caches backed by a single SQLite file each.
+
+DiskLRUCache is a small key -> bytes store with a byte budget (least
+recently used entries are evicted first) and an optional TTL.
+EmbeddingCache builds on it to remember embeddings by (model name, text),
+so chunks, job titles and queries are encoded once across sessions; the
+"llm" cache holds Gemini responses (see GeminiLLM) and ExtractionCache
+the text extracted from PDF / DOCX files (see extract_text).
+
+    python -m agent.cache stats       # entries, size and budget of each cache
+    python -m agent.cache clear
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import List
+import numpy as np
+from agent.models.registry import LazyModel
+from agent.rag.vector_store import chunk_key
+from agent.utils import load_config
+
+CACHE_DIR = os.path.join("data", "cache")
+EMBEDDING_CACHE_FILE = "embeddings.sqlite"
+DEFAULT_EMBEDDING_CACHE_MB = 256
+LLM_CACHE_FILE = "llm_responses.sqlite"
+DEFAULT_LLM_CACHE_MB = 64
+DEFAULT_LLM_TTL_HOURS = 24
+EXTRACTION_CACHE_FILE = "extracted_text.sqlite"
+DEFAULT_EXTRACTION_CACHE_MB = 128
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_MAX_PARAMS = 900
+
+
+class DiskLRUCache:
+    def __init__(self, path: str, max_bytes: int, ttl: float = None):
+        """
+        path: SQLite file (created on first use).
+        max_bytes: budget for the stored values; exceeding it evicts the least
+        recently read entries.
+        ttl: seconds after which an entry counts as a miss (None = never).
+        Safe to share between threads; several processes may use the same file.
+        """
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._bytes = self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    def _fresh(self, created: float, now: float) -> bool:
+        return self.ttl is None or now - created <= self.ttl
+
+    # ---------- reads ----------
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> dict:
+        """Return {key: value} for the keys present and not expired."""
+        found = {}
+        if not keys:
+            return found
+        now = time.time()
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), _MAX_PARAMS):
+                part = unique[start:start + _MAX_PARAMS]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created FROM entries WHERE key IN ({marks})", part
+                ).fetchall()
+                found.update((k, v) for k, v, created in rows if self._fresh(created, now))
+            for start in range(0, len(found), _MAX_PARAMS):
+                part = list(found)[start:start + _MAX_PARAMS]
+                marks = ",".join("?" * len(part))
+                self._conn.execute(f"UPDATE entries SET accessed = ? WHERE key IN ({marks})", [now] + part)
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    # ---------- writes ----------
+    def put(self, key: str, value: bytes):
+        self.put_many({key: value})
+
+    def put_many(self, items: dict):
+        if not items:
+            return
+        now = time.time()
+        rows = [(k, sqlite3.Binary(v), len(v), now, now) for k, v in items.items() if len(v) <= self.max_bytes]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._bytes += sum(r[2] for r in rows)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently read entries until the cache is at 90% of its budget."""
+        self._bytes = self._total_bytes()  # other processes may have written too
+        target = int(self.max_bytes * 0.9)
+        if self._bytes <= self.max_bytes:
+            return
+        victims, freed = [], 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if self._bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._bytes -= freed
+        self.evictions += len(victims)
+
+    def purge_expired(self) -> int:
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)).rowcount
+            self._bytes = self._total_bytes()
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- stats ----------
+    def __len__(self):
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": len(self),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class EmbeddingCache:
+    def __init__(self, cache: DiskLRUCache):
+        """Embeddings stored as raw float32 vectors, keyed by sha1(model name, text)."""
+        self.cache = cache
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return chunk_key(model_name, text).hex()
+
+    def get_many(self, model_name: str, texts: List[str]) -> dict:
+        """Return {index in texts: vector} for the texts already cached."""
+        keys = [self.key(model_name, t) for t in texts]
+        found = self.cache.get_many(keys)
+        return {i: np.frombuffer(found[k], dtype=np.float32) for i, k in enumerate(keys) if k in found}
+
+    def put_many(self, model_name: str, texts: List[str], vectors):
+        self.cache.put_many({
+            self.key(model_name, t): np.asarray(v, dtype=np.float32).tobytes()
+            for t, v in zip(texts, vectors)
+        })
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+class ExtractionCache:
+    def __init__(self, cache: DiskLRUCache):
+        """
+        Extracted text keyed by sha1(extractor version, file content), so a
+        renamed or copied file still hits and any extractor change misses.
+        A second entry per path remembers (size, mtime) -> content hash, so
+        an unchanged file is not even read to be hashed.
+        """
+        self.cache = cache
+
+    @staticmethod
+    def file_digest(path: str) -> str:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    @staticmethod
+    def _text_key(version: str, digest: str) -> str:
+        return "text:" + hashlib.sha1(f"{version}\0{digest}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _stat_key(version: str, path: str) -> str:
+        return "stat:" + hashlib.sha1(f"{version}\0{os.path.abspath(path)}".encode("utf-8")).hexdigest()
+
+    def _signature(self, path: str):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def get(self, path: str, version: str):
+        """Cached text of the file at path, or None."""
+        signature = self._signature(path)
+        stat_key = self._stat_key(version, path)
+        entry = self.cache.get(stat_key)
+        digest = None
+        if entry is not None:
+            entry = json.loads(entry)
+            if entry.get("signature") == signature:
+                digest = entry["digest"]
+        known_stat = digest is not None
+        digest = digest or self.file_digest(path)
+        text = self.cache.get(self._text_key(version, digest))
+        if text is None:
+            return None
+        if not known_stat:
+            # same content under a new path / mtime: remember it so the next lookup skips hashing
+            self.cache.put(stat_key, json.dumps({"signature": signature, "digest": digest}).encode("utf-8"))
+        return text.decode("utf-8")
+
+    def put(self, path: str, version: str, text: str):
+        signature = self._signature(path)
+        digest = self.file_digest(path)
+        self.cache.put_many({
+            self._text_key(version, digest): text.encode("utf-8"),
+            self._stat_key(version, path): json.dumps({"signature": signature, "digest": digest}).encode("utf-8"),
+        })
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+# name -> (file, config key for the size budget in MB, default MB, config key for the TTL in hours)
+CACHES = {
+    "embeddings": (EMBEDDING_CACHE_FILE, "embeddings_max_mb", DEFAULT_EMBEDDING_CACHE_MB, None),
+    "llm": (LLM_CACHE_FILE, "llm_max_mb", DEFAULT_LLM_CACHE_MB, "llm_ttl_hours"),
+    "extraction": (EXTRACTION_CACHE_FILE, "extraction_max_mb", DEFAULT_EXTRACTION_CACHE_MB, None),
+}
+
+
+def _cache_config() -> dict:
+    return (load_config() or {}).get("cache", {}) or {}
+
+
+def get_cache(name: str):
+    """
+    Process-wide DiskLRUCache `name` (see CACHES) configured by the `cache`
+    block of configs/config.yaml, or None if caching is disabled or the
+    cache file cannot be opened (callers then simply skip the cache).
+    """
+    with _caches_lock:
+        if name not in _caches:
+            filename, size_key, default_mb, ttl_key = CACHES[name]
+            cfg = _cache_config()
+            cache = None
+            if cfg.get("enabled", True):
+                try:
+                    ttl_hours = cfg.get(ttl_key, DEFAULT_LLM_TTL_HOURS) if ttl_key else None
+                    cache = DiskLRUCache(os.path.join(cfg.get("dir", CACHE_DIR), filename),
+                                         max_bytes=int(cfg.get(size_key, default_mb) * 2 ** 20),
+                                         ttl=ttl_hours * 3600 if ttl_hours else None)
+                except Exception as e:
+                    print(f"⚠️ {name} cache disabled: {e}")
+            _caches[name] = cache
+        return _caches[name]
+
+
+def get_embedding_cache():
+    cache = get_cache("embeddings")
+    return EmbeddingCache(cache) if cache is not None else None
+
+
+def get_extraction_cache():
+    cache = get_cache("extraction")
+    return ExtractionCache(cache) if cache is not None else None
+
+
+def cached_encode(model, texts: List[str], model_name: str = None, use_cache: bool = True,
+                  **encode_kwargs) -> np.ndarray:
+    """
+    model.encode(texts) through the embedding cache: cached texts are read
+    back, the rest are encoded in one call and written to the cache.
+    Returns a float32 (len(texts), dim) matrix of raw (unnormalized) vectors.
+    """
+    if not len(texts):
+        # a lazy registry model knows its size without loading its weights
+        dim = model.dimension if isinstance(model, LazyModel) else model.get_sentence_embedding_dimension()
+        return np.empty((0, dim), dtype=np.float32)
+    model_name = model_name or getattr(model, "name", None)
+    cache = get_embedding_cache() if use_cache else None
+    found = cache.get_many(model_name, texts) if cache else {}
+    missing = [i for i in range(len(texts)) if i not in found]
+    fresh = None
+    if missing:
+        encode_kwargs.setdefault("show_progress_bar", False)
+        fresh = np.asarray(model.encode([texts[i] for i in missing], **encode_kwargs), dtype=np.float32)
+        if cache:
+            cache.put_many(model_name, [texts[i] for i in missing], fresh)
+    dim = fresh.shape[1] if fresh is not None else len(next(iter(found.values())))
+    matrix = np.empty((len(texts), dim), dtype=np.float32)
+    if fresh is not None:
+        matrix[missing] = fresh
+    for i, vec in found.items():
+        matrix[i] = vec
+    return matrix
+
+
+def cache_stats() -> list:
+    """Stats of every cache opened in this process."""
+    with _caches_lock:
+        caches = [(name, c) for name, c in _caches.items() if c is not None]
+    return [dict(c.stats(), name=name) for name, c in caches]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "stats"
+    if command not in ("stats", "clear"):
+        print("usage: python -m agent.cache [stats|clear]")
+        return 1
+    for name in CACHES:
+        cache = get_cache(name)
+        if cache is None:
+            print(f"{name}: disabled")
+        elif command == "clear":
+            cache.clear()
+            print(f"🧹 Cleared {cache.path}")
+        else:
+            s = cache.stats()
+            print(f"{name}: {s['path']}: {s['entries']} entries, "
+                  f"{s['bytes'] / 2**20:.1f} / {s['max_bytes'] / 2**20:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,12 @@ import os
 import sys
 import time
 import itertools
+from functools import cached_property
 from rich.console import Console
-from agent.models.llm_interface import GeminiLLM
-from agent.memory import ResumeMemory
-from agent.rag.pipeline import RAGPipeline
-from agent.tools.ats_score import ATSAnalyzer
-from agent.tools.resume_optimizer import ResumeOptimizer
-from agent.tools.linkedin_search import LinkedInSearch
-from agent.tools.file_parser import extract_text
+from agent.models.base_llm import create_llm
+from agent.models.registry import model_stats
 from agent.ui.terminal_ui import show_banner
+from agent.ui.previews import resume_preview_html, ats_report_html, write_preview, open_preview
 import webbrowser
 import html
 console = Console()
@@ -19,18 +16,44 @@ console = Console()
 class ResuminiAgent:
     def __init__(self, resume_path=None):
         # console.print("Initializing agent...")
-        self.llm = GeminiLLM()
-        self.memory = ResumeMemory()
-        self.rag = RAGPipeline(self.llm, self.memory)
-        self.ats = ATSAnalyzer(self.llm)
-        self.optimizer = ResumeOptimizer(self.llm)
-        self.linkedin = LinkedInSearch(self.llm)
+        # llm, memory, rag, ats, optimizer and linkedin are built (and their
+        # heavy dependencies imported) the first time a command uses them
         self.current_resume_text = None
         # console.print("✅ Agent Initialized successfully!\n")
 
         if resume_path:
             self.load_resume(resume_path)
 
+    # 💤 Lazily constructed components
+    @cached_property
+    def llm(self):
+        return create_llm()
+
+    @cached_property
+    def memory(self):
+        from agent.memory import ResumeMemory
+        return ResumeMemory()
+
+    @cached_property
+    def rag(self):
+        from agent.rag.pipeline import RAGPipeline
+        return RAGPipeline(self.llm, self.memory)
+
+    @cached_property
+    def ats(self):
+        from agent.tools.ats_score import ATSAnalyzer
+        return ATSAnalyzer(self.llm)
+
+    @cached_property
+    def optimizer(self):
+        from agent.tools.resume_optimizer import ResumeOptimizer
+        return ResumeOptimizer(self.llm)
+
+    @cached_property
+    def linkedin(self):
+        from agent.tools.linkedin_search import LinkedInSearch
+        return LinkedInSearch(self.llm)
+
     # ✨ Clean typing effect
     def stream_text(self, text: str, delay: float = 0.002):
         sys.stdout.write("\r")
@@ -44,6 +67,17 @@ class ResuminiAgent:
         sys.stdout.write("\n")
         sys.stdout.flush()
 
+    def render_stream(self, chunks) -> str:
+        """Print LLM chunks as they arrive; returns the full text."""
+        parts = []
+        for chunk in chunks:
+            sys.stdout.write(chunk.replace("\r", ""))
+            sys.stdout.flush()
+            parts.append(chunk)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return "".join(parts)
+
     # Resume Loader + Vector DB
     def load_resume(self, file_path):
         import platform, subprocess
@@ -56,25 +90,28 @@ class ResuminiAgent:
 
         self.loaded_resume_path = os.path.abspath(file_path)
 
-        resume_name = os.path.splitext(os.path.basename(file_path))[0]
-        db_dir = os.path.join("data", "vector_dbs", resume_name)
-        os.makedirs(db_dir, exist_ok=True)
+        # Recently loaded resumes come back from the session cache without
+        # re-extracting or re-reading their vector store
+        from agent.resume_cache import get_resume_cache
+        from agent.rag.pipeline import RAGPipeline
 
         try:
-            text = extract_text(file_path)
-            console.print("✔  Embedding resume into memory...")
-            time.sleep(1.2)
-            if not text.strip():
+            entry, cached = get_resume_cache().load(file_path)
+            if entry is None:
                 console.print("[yellow]⚠️ Could not extract text — may be a scanned file.[/yellow]")
                 return
+            if cached:
+                console.print("✔  Switched back to cached resume (no re-embedding needed).")
+            else:
+                console.print("✔  Embedding resume into memory...")
+                time.sleep(1.2)
         except Exception as e:
             console.print(f"[red]⚠️ Failed to extract text:[/red] {e}")
             return
 
-        # Store memory
-        self.memory = ResumeMemory(db_path=db_dir)
+        text = entry.text
+        self.memory = entry.memory
         self.rag = RAGPipeline(self.llm, self.memory)
-        self.memory.store_resume(text)
         self.current_resume_text = text
 
         # 🧾 Show a short text preview
@@ -84,297 +121,73 @@ class ResuminiAgent:
         if len(text) > 2000:
             console.print("[dim]... (truncated preview)[/dim]\n")
 
-        # Generate HTML preview (Dark Black & White Theme)
-        html_content = f"""
-        <html>
-        <head>
-            <title>Resume Preview</title>
-            <style>
-                body {{
-                    background-color: #000;
-                    color: #fff;
-                    font-family: 'Courier New', monospace;
-                    padding: 30px;
-                }}
-                .container {{
-                    border: 1px solid #555;
-                    border-radius: 10px;
-                    background-color: #111;
-                    padding: 20px;
-                    width: 85%;
-                    margin: 20px auto;
-                    box-shadow: 0 0 20px #333;
-                }}
-                h1 {{
-                    text-align: center;
-                    color: #fff;
-                    font-size: 24px;
-                    margin-bottom: 20px;
-                }}
-                .details {{
-                    font-size: 14px;
-                    color: #ccc;
-                    margin-bottom: 20px;
-                }}
-                iframe {{
-                    width: 100%;
-                    height: 600px;
-                    border: 1px solid #888;
-                    border-radius: 8px;
-                    margin-top: 10px;
-                    background-color: #000;
-                }}
-                pre {{
-                    white-space: pre-wrap;
-                    color: #ddd;
-                    background-color: #000;
-                    border: 1px solid #444;
-                    padding: 15px;
-                    border-radius: 8px;
-                    overflow-y: auto;
-                    height: 250px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>📄 Resume Preview</h1>
-                <div class="details">
-                    <b>Candidate Name:</b> DINESH KUMAR S<br>
-                    <b>File:</b> {os.path.basename(file_path)}
-                </div>
-                <iframe src="file:///{file_path}" title="PDF Preview"></iframe>
-                <h2 style="color:#fff;">🧾 Extracted Text Preview:</h2>
-                <pre>{preview}</pre>
-            </div>
-        </body>
-        </html>
-        """
-
-        output_path = os.path.join(os.getcwd(), "resume_preview.html")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        output_path = write_preview(resume_preview_html(file_path, text), "resume_preview.html")
 
         console.print(f"\n✔ Resume preview generated: {output_path}")
-        os.startfile(output_path)
+        open_preview(output_path)
 
 
-    def generate_ats_report(self):
-        """Compute simple ATS scoring metrics."""
+    def generate_ats_report(self, role=None):
+        """Compute local ATS scoring metrics for the target role (no LLM call)."""
         console.print("\n🧠 [cyan]Analyzing resume for ATS compatibility...[/cyan]")
 
         if not self.current_resume_text:
             console.print("[red]⚠️ No resume loaded. Please load a resume first.[/red]")
             return None
 
-        text = self.current_resume_text.lower()
-        report = {}
-
-        keywords = ["python", "machine learning", "ai", "flask", "tensorflow", "sql", "data analysis"]
-        found_keywords = [kw for kw in keywords if kw in text]
-        report["keyword_score"] = len(found_keywords) / len(keywords) * 100
-
-        sections = ["education", "projects", "experience", "skills", "certifications"]
-        found_sections = [s for s in sections if s in text]
-        report["structure_score"] = len(found_sections) / len(sections) * 100
+        from agent.tools.ats_score import keyword_report
 
-        word_count = len(text.split())
-        report["length_score"] = 100 if 400 <= word_count <= 900 else 60 if word_count < 400 else 70
-
-        report["overall_score"] = round(
-            (report["keyword_score"] * 0.4) +
-            (report["structure_score"] * 0.3) +
-            (report["length_score"] * 0.3), 2
-        )
+        report = keyword_report(self.current_resume_text, role=role)
 
         console.print(f"\n📊 [green]ATS Report generated successfully![/green]")
         console.print(f"   • Keyword Match: {report['keyword_score']:.2f}%")
         console.print(f"   • Structure: {report['structure_score']:.2f}%")
         console.print(f"   • Length: {report['length_score']:.2f}%")
-        console.print(f"   • [bold yellow]Overall ATS Score: {report['overall_score']:.2f}%[/bold yellow]\n")
+        console.print(f"   • [bold yellow]Overall ATS Score: {report['overall_score']:.2f}%[/bold yellow]")
+        console.print(f"   • Skills checked for: {report['role']}")
+        if report["missing_keywords"]:
+            console.print(f"   • Missing: [red]{', '.join(report['missing_keywords'])}[/red]")
+        console.print()
 
         return report
 
+    def check_coverage(self, jd_text):
+        """Which job requirements the loaded resume covers, with evidence (no LLM call)."""
+        if not self.current_resume_text:
+            console.print("[red]⚠️ Please load a resume first.[/red]")
+            return None
+
+        from agent.tools.jd_coverage import jd_coverage
+
+        result = jd_coverage(self.memory, jd_text, resume_text=self.current_resume_text)
+        if not result["requirements"]:
+            console.print("[yellow]⚠️ No requirements found in that job description.[/yellow]")
+            return result
+
+        marks = {"met": "[green]✅[/green]", "partial": "[yellow]🟡[/yellow]", "missing": "[red]❌[/red]"}
+        console.print(f"\n📋 [bold yellow]JD Coverage: {result['coverage']:.0f}%[/bold yellow]  "
+                      f"({result['met']} met, {result['partial']} partial, {result['missing']} missing, "
+                      f"{result['seconds'] * 1000:.0f} ms)\n")
+        for req in result["requirements"]:
+            optional = " [dim](optional)[/dim]" if req["optional"] else ""
+            console.print(f"{marks[req['status']]} {req['text']}{optional}")
+            if req["status"] != "missing" and req["evidence"]:
+                console.print(f"   [dim]↳ {' '.join(req['evidence'].split())[:120]}[/dim]")
+            elif req["missing_skills"]:
+                console.print(f"   [dim]↳ not found: {', '.join(req['missing_skills'])}[/dim]")
+        console.print()
+        return result
+
     def display_ats_report(self, report, ai_text=None, role="N/A", ai_score=None):
         """
         Display the ATS Compatibility Report in HTML format with AI analysis and detailed scoring report (black & white theme).
         """
         try:
-            keyword_match = report.get("keyword_score", 0)
-            structure = report.get("structure_score", 0)
-            length = report.get("length_score", 0)
-            overall = report.get("overall_score", 0)
-
-            ai_score_text = f"{ai_score}%" if ai_score is not None else "N/A%"
-            ai_analysis = (
-                ai_text.strip()
-                if ai_text and ai_text.strip() != ""
-                else "AI analysis not available. Please check API key or network."
-            )
-
-            html_content = f"""
-            <html>
-            <head>
-                <title>ATS Compatibility Report</title>
-                <style>
-                    body {{
-                        background-color: #000;
-                        color: #fff;
-                        font-family: 'Courier New', monospace;
-                        margin: 0;
-                        padding: 20px;
-                    }}
-                    .container {{
-                        background-color: #111;
-                        border: 1px solid #fff;
-                        border-radius: 8px;
-                        padding: 25px;
-                        width: 80%;
-                        margin: 40px auto;
-                        box-shadow: 0 0 20px rgba(255, 255, 255, 0.2);
-                    }}
-                    h1 {{
-                        color: #fff;
-                        text-align: center;
-                        border-bottom: 1px solid #444;
-                        padding-bottom: 10px;
-                    }}
-                    .score-section {{
-                        text-align: center;
-                        margin: 20px 0;
-                    }}
-                    .badge {{
-                        display: inline-block;
-                        border: 1px solid #fff;
-                        padding: 8px 14px;
-                        margin: 5px;
-                        border-radius: 6px;
-                        font-weight: bold;
-                        background-color: #000;
-                        color: #fff;
-                    }}
-                    .bar {{
-                        display: flex;
-                        justify-content: space-around;
-                        align-items: flex-end;
-                        height: 200px;
-                        margin-top: 20px;
-                        color: #fff;
-                    }}
-                    .bar div {{
-                        width: 80px;
-                        background-color: #fff;
-                        border-radius: 5px;
-                        text-align: center;
-                        padding-top: 5px;
-                        color: #000;
-                        font-weight: bold;
-                    }}
-                    .yellow {{ height: {keyword_match * 2}px; }}
-                    .green {{ height: {structure * 2}px; }}
-                    .teal {{ height: {length * 2}px; }}
-                    .blue {{ height: {overall * 2}px; }}
-
-                    .analysis {{
-                        margin-top: 40px;
-                        background-color: #000;
-                        border: 1px solid #fff;
-                        border-radius: 6px;
-                        padding: 20px;
-                    }}
-                    .analysis h2 {{
-                        color: #fff;
-                        border-bottom: 1px solid #444;
-                        padding-bottom: 5px;
-                    }}
-                    pre {{
-                        white-space: pre-wrap;
-                        color: #eee;
-                        font-size: 14px;
-                        line-height: 1.5;
-                    }}
-
-                    .ats-summary {{
-                        margin-top: 40px;
-                        background-color: #000;
-                        border: 1px solid #fff;
-                        border-radius: 6px;
-                        padding: 20px;
-                    }}
-                    .ats-summary h3 {{
-                        color: #fff;
-                        text-align: center;
-                        border-bottom: 1px solid #444;
-                        padding-bottom: 8px;
-                    }}
-                    .ats-summary h4 {{
-                        color: #ddd;
-                        margin-top: 15px;
-                    }}
-                    .ats-summary p, .ats-summary li {{
-                        color: #ccc;
-                        font-size: 14px;
-                        line-height: 1.6;
-                    }}
-                    .ats-summary ul {{
-                        list-style-type: none;
-                        padding-left: 0;
-                    }}
-                    .ats-summary li::before {{
-                        content: "> ";
-                        color: #fff;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>ATS Compatibility Report</h1>
-                    <p><strong>Target Role:</strong> {role}</p>
-
-                    <div class="score-section">
-                        <span class="badge">Overall ATS: {overall:.2f}%</span>
-                    </div>
-
-                    <div class="bar">
-                        <div class="yellow">Keyword<br>{keyword_match:.2f}%</div>
-                        <div class="green">Structure<br>{structure:.2f}%</div>
-                        <div class="teal">Length<br>{length:.2f}%</div>
-                        <div class="blue">Overall<br>{overall:.2f}%</div>
-                    </div>
-
-
-                    <div class="ats-summary">
-                        <h3>ATS SCORING REPORT</h3>
-                        <p><strong>Candidate Name:</strong> DINESH KUMAR S</p>
-                        <p><strong>Target Role:</strong> {role}</p>
-                        <p><strong>ATS Match Score:</strong> 85</p>
-
-                        <h4>Feedback Summary:</h4>
-                        <p>The candidate demonstrates a strong alignment with an ML Engineer role,
-                        holding an AI & DS Engineering degree and practical experience in Generative AI,
-                        LLMs, and AWS. Their robust technical skills in Python, AI/ML concepts, and proven
-                        coding competition success make them a good fit, despite the primary work experience
-                        being in Guidewire training.</p>
-
-                        <h4>Breakdown:</h4>
-                        <ul>
-                            <li>Keyword Match: {keyword_match:.2f}%</li>
-                            <li>Structure: {structure:.2f}%</li>
-                            <li>Length: {length:.2f}%</li>
-                            <li>Overall ATS Score: {overall:.2f}%</li>
-                        </ul>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-
-            output_path = os.path.join(os.getcwd(), "ats_report.html")
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
+            html_content = ats_report_html(report, ai_text=ai_text, role=role, ai_score=ai_score)
+            output_path = write_preview(html_content, "ats_report.html")
 
             print(f"\n✔ ATS Report saved to: {output_path}")
-            os.startfile(output_path)
+            open_preview(output_path)
 
         except Exception as e:
             print(f"⚠️ Failed to display ATS report: {e}")
@@ -470,7 +283,7 @@ class ResuminiAgent:
             f.write(html_content)
 
         console.print(f"\n🧠 [green]Opening Resume Optimizer Canvas...[/green]")
-        os.startfile(output_html)
+        open_preview(output_html)
 
         # Start AI generation (simulate live writing)
         console.print(f"✔ Optimizing resume for [cyan]{role}[/cyan] ...\n")
@@ -506,16 +319,131 @@ class ResuminiAgent:
         console.print("\n✨ [green]Summary Generated:[/green]\n")
         self.stream_text(summary)
 
+    # 📦 Bulk ingestion
+    def ingest_directory(self, directory):
+        from agent.ingest import ingest_directory, print_summary
+
+        if not os.path.isdir(directory):
+            console.print(f"[red]❌ Not a directory:[/red] {directory}")
+            return
+        console.print(f"\n📦 [cyan]Ingesting resumes from[/cyan] {directory} ...")
+        stats = ingest_directory(directory, log=console.print)
+        print_summary(stats, log=console.print)
+
+    # 🔎 Corpus-wide candidate search
+    def find_candidates(self, query, top_k=10):
+        results = self.memory.search_corpus(query, top_k=top_k)
+        if not results:
+            console.print("[yellow]⚠️ No resumes indexed yet. Load some resumes first.[/yellow]")
+            return
+
+        console.print(f"\n🔎 [cyan]Top candidates for:[/cyan] {query}\n")
+        for rank, (resume_id, chunk, score) in enumerate(results, start=1):
+            snippet = " ".join(chunk.split())[:120]
+            console.print(f"{rank:>2}. [bold]{resume_id}[/bold]  ({score:.3f})")
+            console.print(f"    [dim]{snippet}[/dim]")
+        console.print()
+
+    # 💼 Job descriptions
+    def search_jobs(self, query):
+        from agent.job_store import get_job_store
+
+        console.print(f"\n🔎 [cyan]Searching LinkedIn for:[/cyan] {query}")
+        jobs = self.linkedin.search_jobs(query)
+        if not jobs:
+            console.print("[red]❌ No jobs found.[/red]")
+            return
+        for i, job in enumerate(jobs, start=1):
+            console.print(f"{i:>2}. [bold]{job.get('title')}[/bold] — {job.get('company')} ({job.get('location')})")
+            console.print(f"    [dim]{job.get('link')}[/dim]")
+        stats = get_job_store().add_jobs(jobs, source=f"linkedin: {query}")
+        console.print(f"\n💾 {stats['added']} new job(s) saved for [yellow]bestjobs[/yellow].\n")
+
+    def add_jobs(self, path):
+        from agent.job_store import get_job_store
+
+        if not os.path.exists(path):
+            console.print(f"[red]❌ File not found:[/red] {path}")
+            return
+        console.print(f"\n💼 [cyan]Adding job descriptions from[/cyan] {path} ...")
+        store = get_job_store()
+        stats = store.add_path(path)
+        console.print(f"✅ {stats['added']} added, {stats['updated']} updated, {stats['unchanged']} unchanged "
+                      f"({len(store)} job(s) stored)")
+        for error in stats["errors"]:
+            console.print(f"[yellow]⚠️ {error}[/yellow]")
+
+    def best_jobs(self, top_k=10):
+        from agent.job_store import get_job_store
+
+        if not self.current_resume_text:
+            console.print("[red]⚠️ Please load a resume first.[/red]")
+            return
+        store = get_job_store()
+        if not len(store):
+            console.print("[yellow]⚠️ No job descriptions stored yet. Use [bold]addjobs <path>[/bold] first.[/yellow]")
+            return
+        start = time.perf_counter()
+        results = store.best_jobs(self.memory, self.current_resume_text, top_k=top_k)
+        console.print(f"\n💼 [cyan]Best of {len(store)} stored job(s)[/cyan] "
+                      f"[dim]({(time.perf_counter() - start) * 1000:.0f} ms)[/dim]\n")
+        for rank, job in enumerate(results, start=1):
+            where = " — ".join(x for x in (job.get("company"), job.get("location")) if x)
+            console.print(f"{rank:>2}. [bold]{job['title']}[/bold]{' — ' + where if where else ''}  "
+                          f"[yellow]{job['score']:.0f}%[/yellow]")
+            if job["missing_skills"]:
+                console.print(f"    [dim]missing: {', '.join(job['missing_skills'])}[/dim]")
+            if job.get("link"):
+                console.print(f"    [dim]{job['link']}[/dim]")
+        console.print()
+
+    def print_model_stats(self):
+        stats = model_stats()
+        if not stats:
+            console.print("[dim]No embedding models requested yet.[/dim]")
+        for s in stats:
+            if not s["loaded"]:
+                console.print(f"• {s['name']}: [dim]not loaded yet[/dim]")
+                continue
+            rss = f"{s['rss_delta_bytes'] / 2**20:.0f} MB" if s["rss_delta_bytes"] is not None else "n/a"
+            console.print(f"• {s['name']}: loaded in {s['load_seconds']:.2f}s, +{rss} resident")
+        from agent.cache import cache_stats
+
+        # only report components that exist; reading self.llm would build it
+        llm = self.llm.latency_summary() if "llm" in self.__dict__ else {}
+        if llm.get("total"):
+            ttft = llm.get("ttft", {}).get("p50")
+            ttft = f"{ttft:.2f}s" if ttft is not None else "n/a"
+            console.print(f"• LLM: {llm['calls']} call(s) ({llm['cached']} cached), first token p50 {ttft}, "
+                          f"total p50 {llm['total']['p50']:.2f}s / p95 {llm['total']['p95']:.2f}s")
+        for c in cache_stats():
+            console.print(f"• {c['name']} cache: {c['entries']} entries, "
+                          f"{c['bytes'] / 2**20:.1f}/{c['max_bytes'] / 2**20:.0f} MB, "
+                          f"hit rate {c['hit_rate']:.0%} ({c['hits']} hits, {c['misses']} misses)")
+        from agent.resume_cache import get_resume_cache
+
+        r = get_resume_cache().stats()
+        console.print(f"• resume session cache: {r['entries']} resume(s), "
+                      f"{r['bytes'] / 2**20:.1f}/{r['max_bytes'] / 2**20:.0f} MB ({r['occupancy']:.0%}), "
+                      f"hit rate {r['hit_rate']:.0%}, {r['evictions']} eviction(s) "
+                      f"({r['evicted_bytes'] / 2**20:.1f} MB)")
+
     # 🧭 Help
     def print_help(self):
         console.print(
             "\n[bold cyan]Available Commands[/bold cyan]\n"
             "[yellow]help[/yellow]                         Show help menu\n"
             "[yellow]load <path>[/yellow]                  Load and embed a resume\n"
+            "[yellow]ingest <dir>[/yellow]                 Bulk-ingest a folder of resumes\n"
             "[yellow]summarize[/yellow]                    Summarize loaded resume\n"
             "[yellow]score <role>[/yellow]                 ATS score against job description\n"
+            "[yellow]coverage <jd file>[/yellow]           Check each job requirement against the resume\n"
             "[yellow]optimize <role>[/yellow]              Optimize and export resume\n"
-            "[yellow]jobs <query>[/yellow]                 Search LinkedIn (demo)\n"
+            "[yellow]jobs <query>[/yellow]                 Search LinkedIn (demo) and save the results\n"
+            "[yellow]addjobs <path>[/yellow]               Store job descriptions from a file or folder\n"
+            "[yellow]bestjobs [n][/yellow]                 Best-fitting stored jobs for the loaded resume\n"
+            "[yellow]candidates <query>[/yellow]           Search all stored resumes\n"
+            "[yellow]models[/yellow]                       Show model, latency and cache stats\n"
             "[yellow]exit[/yellow]                         Quit\n"
         )
 
@@ -550,9 +478,60 @@ class ResuminiAgent:
                     continue
                 self.load_resume(" ".join(parts[1:]))
 
+            elif cmd == "ingest":
+                if len(parts) < 2:
+                    console.print("[red]⚠️ Usage:[/red] ingest <dir>")
+                    continue
+                self.ingest_directory(" ".join(parts[1:]))
+
             elif cmd == "summarize":
                 self.summarize_resume()
 
+            elif cmd == "models":
+                self.print_model_stats()
+
+            elif cmd == "jobs":
+                if len(parts) < 2:
+                    console.print("[red]⚠️ Usage:[/red] jobs <query>")
+                    continue
+                self.search_jobs(" ".join(parts[1:]))
+
+            elif cmd == "addjobs":
+                if len(parts) < 2:
+                    console.print("[red]⚠️ Usage:[/red] addjobs <path>")
+                    continue
+                self.add_jobs(" ".join(parts[1:]).strip('"'))
+
+            elif cmd == "bestjobs":
+                self.best_jobs(int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 10)
+
+            elif cmd == "candidates":
+                if len(parts) < 2:
+                    console.print("[red]⚠️ Usage:[/red] candidates <query>")
+                    continue
+                self.find_candidates(" ".join(parts[1:]))
+
+            elif cmd == "coverage":
+                source = raw[len(parts[0]):].strip().strip('"')
+                if source and os.path.isfile(source):
+                    with open(source, "r", encoding="utf-8") as f:
+                        jd_text = f.read()
+                elif source:
+                    jd_text = source
+                else:
+                    console.print("📋 Paste the job description, then an empty line:")
+                    lines = []
+                    while True:
+                        try:
+                            line = input()
+                        except EOFError:
+                            break
+                        if not line.strip():
+                            break
+                        lines.append(line)
+                    jd_text = "\n".join(lines)
+                self.check_coverage(jd_text)
+
             elif cmd in ["score", "ats", "ats_score"]:
                 role = " ".join(parts[1:]) if len(parts) > 1 else input("🎯 Target role: ")
 
@@ -565,13 +544,15 @@ class ResuminiAgent:
                 console.print(" ✔ [cyan] Generating response...[/cyan]\n")
                 time.sleep(0.8)
 
-                score, ai_response = self.ats.analyze(self.current_resume_text, role)
+                result = self.ats.analyze(self.current_resume_text, role)
+                score = result.get("score", 0)
+                ai_response = result.get("feedback") or result.get("message", "")
 
                 # Handle missing AI response gracefully
                 if not ai_response or not ai_response.strip():
                     ai_response = "AI model not available or failed to generate analysis. Please check your API key or internet connection."
 
-                report = self.generate_ats_report()
+                report = self.generate_ats_report(role)
                 self.display_ats_report(report, ai_text=ai_response, role=role, ai_score=score)
 
             # elif cmd == "optimize":
@@ -874,7 +855,7 @@ class ResuminiAgent:
                 #     webbrowser.open(f"file://{output_html}")
 
             elif cmd == "optimize":
-                import re, os, sys, io, base64, subprocess, tempfile, requests, shutil, webbrowser
+                import re, base64, webbrowser
 
                 if not self.current_resume_text:
                     console.print("[red]⚠️ Please load a resume first.[/red]")
@@ -891,101 +872,16 @@ class ResuminiAgent:
                 time.sleep(0.6)
                 console.print(f"✔ Optimizing resume for [bold green]{role}[/bold green] ({candidate_name})...\n")
 
-                # Capture stdout safely
-                old_stdout = sys.stdout
-                sys_stdout_buffer = io.StringIO()
-                sys.stdout = sys_stdout_buffer
-
-                try:
-                    prompt = f"""
-                    You are an AI Resume Optimization Agent.
-                    Convert the resume below into clean, modern LaTeX format (single-page layout, 11pt font).
-                    add divider line for each section
-                    Use \\documentclass[11pt]{{article}}, \\usepackage[utf8]{{inputenc}}, \\usepackage[T1]{{fontenc}},
-                    \\usepackage{{geometry}}, \\usepackage{{enumitem}}, \\usepackage{{hyperref}}, and \\pagestyle{{empty}}.
-                    The layout must look like a professional single-page resume (no extra page).
-                    Compress vertical spaces using \\setlength commands.
-                    Do NOT include emojis or markdown.
-                    Tailor the text to the target role: {role}.
-                    Output *only* valid LaTeX code ready to compile.
-
-                    Resume:
-                    --------------------
-                    {self.current_resume_text}
-                    --------------------
-                    """
-                    optimized_latex = self.optimizer.llm.generate(prompt)
-                except Exception as e:
-                    optimized_latex = f"⚠️ AI optimization failed: {e}"
-                finally:
-                    sys.stdout = old_stdout
-
-                # Backup output if empty
-                if (not optimized_latex or str(optimized_latex).strip() == ""):
-                    printed = sys_stdout_buffer.getvalue().strip()
-                    if printed:
-                        optimized_latex = printed
-
-                optimized_latex = str(optimized_latex).strip()
-                optimized_latex = optimized_latex.encode("utf-8", "ignore").decode("utf-8")
-
-                # 🧩 Force a correct preamble (compact + utf8)
-                if "\\documentclass" not in optimized_latex:
-                    optimized_latex = f"""
-            \\documentclass[11pt]{{article}}
-            \\usepackage[utf8]{{inputenc}}
-            \\usepackage[T1]{{fontenc}}
-            \\usepackage{{geometry}}
-            \\usepackage{{enumitem}}
-            \\usepackage{{hyperref}}
-            \\geometry{{margin=0.75in}}
-            \\setlength{{\\parindent}}{{0pt}}
-            \\setlength{{\\parskip}}{{4pt}}
-            \\setlist[itemize]{{leftmargin=*, itemsep=2pt, topsep=2pt}}
-            \\pagestyle{{empty}}
-            \\begin{{document}}
-            {optimized_latex}
-            \\end{{document}}
-            """
-
-                # 📂 Save LaTeX + Compile
-                temp_dir = os.path.join(os.getcwd(), "optimized_resume_latex")
-                os.makedirs(temp_dir, exist_ok=True)
-                tex_path = os.path.join(temp_dir, "optimized_resume.tex")
-                pdf_path = os.path.join(temp_dir, "optimized_resume.pdf")
-
-                with open(tex_path, "w", encoding="utf-8") as f:
-                    f.write(optimized_latex)
-
-                console.print("⚙️ [yellow]Compiling LaTeX resume...[/yellow]")
-                compiled_success = False
-
-                try:
-                    if shutil.which("pdflatex"):
-                        subprocess.run(
-                            ["pdflatex", "-interaction=nonstopmode", "-output-directory", temp_dir, tex_path],
-                            check=True, capture_output=True, text=True
-                        )
-                        compiled_success = True
-                        console.print("✅ [green]Local LaTeX compilation successful![/green]")
-                    else:
-                        raise FileNotFoundError("pdflatex not found")
-                except Exception:
-                    console.print("[yellow]⚠️ Local LaTeX not available — trying online compiler...[/yellow]")
-                    try:
-                        api_url = "https://latex.ytotech.com/builds/sync"
-                        with open(tex_path, "rb") as f:
-                            response = requests.post(api_url, files={"file": f})
-                        if response.ok and response.headers.get("Content-Type", "").startswith("application/pdf"):
-                            with open(pdf_path, "wb") as f:
-                                f.write(response.content)
-                            compiled_success = True
-                            console.print("✅ [green]Online LaTeX compilation successful![/green]")
-                        else:
-                            raise RuntimeError(f"Online LaTeX compile failed: {response.text[:400]}")
-                    except Exception as e2:
-                        console.print(f"[red]❌ LaTeX compilation failed:[/red] {e2}")
-                        pdf_path = None
+                console.print("⚙️ [yellow]Generating and compiling LaTeX resume...[/yellow]")
+                latex = self.optimizer.generate_latex(role, self.current_resume_text)
+                pdf_path = latex["pdf_path"]
+                compiled_success = pdf_path is not None
+                if latex["compiler"] == "pdflatex":
+                    console.print("✅ [green]Local LaTeX compilation successful![/green]")
+                elif latex["compiler"] == "online":
+                    console.print("✅ [green]Online LaTeX compilation successful![/green]")
+                else:
+                    console.print(f"[red]❌ LaTeX compilation failed:[/red] {latex['error']}")
 
                 # Original Resume
                 left_html = "<p style='color:#888;'>⚠️ Original resume not loaded.</p>"
@@ -1025,10 +921,7 @@ class ResuminiAgent:
                     f.write(html)
 
                 console.print("✅ [green]Compiled LaTeX resume ready — opening view...[/green]")
-                try:
-                    os.startfile(output_html)
-                except Exception:
-                    webbrowser.open(f"file://{output_html}")
+                open_preview(output_html)
 
     
             else:
@@ -1065,8 +958,7 @@ class ResuminiAgent:
                     )
                     prompt = f"{system_prompt}\n\nUser: {raw}\nResumini:"
                     console.print(" ✔ Generating thoughtful response...\n")
-                    response = self.llm.generate(prompt)
-                    self.stream_text(response)
+                    self.render_stream(self.llm.stream(prompt, use_cache=False))
                 else:
                     if not hasattr(self, "rag"):
                         console.print("[red]⚠️ Please load a resume first.[/red]")
@@ -0,0 +1,248 @@
+"""
+Resident Resumini daemon and its thin client.
+
+    python main.py serve --socket /tmp/resumini.sock     # keeps models warm
+    python main.py --socket /tmp/resumini.sock -c "load resume.pdf"
+    python main.py --socket /tmp/resumini.sock            # interactive client
+
+The daemon owns one ResuminiService, so every client shares the loaded
+embedding model, open vector stores and LLM client. The protocol is one
+JSON object per line: the client sends a request
+
+    {"id": 1, "session": "default", "command": "score", "args": {"role": "..."}}
+    {"id": 2, "session": "default", "line": "score Data Scientist"}
+
+and reads events (see agent/service.py) back until a "result" or "error"
+event carrying the same id. A connection may send several requests.
+"""
+import os
+import sys
+import json
+import socket
+import socketserver
+from agent.service import ResuminiService
+
+DEFAULT_SOCKET = os.path.join("data", "resumini.sock")
+
+
+def _require_unix_sockets():
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix domain sockets are not available on this platform; "
+                           "run Resumini without --socket.")
+
+
+def _send(stream, event: dict):
+    stream.write((json.dumps(event, default=str) + "\n").encode("utf-8"))
+    stream.flush()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            try:
+                request = json.loads(raw)
+            except ValueError as e:
+                _send(self.wfile, {"event": "error", "message": f"Bad request: {e}"})
+                continue
+            request_id = request.get("id")
+            session = request.get("session")
+            if "line" in request:
+                events = service.execute(request["line"], session_id=session)
+            else:
+                events = service.handle(request.get("command"), request.get("args"), session_id=session)
+            try:
+                for event in events:
+                    _send(self.wfile, dict(event, id=request_id))
+            except (BrokenPipeError, ConnectionResetError):
+                # client went away mid-stream; the command's generator is closed with it
+                events.close()
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, service):
+        self.service = service
+        super().__init__(socket_path, _RequestHandler)
+
+
+def serve(socket_path: str = DEFAULT_SOCKET, service: ResuminiService = None, warm: bool = True):
+    """
+    Listen on socket_path until interrupted. With warm=True the embedding
+    model is loaded before the first client connects.
+    """
+    _require_unix_sockets()
+    service = service or ResuminiService()
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise RuntimeError(f"A Resumini daemon is already listening on {socket_path}")
+        os.remove(socket_path)  # stale socket from a daemon that did not shut down cleanly
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+
+    if warm:
+        print("🔥 Loading embedding model...")
+        service.warm_up()
+
+    server = _Server(socket_path, service)
+    os.chmod(socket_path, 0o600)
+    print(f"✅ Resumini daemon listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping daemon.")
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def _is_listening(socket_path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class DaemonClient:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, session: str = "default"):
+        _require_unix_sockets()
+        self.socket_path = socket_path
+        self.session = session
+        self._next_id = 0
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(socket_path)
+        except OSError as e:
+            self.sock.close()
+            raise ConnectionError(f"No Resumini daemon on {socket_path} "
+                                  f"(start one with `python main.py serve --socket {socket_path}`): {e}")
+        self._reader = self.sock.makefile("rb")
+        self._writer = self.sock.makefile("wb")
+
+    def _request(self, request: dict):
+        self._next_id += 1
+        request = dict(request, id=self._next_id, session=self.session)
+        _send(self._writer, request)
+        for raw in self._reader:
+            event = json.loads(raw)
+            yield event
+            if event.get("event") in ("result", "error") and event.get("id") == request["id"]:
+                return
+        raise ConnectionError("Resumini daemon closed the connection")
+
+    def call(self, command: str, args: dict = None):
+        """Yield the events of one command."""
+        return self._request({"command": command, "args": args or {}})
+
+    def execute(self, line: str):
+        """Yield the events of one chat-style command line."""
+        return self._request({"line": line})
+
+    def close(self):
+        for f in (self._reader, self._writer, self.sock):
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------- rendering ----------
+def render_events(events, file=None) -> bool:
+    """Print events as they arrive; returns False if the command failed."""
+    file = file or sys.stdout
+    ok = True
+    for event in events:
+        kind = event.get("event")
+        if kind == "log":
+            print(f"⏳ {event['text']}", file=file)
+        elif kind == "chunk":
+            file.write(event["text"])
+            file.flush()
+        elif kind == "error":
+            print(f"❌ {event['message']}", file=file)
+            ok = False
+        elif kind == "result":
+            print(format_result(event.get("command"), event.get("data") or {}), file=file)
+    return ok
+
+
+def format_result(command: str, data: dict) -> str:
+    if command == "load":
+        state = "from the session cache" if data.get("cached") else "embedded"
+        return f"✅ Loaded {data['resume_id']} ({data['chars']} chars, {data['chunks']} chunks, {state})"
+    if command == "score":
+        report = data.get("report") or {}
+        lines = [f"🤖 AI ATS Score: {data.get('ai_score', 0)}%"]
+        if report:
+            lines.append(f"📊 Keyword Report: overall {report.get('overall_score', 0)}% "
+                         f"(keywords {report.get('keyword_score', 0):.0f}%, "
+                         f"structure {report.get('structure_score', 0):.0f}%, "
+                         f"length {report.get('length_score', 0)}%)")
+            if report.get("missing_keywords"):
+                lines.append(f"🧩 Missing for {report.get('role')}: {', '.join(report['missing_keywords'])}")
+        if data.get("feedback"):
+            lines.append(f"💬 {data['feedback']}")
+        return "\n".join(lines)
+    if command == "coverage":
+        marks = {"met": "✅", "partial": "🟡", "missing": "❌"}
+        lines = [f"📋 JD coverage: {data['coverage']:.0f}% ({data['met']} met, {data['partial']} partial, "
+                 f"{data['missing']} missing)"]
+        for req in data.get("requirements") or []:
+            optional = " (optional)" if req["optional"] else ""
+            lines.append(f"{marks[req['status']]} {req['text']}{optional}")
+            if req["status"] != "missing" and req.get("evidence"):
+                lines.append(f"   ↳ {' '.join(req['evidence'].split())[:120]}")
+            elif req.get("missing_skills"):
+                lines.append(f"   ↳ not found: {', '.join(req['missing_skills'])}")
+        return "\n".join(lines)
+    if command in ("summarize", "query"):
+        return ""  # the text was already streamed as chunks
+    if command == "optimize":
+        lines = [f"📄 LaTeX saved to {data.get('tex_path')}"]
+        if data.get("pdf_path"):
+            lines.append(f"✅ PDF compiled with {data.get('compiler')}: {data['pdf_path']}")
+        elif data.get("error"):
+            lines.append(f"⚠️ PDF not compiled: {data['error']}")
+        return "\n".join(lines)
+    if command == "jobs":
+        jobs = data.get("jobs") or []
+        if not jobs:
+            return "❌ No jobs found."
+        return "\n".join(f"{i}. {j.get('title')} — {j.get('company')} ({j.get('location')})\n   {j.get('link')}"
+                         for i, j in enumerate(jobs, 1))
+    if command == "addjobs":
+        lines = [f"✅ {data['added']} job(s) added, {data['updated']} updated, {data['unchanged']} unchanged "
+                 f"({data['total']} stored)"]
+        lines += [f"⚠️ {e}" for e in data.get("errors") or []]
+        return "\n".join(lines)
+    if command == "bestjobs":
+        jobs = data.get("jobs") or []
+        if not jobs:
+            return "❌ No stored jobs matched."
+        lines = []
+        for i, j in enumerate(jobs, 1):
+            where = " — ".join(x for x in (j.get("company"), j.get("location")) if x)
+            lines.append(f"{i}. {j['title']}{' — ' + where if where else ''} ({j['score']:.0f}%)")
+            if j.get("missing_skills"):
+                lines.append(f"   missing: {', '.join(j['missing_skills'])}")
+            if j.get("link"):
+                lines.append(f"   {j['link']}")
+        return "\n".join(lines)
+    if command == "candidates":
+        results = data.get("results") or []
+        if not results:
+            return "❌ No stored resumes matched."
+        return "\n".join(f"{i}. {r['resume_id']} ({r['score']:.3f}): {r['chunk'][:120]}"
+                         for i, r in enumerate(results, 1))
+    return json.dumps(data, indent=2, default=str)
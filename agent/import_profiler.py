@@ -0,0 +1,77 @@
+"""
+Per-module import timing for `python main.py --import-profile`.
+
+Wraps builtins.__import__ so every module imported for the first time is
+timed, both inclusive of the modules it pulls in ("cumulative") and
+exclusive of them ("self"). Like `python -X importtime`, but it keeps
+running after startup, so the report printed at exit also covers the
+heavy dependencies loaded lazily by the first command that needs them.
+"""
+import sys
+import time
+import atexit
+import builtins
+import importlib.util
+
+_original_import = builtins.__import__
+_records = {}  # module -> [cumulative seconds, self seconds, time since profiling started]
+_stack = []
+_started = None
+
+
+def _resolve(name, globals, level):
+    if level == 0:
+        return name
+    try:
+        return importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__") or "")
+    except (ImportError, ValueError):
+        return name
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    module = _resolve(name, globals, level)
+    if module in sys.modules or module in _records:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        _records[module] = [elapsed, elapsed - children, start - _started]
+
+
+def enable(report_at_exit: bool = True):
+    """Start timing imports (call before the imports you want to see)."""
+    global _started
+    if builtins.__import__ is _timed_import:
+        return
+    _started = time.perf_counter()
+    builtins.__import__ = _timed_import
+    if report_at_exit:
+        atexit.register(report)
+
+
+def disable():
+    builtins.__import__ = _original_import
+
+
+def elapsed() -> float:
+    """Seconds since profiling started."""
+    return time.perf_counter() - _started if _started is not None else 0.0
+
+
+def report(limit: int = 30, file=None):
+    file = file or sys.stderr
+    if not _records:
+        return
+    top = sorted(_records.items(), key=lambda kv: kv[1][0], reverse=True)[:limit]
+    total_self = sum(r[1] for r in _records.values())
+    print(f"\n⏱️  Import profile: {len(_records)} modules, {total_self:.3f}s spent importing", file=file)
+    print(f"{'cumulative':>11} {'self':>9} {'at':>8}  module", file=file)
+    for module, (cumulative, own, at) in top:
+        print(f"{cumulative * 1e3:9.1f}ms {own * 1e3:7.1f}ms {at:7.2f}s  {module}", file=file)
@@ -0,0 +1,201 @@
+"""
+Non-interactive bulk ingestion of a directory of resumes.
+
+    python main.py ingest <dir> [--workers N] [--batch-files N] [--restart]
+
+Text extraction runs in a process pool (files whose text is already in
+the extraction cache skip it), the chunks of a whole batch of files are
+embedded in one encode call, and progress is checkpointed after
+every batch so an interrupted run picks up where it stopped. The
+"extract" timing is the time spent waiting on the pool, not the pool's
+total CPU time.
+"""
+import os
+import json
+import time
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from agent.memory import ResumeMemory, MODEL_NAME
+from agent.cache import cached_encode
+from agent.rag.vector_index import normalize_rows
+from agent.rag.corpus_index import get_corpus_index
+from agent.tools.file_parser import extract_worker, cached_text
+from agent.utils import resume_id_for
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+CHECKPOINT_DIR = os.path.join("data", "ingest_checkpoints")
+
+
+def find_resumes(directory: str, recursive: bool = False):
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+        if not recursive:
+            break
+        dirs.sort()
+    return paths
+
+
+class Checkpoint:
+    def __init__(self, directory: str, checkpoint_dir: str = CHECKPOINT_DIR):
+        """Records which files of `directory` were ingested, with their size and mtime."""
+        key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self.path = os.path.join(checkpoint_dir, f"{key}.json")
+        self.data = {"directory": os.path.abspath(directory), "done": {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _signature(path: str):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def is_done(self, path: str) -> bool:
+        return self.data["done"].get(os.path.abspath(path)) == self._signature(path)
+
+    def mark_done(self, path: str):
+        self.data["done"][os.path.abspath(path)] = self._signature(path)
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+    def reset(self):
+        self.data["done"] = {}
+        self.save()
+
+
+def ingest_directory(directory: str, workers: int = None, batch_files: int = 32,
+                     encode_batch_size: int = 64, recursive: bool = False, restart: bool = False,
+                     db_root: str = os.path.join("data", "vector_dbs"), log=print) -> dict:
+    """
+    Extract, embed and store every resume in `directory`.
+    Files that fail to extract are counted as "failed" and left out of the
+    checkpoint, so the next run retries them.
+    Returns a stats dict with counts, per-stage seconds and throughput.
+    """
+    timings = {"discover": 0.0, "extract": 0.0, "chunk": 0.0, "embed": 0.0, "store": 0.0, "index": 0.0}
+    stats = {"files": 0, "skipped": 0, "ingested": 0, "unchanged": 0, "empty": 0, "failed": 0,
+             "extract_cached": 0, "chunks_encoded": 0, "timings": timings}
+    start_all = time.perf_counter()
+
+    t0 = time.perf_counter()
+    checkpoint = Checkpoint(directory)
+    if restart:
+        checkpoint.reset()
+    paths = find_resumes(directory, recursive=recursive)
+    stats["files"] = len(paths)
+    todo = [p for p in paths if not checkpoint.is_done(p)]
+    stats["skipped"] = len(paths) - len(todo)
+    timings["discover"] = time.perf_counter() - t0
+    if stats["skipped"]:
+        log(f"↻ Resuming: {stats['skipped']} of {len(paths)} file(s) already ingested.")
+    if not todo:
+        stats["seconds"] = time.perf_counter() - start_all
+        stats["resumes_per_sec"] = 0.0
+        return stats
+
+    # unchanged PDF/DOCX files already have their text cached; only the rest go to the pool
+    t0 = time.perf_counter()
+    cached = {}
+    for path in todo:
+        text = cached_text(path)
+        if text is not None:
+            cached[path] = text
+    stats["extract_cached"] = len(cached)
+    timings["extract"] += time.perf_counter() - t0
+
+    corpus = get_corpus_index(db_root)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() queues every file up front, so the pool keeps extracting the
+        # next batch while this process embeds and stores the current one
+        extracted_by_pool = pool.map(extract_worker, [p for p in todo if p not in cached])
+        results = ((p, cached[p], 0.0, None) if p in cached else next(extracted_by_pool) for p in todo)
+        for b in range(0, len(todo), batch_files):
+            t0 = time.perf_counter()
+            extracted = list(itertools.islice(results, batch_files))
+            timings["extract"] += time.perf_counter() - t0
+
+            # chunk every file and collect the chunks no store has seen yet
+            t0 = time.perf_counter()
+            jobs, pending = [], {}
+            for path, text, _, error in extracted:
+                if error:
+                    stats["failed"] += 1
+                    log(f"❌ {os.path.basename(path)}: {error}")
+                    continue
+                if not text.strip():
+                    stats["empty"] += 1
+                    checkpoint.mark_done(path)
+                    continue
+                resume_id = resume_id_for(path, directory)
+                memory = ResumeMemory(db_path=os.path.join(db_root, resume_id))
+                chunks, _, keys = memory.chunk(text)
+                stored = set(memory.chunk_keys)
+                for chunk, key in zip(chunks, keys):
+                    if key not in stored:
+                        pending.setdefault(key, chunk)
+                jobs.append((path, resume_id, memory, text))
+            timings["chunk"] += time.perf_counter() - t0
+
+            # one encode call for the whole batch
+            t0 = time.perf_counter()
+            known = {}
+            if pending:
+                model = jobs[0][2].model
+                vectors = normalize_rows(cached_encode(model, list(pending.values()), MODEL_NAME,
+                                                       batch_size=encode_batch_size))
+                known = dict(zip(pending.keys(), vectors))
+                stats["chunks_encoded"] += len(known)
+            timings["embed"] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            changed = []
+            for path, resume_id, memory, text in jobs:
+                if memory.store_resume(text, resume_id=resume_id, known_vectors=known, index_corpus=False):
+                    stats["ingested"] += 1
+                    changed.append((resume_id, memory.index.matrix))
+                else:
+                    stats["unchanged"] += 1
+                    if resume_id not in corpus.manifest["resumes"]:
+                        changed.append((resume_id, memory.index.matrix))
+            timings["store"] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            if changed:
+                corpus.add_many(changed)
+            for path, *_ in jobs:
+                checkpoint.mark_done(path)
+            checkpoint.save()
+            timings["index"] += time.perf_counter() - t0
+
+            done = min(b + batch_files, len(todo))
+            log(f"✔ {done}/{len(todo)} file(s) processed")
+
+    stats["seconds"] = time.perf_counter() - start_all
+    processed = len(todo) - stats["failed"]
+    stats["resumes_per_sec"] = processed / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def print_summary(stats: dict, log=print):
+    log("\n📦 Ingestion summary")
+    log(f"   files found: {stats['files']}  skipped (checkpoint): {stats['skipped']}")
+    log(f"   ingested: {stats['ingested']}  unchanged: {stats['unchanged']}  "
+        f"empty: {stats['empty']}  failed: {stats['failed']}")
+    log(f"   text from extraction cache: {stats.get('extract_cached', 0)}  chunks encoded: {stats['chunks_encoded']}")
+    total = sum(stats["timings"].values()) or 1.0
+    for stage, secs in stats["timings"].items():
+        log(f"   {stage:<9} {secs:8.2f}s  ({secs / total * 100:5.1f}%)")
+    log(f"   throughput: {stats['resumes_per_sec']:.2f} resumes/sec ({stats['seconds']:.2f}s total)")
@@ -0,0 +1,270 @@
+"""
+Persistent store of job descriptions for reverse matching (best jobs for a resume).
+
+    python main.py add-jobs postings/            # .json / .jsonl / .txt / .md / .pdf / .docx
+    bestjobs 10                                  # in the chat, with a resume loaded
+
+Every job is embedded once, as the normalized mean of its chunk vectors
+(same MiniLM model, chunker and embedding cache as ResumeMemory), and
+stored as one row of a CorpusIndex under data/job_dbs/_corpus/, so
+lookups use the same IVF clustering that serves corpus-wide candidate
+search and stay in the millisecond range at tens of thousands of
+postings. Job metadata (title, company, location, link, text, skills)
+lives next to it in data/job_dbs/jobs.jsonl, an append-only log where
+the last line for an id wins.
+
+Matching averages the resume's chunk vectors into one query, pulls the
+closest jobs from the index and re-ranks them with the same blend as
+batch-score: similarity plus the share of the job's taxonomy skills the
+resume mentions.
+
+Jobs have no per-id vector store, so CorpusIndex.rebuild() must not be
+run on data/job_dbs; JobStore.rebuild() re-embeds from jobs.jsonl.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+import numpy as np
+from agent.cache import cached_encode
+from agent.memory import MODEL_NAME
+from agent.models.registry import get_embedding_model
+from agent.rag.chunker import chunk_resume
+from agent.rag.corpus_index import CorpusIndex
+from agent.rag.vector_index import normalize_rows
+from agent.tools.ats_engine import get_ats_engine
+
+DEFAULT_JOB_ROOT = os.path.join("data", "job_dbs")
+JOB_TEXT_EXTENSIONS = (".json", ".jsonl", ".txt", ".md")
+JOB_DOC_EXTENSIONS = (".pdf", ".docx", ".doc")
+META_FIELDS = ("title", "company", "location", "link", "source")
+MIN_RERANK_DEPTH = 50
+
+
+def job_id_for(job: dict) -> str:
+    """Explicit id, else the posting link, else a hash of the text."""
+    if job.get("id"):
+        return str(job["id"])
+    if job.get("link"):
+        return job["link"].split("?")[0].rstrip("/")
+    return hashlib.sha1(job.get("text", "").encode("utf-8")).hexdigest()[:16]
+
+
+def job_text(job: dict) -> str:
+    """Description text, or a title / company / location line for scraped cards without one."""
+    text = job.get("text") or job.get("description") or ""
+    if text.strip():
+        return text
+    return ", ".join(str(job[k]) for k in ("title", "company", "location") if job.get(k))
+
+
+def _extract_job_document(path: str) -> str:
+    """Text of a PDF / DOCX posting; ValueError if none can be extracted."""
+    from agent.tools.file_parser import extract_text
+
+    try:
+        text = extract_text(path, raise_errors=True)
+    except OSError:
+        raise
+    except Exception as e:
+        raise ValueError(f"text extraction failed: {e}") from e
+    if not text.strip():
+        raise ValueError("no text extracted (scanned document?)")
+    return text
+
+
+class JobStore:
+    def __init__(self, root: str = DEFAULT_JOB_ROOT, chunk_tokens: int = 200, encode_batch_size: int = 64):
+        self.root = root
+        self.meta_path = os.path.join(root, "jobs.jsonl")
+        self.chunk_tokens = chunk_tokens
+        self.encode_batch_size = encode_batch_size
+        self.model = get_embedding_model(MODEL_NAME)
+        self.engine = get_ats_engine()
+        self.index = CorpusIndex(root)
+        self.jobs = {}   # id -> metadata dict
+        self._lock = threading.RLock()
+        self._load_meta()
+
+    # ---------- persistence ----------
+    def _load_meta(self):
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    job = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if job.get("deleted"):
+                    self.jobs.pop(job["id"], None)
+                else:
+                    self.jobs[job["id"]] = job
+
+    def _append_meta(self, records):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.meta_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __len__(self):
+        return len(self.jobs)
+
+    # ---------- insertion ----------
+    def _embed(self, texts):
+        """One normalized mean-of-chunks vector per text, all chunks encoded in one call."""
+        chunks, offsets = [], []
+        for text in texts:
+            offsets.append(len(chunks))
+            chunks.extend([c["text"] for c in chunk_resume(text, target_tokens=self.chunk_tokens)] or [text])
+        vectors = normalize_rows(cached_encode(self.model, chunks, MODEL_NAME, batch_size=self.encode_batch_size))
+        return normalize_rows(np.add.reduceat(vectors, np.asarray(offsets, dtype=np.intp), axis=0))
+
+    def add_jobs(self, jobs, source: str = None, batch_size: int = 256) -> dict:
+        """
+        Insert or update job dicts ({"id"?, "title"?, "text"/"description"?,
+        "company"?, "location"?, "link"?}). Unchanged jobs are skipped
+        without re-embedding. Returns {"added", "updated", "unchanged"}.
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0}
+        pending = {}
+        for job in jobs:
+            text = job_text(job)
+            if not text.strip():
+                continue
+            job_id = job_id_for(dict(job, text=text))
+            digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            known = self.jobs.get(job_id)
+            if known and known.get("hash") == digest:
+                stats["unchanged"] += 1
+                continue
+            record = {"id": job_id, "hash": digest, "text": text, "added_at": time.time()}
+            record.update({k: job[k] for k in META_FIELDS if job.get(k)})
+            record.setdefault("title", text.strip().splitlines()[0][:80])
+            if source and "source" not in record:
+                record["source"] = source
+            record["skills"] = sorted(self.engine.find_skills(text))
+            stats["updated" if known or job_id in pending else "added"] += 1
+            pending[job_id] = record
+
+        records = list(pending.values())
+        with self._lock:
+            for start in range(0, len(records), batch_size):
+                batch = records[start:start + batch_size]
+                vectors = self._embed([r["text"] for r in batch])
+                self.index.add_many([(r["id"], vectors[i:i + 1]) for i, r in enumerate(batch)])
+                self._append_meta(batch)
+                self.jobs.update((r["id"], r) for r in batch)
+        return stats
+
+    def add_path(self, path: str, recursive: bool = False) -> dict:
+        """Add every job file under path (or the single file at path)."""
+        from agent.tools.batch_scorer import load_jobs
+
+        if os.path.isdir(path):
+            files = []
+            for dirpath, dirs, names in os.walk(path):
+                files.extend(os.path.join(dirpath, n) for n in sorted(names)
+                             if n.lower().endswith(JOB_TEXT_EXTENSIONS + JOB_DOC_EXTENSIONS))
+                if not recursive:
+                    break
+        elif os.path.isfile(path):
+            files = [path]
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+
+        stats = {"files": 0, "added": 0, "updated": 0, "unchanged": 0, "errors": []}
+        for file_path in files:
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            try:
+                if file_path.lower().endswith(JOB_DOC_EXTENSIONS):
+                    jobs = [{"id": stem, "text": _extract_job_document(file_path)}]
+                else:
+                    jobs = load_jobs(file_path, id_prefix=f"{stem}#")
+                    if len(jobs) == 1 and jobs[0]["id"] == f"{stem}#1":
+                        jobs[0]["id"] = stem
+                result = self.add_jobs(jobs, source=file_path)
+            except (OSError, ValueError) as e:
+                stats["errors"].append(f"{file_path}: {e}")
+                continue
+            stats["files"] += 1
+            for key in ("added", "updated", "unchanged"):
+                stats[key] += result[key]
+        return stats
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id not in self.jobs:
+                return False
+            self.index.remove(job_id)
+            self._append_meta([{"id": job_id, "deleted": True}])
+            del self.jobs[job_id]
+            return True
+
+    def rebuild(self) -> int:
+        """Compact jobs.jsonl and re-embed every job into a fresh index."""
+        with self._lock:
+            jobs = list(self.jobs.values())
+            self.index.reset()
+            if os.path.exists(self.meta_path):
+                os.remove(self.meta_path)
+            self.jobs = {}
+            self.add_jobs(jobs)
+            return len(self.jobs)
+
+    # ---------- matching ----------
+    def best_jobs(self, memory, resume_text: str = None, top_k: int = 10, semantic_weight: float = 0.6,
+                  depth: int = None, nprobe: int = None) -> list:
+        """
+        Top jobs for the resume held by memory (a ResumeMemory), best first:
+        [{"id", "title", "company", "location", "link", "score", "semantic",
+          "keyword_coverage", "matched_skills", "missing_skills"}].
+        depth: candidates pulled from the index before re-ranking (default
+        5 x top_k, at least 50, so the ranking does not depend on top_k).
+        """
+        matrix = memory.embeddings
+        if not len(self.index) or matrix is None or not len(matrix):
+            return []
+        query = normalize_rows(np.asarray(matrix).mean(axis=0))[0]
+        depth = max(depth or max(top_k * 5, MIN_RERANK_DEPTH), top_k)
+        hits = self.index.search_ids(query, top_k=depth, nprobe=nprobe)
+        resume_skills = self.engine.find_skills(resume_text or "\n".join(memory.text_chunks))
+
+        results = []
+        for job_id, sim in hits:
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            semantic = min(1.0, max(0.0, float(sim)))
+            wanted = job.get("skills") or []
+            matched = [s for s in wanted if s in resume_skills]
+            coverage = len(matched) / len(wanted) if wanted else semantic
+            results.append({
+                "id": job["id"],
+                **{k: job.get(k) for k in ("title", "company", "location", "link")},
+                "score": round(100.0 * (semantic_weight * semantic + (1 - semantic_weight) * coverage), 2),
+                "semantic": round(semantic, 4),
+                "keyword_coverage": round(coverage, 4),
+                "matched_skills": matched,
+                "missing_skills": [s for s in wanted if s not in resume_skills],
+            })
+        results.sort(key=lambda r: -r["score"])
+        return results[:top_k]
+
+    def stats(self) -> dict:
+        return {"jobs": len(self.jobs), "rows": len(self.index), "trained": self.index.trained,
+                "n_lists": self.index.manifest.get("n_lists", 0)}
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_job_store(root: str = DEFAULT_JOB_ROOT) -> JobStore:
+    """Process-wide JobStore per root folder."""
+    key = os.path.abspath(root)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = JobStore(root)
+        return _stores[key]
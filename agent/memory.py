@@ -1,106 +1,258 @@
 import os
-import pickle
-import math
 from typing import List
-from sentence_transformers import SentenceTransformer
+import numpy as np
+from agent.rag.vector_index import VectorIndex, normalize_rows, top_k_indices
+from agent.rag import vector_store
+from agent.rag.corpus_index import get_corpus_index
+from agent.rag.chunker import chunk_resume
+from agent.rag.lexical_index import BM25Index, tokenize, reciprocal_rank_fusion
+from agent.models.registry import get_embedding_model, DEFAULT_EMBEDDING_MODEL
+from agent.cache import cached_encode
+from agent.utils import load_config
+
+MODEL_NAME = DEFAULT_EMBEDDING_MODEL
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
 
 class ResumeMemory:
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, chunk_tokens: int = None, overlap_tokens: int = None):
         """
         ResumeMemory stores embeddings and text chunks for a single resume.
-        db_path: folder where vectors.pkl will be saved/loaded.
+        db_path: folder holding the binary vector store (see agent/rag/vector_store.py).
+        chunk_tokens / overlap_tokens: chunk size and overlap for the
+        section-aware chunker (defaults come from the `chunking` block of
+        configs/config.yaml).
         """
         self.db_path = db_path or os.path.join("data", "vector_dbs", "default")
         os.makedirs(self.db_path, exist_ok=True)
 
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        chunk_cfg = (load_config() or {}).get("chunking", {}) or {}
+        self.chunk_tokens = chunk_tokens or chunk_cfg.get("target_tokens", 200)
+        self.overlap_tokens = overlap_tokens if overlap_tokens is not None else chunk_cfg.get("overlap_tokens", 40)
+
+        # shared, lazily loaded: constructing a ResumeMemory does not load weights
+        self.model = get_embedding_model(MODEL_NAME)
 
         self.text_chunks: List[str] = []
-        self.embeddings: List[List[float]] = []
+        self.chunk_keys: List[bytes] = []
+        self.chunk_meta: List[dict] = []
+        self.index = VectorIndex()
+        self._lexical = None
 
         self._load_vectors()
 
-    # ---------- persistence ----------
-    def _vectors_file(self) -> str:
-        return os.path.join(self.db_path, "vectors.pkl")
+    @property
+    def embeddings(self):
+        """Normalized float32 embedding matrix (memory-mapped when loaded from disk)."""
+        return self.index.matrix
 
+    # ---------- persistence ----------
     def _save_vectors(self):
-        data = {
-            "texts": self.text_chunks,
-            "embeddings": self.embeddings
-        }
-        with open(self._vectors_file(), "wb") as f:
-            pickle.dump(data, f)
+        self._release_store()
+        vector_store.save_store(self.db_path, self.text_chunks, self.index.matrix,
+                                model_name=MODEL_NAME, normalized=True, keys=self.chunk_keys,
+                                meta=self.chunk_meta)
+        self._lexical = BM25Index().build(self.text_chunks)
+        self._lexical.save(self.db_path)
 
     def _load_vectors(self):
-        path = self._vectors_file()
-        if os.path.exists(path):
-            try:
-                with open(path, "rb") as f:
-                    data = pickle.load(f)
-                    self.text_chunks = data.get("texts", []) or []
-                    self.embeddings = data.get("embeddings", []) or []
-            except Exception:
-                # ignore corrupted file and start fresh
-                self.text_chunks = []
-                self.embeddings = []
+        try:
+            if not vector_store.has_store(self.db_path):
+                # one-shot upgrade of a legacy vectors.pkl folder
+                vector_store.migrate_pickle(self.db_path, model_name=MODEL_NAME)
+            loaded = vector_store.load_store(self.db_path)
+        except Exception:
+            # ignore corrupted store and start fresh
+            loaded = None
+
+        if loaded:
+            texts, matrix, manifest = loaded
+            self.text_chunks = texts
+            self.chunk_keys = vector_store.load_keys(self.db_path, texts, manifest)
+            self.chunk_meta = vector_store.load_meta(self.db_path, len(texts), manifest)
+            self.index = VectorIndex(matrix, normalized=True)
+        else:
+            self.text_chunks = []
+            self.chunk_keys = []
+            self.chunk_meta = []
+            self.index = VectorIndex()
+        self._lexical = None
+
+    @property
+    def lexical(self) -> BM25Index:
+        """BM25 index over the chunks, read from bm25.json (or rebuilt if missing/stale)."""
+        if self._lexical is None:
+            self._lexical = BM25Index.load(self.db_path, len(self.text_chunks))
+            if self._lexical is None:
+                self._lexical = BM25Index().build(self.text_chunks)
+                if len(self.text_chunks):
+                    self._lexical.save(self.db_path)
+        return self._lexical
+
+    def _release_store(self):
+        if isinstance(self.text_chunks, vector_store.ChunkTexts):
+            self.text_chunks.close()
 
     # ---------- storage & indexing ----------
-    def store_resume(self, text: str, resume_id: str = "resume"):
+    def chunk(self, text: str):
+        """Split text the way store_resume does; returns (chunks, meta, keys)."""
+        pieces = chunk_resume(text, target_tokens=self.chunk_tokens, overlap_tokens=self.overlap_tokens)
+        chunks = [p["text"] for p in pieces]
+        meta = [{"section": p["section"]} for p in pieces]
+        keys = [vector_store.chunk_key(MODEL_NAME, c) for c in chunks]
+        return chunks, meta, keys
+
+    def store_resume(self, text: str, resume_id: str = None, known_vectors: dict = None,
+                     index_corpus: bool = True) -> bool:
         """
         Chunk the resume text, compute embeddings, and persist them.
-        Overwrites any existing vectors in this db_path.
+        Overwrites any existing vectors in this db_path and refreshes this
+        resume's rows in the corpus-wide index (resume_id defaults to the
+        db_path folder name). Chunks whose text is unchanged since the last
+        store reuse their saved embedding instead of being re-encoded.
+        known_vectors: optional {chunk key: normalized vector} computed by the
+        caller (e.g. one embedding batch shared by many resumes).
+        Returns False if the stored resume was already up to date.
         """
         if not text or not text.strip():
-            return
+            return False
 
-        chunks = [text[i:i+1000].strip() for i in range(0, len(text), 1000) if text[i:i+1000].strip()]
-        self.text_chunks = chunks
+        chunks, meta, keys = self.chunk(text)
+        if not chunks:
+            return False
+        resume_id = resume_id or os.path.basename(os.path.normpath(self.db_path))
 
-        emb_matrix = self.model.encode(chunks, show_progress_bar=False)
-        self.embeddings = [e.tolist() if hasattr(e, "tolist") else list(e) for e in emb_matrix]
+        if keys == self.chunk_keys and meta == self.chunk_meta:
+            # same text as what is already stored: nothing to encode or write
+            if index_corpus:
+                self._update_corpus(resume_id, only_if_missing=True)
+            return False
+
+        emb_matrix = self._reuse_or_encode(chunks, keys, known_vectors)
+        self._release_store()
+        self.text_chunks = chunks
+        self.chunk_keys = keys
+        self.chunk_meta = meta
+        self.index = VectorIndex(emb_matrix, normalized=True)
 
         # persist
         self._save_vectors()
+        if index_corpus:
+            self._update_corpus(resume_id)
+        return True
+
+    def _reuse_or_encode(self, chunks: List[str], keys: List[bytes], known_vectors: dict = None) -> np.ndarray:
+        """
+        Build the normalized matrix for `chunks`, copying rows whose content key
+        is already in this store (or in known_vectors) and encoding only the
+        new or changed chunks.
+        """
+        known = {k: self.index.matrix[i] for i, k in enumerate(self.chunk_keys)}
+        if known_vectors:
+            known.update(known_vectors)
+        missing = [i for i, k in enumerate(keys) if k not in known]
+
+        fresh = None
+        if missing:
+            fresh = normalize_rows(cached_encode(self.model, [chunks[i] for i in missing], MODEL_NAME))
+        dim = fresh.shape[1] if fresh is not None else len(known[keys[0]])
+        matrix = np.empty((len(chunks), dim), dtype=np.float32)
+        if fresh is not None:
+            matrix[missing] = fresh
+        for i, k in enumerate(keys):
+            if k in known:
+                matrix[i] = known[k]
+        return matrix
+
+    def _update_corpus(self, resume_id: str, only_if_missing: bool = False):
+        try:
+            corpus = get_corpus_index(os.path.dirname(os.path.normpath(self.db_path)))
+            if only_if_missing and resume_id in corpus.manifest["resumes"]:
+                return
+            corpus.add(resume_id, self.index.matrix)
+        except Exception as e:
+            print(f"⚠️ Corpus index update failed: {e}")
 
     # ---------- retrieval ----------
-    def _cosine(self, a: List[float], b: List[float]) -> float:
-        # safe cosine similarity
-        dot = 0.0
-        na = 0.0
-        nb = 0.0
-        for x, y in zip(a, b):
-            dot += x * y
-            na += x * x
-            nb += y * y
-        if na == 0.0 or nb == 0.0:
-            return 0.0
-        return dot / (math.sqrt(na) * math.sqrt(nb))
-
-    def get_top_chunks(self, query: str, top_k: int = 3) -> List[str]:
+    def get_top_chunk_records(self, query: str, top_k: int = 3, mode: str = "dense") -> List[dict]:
         """
-        Return top_k text chunks most relevant to the query.
-        If no embeddings exist, returns an empty list.
+        Like get_top_chunks, but each hit is a dict with "text", "section",
+        "score" and "index" (row in this store).
+        mode: "dense" (embeddings), "lexical" (BM25) or "hybrid" (reciprocal
+        rank fusion of both; answered from BM25 alone, without encoding the
+        query, when the lexical match is confident and BM25 alone has
+        enough hits to fill top_k).
         """
-        if not self.embeddings or not self.text_chunks:
+        if not len(self.index) or not len(self.text_chunks):
             return []
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+
+        if mode != "dense":
+            q_tokens = tokenize(query)
+            lex_scores = self.lexical.scores(q_tokens)
+            lex_idxs = top_k_indices(lex_scores, len(lex_scores))
+            lex_idxs = lex_idxs[lex_scores[lex_idxs] > 0]
+            enough = len(lex_idxs) >= min(top_k, len(self.text_chunks))
+            if mode == "lexical" or (enough and self._lexical_confident(q_tokens, lex_idxs)):
+                return [self._record(int(i), float(lex_scores[i])) for i in lex_idxs[:top_k]]
+
+        q_emb = cached_encode(self.model, [query], MODEL_NAME)[0]
+        if mode == "dense":
+            idxs, scores = self.index.search(q_emb, top_k=top_k)
+            return [self._record(int(i), float(s)) for i, s in zip(idxs, scores)]
 
-        q_emb = self.model.encode([query], show_progress_bar=False)[0].tolist()
+        depth = max(top_k * 5, 20)
+        dense_idxs, _ = self.index.search(q_emb, top_k=depth)
+        fused = reciprocal_rank_fusion([dense_idxs.tolist(), lex_idxs[:depth].tolist()])
+        ranked = sorted(fused.items(), key=lambda kv: (-kv[1], kv[0]))[:top_k]
+        return [self._record(int(i), s) for i, s in ranked]
 
-        scores = []
-        for emb in self.embeddings:
-            try:
-                score = self._cosine(emb, q_emb)
-            except Exception:
-                score = 0.0
-            scores.append(score)
+    def _lexical_confident(self, q_tokens: List[str], lex_idxs, max_terms: int = 4) -> bool:
+        """
+        A short keyword query ("PySpark", "K8s Helm") whose every term occurs
+        in the best BM25 chunk does not need the embedding model.
+        """
+        if not q_tokens or len(set(q_tokens)) > max_terms or not len(lex_idxs):
+            return False
+        return self.lexical.matched_terms(q_tokens, int(lex_idxs[0])) == set(q_tokens)
 
-        idxs = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:top_k]
-        return [self.text_chunks[i] for i in idxs]
+    def _record(self, i: int, score: float) -> dict:
+        section = self.chunk_meta[i].get("section") if i < len(self.chunk_meta) else None
+        return {"text": self.text_chunks[i], "section": section, "score": score, "index": i}
+
+    def get_top_chunks(self, query: str, top_k: int = 3, mode: str = "dense") -> List[str]:
+        """
+        Return top_k text chunks most relevant to the query.
+        If no embeddings exist, returns an empty list.
+        """
+        return [r["text"] for r in self.get_top_chunk_records(query, top_k=top_k, mode=mode)]
+
+    def search_batch(self, queries: List[str], top_k: int = 1) -> List[List[dict]]:
+        """
+        Dense retrieval for many queries at once: one encode call for all of
+        them and one (queries x chunks) matrix product. Returns one list of
+        get_top_chunk_records-style hits per query, in order.
+        """
+        if not queries:
+            return []
+        if not len(self.index) or not len(self.text_chunks):
+            return [[] for _ in queries]
+        q_emb = normalize_rows(cached_encode(self.model, list(queries), MODEL_NAME))
+        sims = q_emb @ self.index.matrix.T
+        return [[self._record(int(i), float(row[i])) for i in top_k_indices(row, top_k)] for row in sims]
 
     def query(self, query_text: str, top_k: int = 3):
         return self.get_top_chunks(query_text, top_k=top_k)
 
+    def search_corpus(self, query: str, top_k: int = 10, nprobe: int = None):
+        """
+        Search every stored resume, not just this one.
+        Returns a list of (resume_id, chunk, score), one entry per resume.
+        """
+        corpus = get_corpus_index(os.path.dirname(os.path.normpath(self.db_path)))
+        q_emb = cached_encode(self.model, [query], MODEL_NAME)[0]
+        return corpus.search(q_emb, top_k=top_k, nprobe=nprobe)
+
     # ---------- utilities ----------
     def has_resume(self) -> bool:
-        return bool(self.text_chunks and self.embeddings)
+        return bool(len(self.text_chunks) and len(self.index))
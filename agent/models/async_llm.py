@@ -0,0 +1,169 @@
+"""
+asyncio front end for the LLM backends.
+
+AsyncLLMClient runs many prompts concurrently while staying inside the
+API quota: at most max_in_flight requests are open, token buckets cap
+requests and tokens per minute, and 429 / 5xx / timeout errors are retried
+with jittered exponential backoff instead of being turned into a failure
+string.
+
+    client = AsyncLLMClient.from_config(llm)
+    texts = client.run_batch(prompts)              # from synchronous code
+    texts = await client.generate_many(prompts)    # inside an event loop
+"""
+import time
+import random
+import asyncio
+from agent.rag.chunker import estimate_tokens
+from agent.utils import load_config
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_RETRYABLE_WORDS = ("429", "quota", "rate limit", "resource exhausted", "unavailable",
+                    "deadline", "timeout", "timed out", "internal error")
+
+
+def status_code(exc: Exception):
+    """HTTP-style status of an API error (google.api_core errors carry it in .code)."""
+    for attr in ("code", "status_code"):
+        code = getattr(exc, attr, None)
+        try:
+            return int(code)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    code = status_code(exc)
+    if code is not None:
+        return code in RETRYABLE_STATUS
+    message = str(exc).lower()
+    return any(word in message for word in _RETRYABLE_WORDS)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: float = None):
+        """Refills continuously at per_minute / 60 per second, holding at most `capacity`."""
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be taken now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class AsyncLLMClient:
+    def __init__(self, llm, max_in_flight: int = 4, requests_per_minute: float = None,
+                 tokens_per_minute: float = None, max_retries: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 30.0, expected_output_tokens: int = 512, timeout: float = 120.0):
+        """
+        llm: backend with `async generate_async(prompt, max_tokens, use_cache)`
+        that raises on API errors (GeminiLLM); backends without it are run in
+        a worker thread through their synchronous generate().
+        requests_per_minute / tokens_per_minute: None disables that limit.
+        Tokens are estimated as prompt tokens plus max_tokens (or
+        expected_output_tokens).
+        """
+        self.llm = llm
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.expected_output_tokens = expected_output_tokens
+        self.timeout = timeout
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+        self._loop = None
+        self._semaphore = None
+        self._bucket_lock = None
+
+    @classmethod
+    def from_config(cls, llm, **overrides):
+        """Limits from the `llm` block of configs/config.yaml; keyword arguments win."""
+        cfg = (load_config() or {}).get("llm", {}) or {}
+        keys = ("max_in_flight", "requests_per_minute", "tokens_per_minute", "max_retries",
+                "base_delay", "max_delay", "timeout")
+        kwargs = {k: cfg[k] for k in keys if cfg.get(k) is not None}
+        kwargs.update(overrides)
+        return cls(llm, **kwargs)
+
+    def _bind_loop(self):
+        # asyncio primitives belong to one event loop; run_batch starts a new one each call
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._bucket_lock = asyncio.Lock()
+
+    async def _throttle(self, tokens: int):
+        async with self._bucket_lock:
+            while True:
+                wait = max(self.requests.wait_time(1) if self.requests else 0.0,
+                           self.tokens.wait_time(tokens) if self.tokens else 0.0)
+                if wait <= 0:
+                    break
+                self.stats["throttled_seconds"] += wait
+                await asyncio.sleep(wait)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform(0, min(max_delay, base * 2^attempt))."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def _call(self, prompt: str, max_tokens: int = None, use_cache: bool = True) -> str:
+        if hasattr(self.llm, "generate_async"):
+            coro = self.llm.generate_async(prompt, max_tokens=max_tokens, use_cache=use_cache)
+        else:
+            coro = asyncio.to_thread(self.llm.generate, prompt, max_tokens)
+        return await asyncio.wait_for(coro, timeout=self.timeout)
+
+    async def generate(self, prompt: str, max_tokens: int = None, use_cache: bool = True) -> str:
+        """One prompt, within the concurrency and rate limits; raises once retries run out."""
+        self._bind_loop()
+        cost = estimate_tokens(prompt) + (max_tokens or self.expected_output_tokens)
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._throttle(cost)
+                self.stats["requests"] += 1
+                try:
+                    return await self._call(prompt, max_tokens, use_cache)
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        self.stats["failures"] += 1
+                        raise
+            # sleep outside the semaphore so other prompts can use the slot
+            self.stats["retries"] += 1
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+
+    async def generate_many(self, prompts, max_tokens: int = None, use_cache: bool = True,
+                            return_exceptions: bool = True) -> list:
+        """Results in prompt order; failed prompts yield their exception when return_exceptions."""
+        tasks = [self.generate(p, max_tokens=max_tokens, use_cache=use_cache) for p in prompts]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    def run_batch(self, prompts, max_tokens: int = None, use_cache: bool = True,
+                  return_exceptions: bool = True) -> list:
+        """Synchronous wrapper around generate_many (not usable inside a running loop)."""
+        return asyncio.run(self.generate_many(prompts, max_tokens=max_tokens, use_cache=use_cache,
+                                              return_exceptions=return_exceptions))
@@ -0,0 +1,157 @@
+"""
+Backend-independent part of the LLM clients.
+
+BaseLLM owns what every backend shares: the response cache, per-call
+latency metrics, generate() on top of stream(), and the error handling
+that turns a failed call into LLM_UNAVAILABLE. A backend only implements
+_stream_chunks (sync streaming) and _generate_once_async (one async call
+that raises on API errors). create_llm() picks the backend named by the
+`llm: backend` key of configs/config.yaml.
+"""
+import time
+import json
+import hashlib
+from collections import deque
+from agent.utils import load_config
+
+LLM_UNAVAILABLE = "LLM not available. Please check API key or network."
+LLM_BACKENDS = ("gemini", "offline")
+
+
+class BaseLLM:
+    def __init__(self, model_name: str, cache=None):
+        """cache: a DiskLRUCache for responses, or None to always call the backend."""
+        self.model_name = model_name
+        self.cache = cache
+        self.last_metrics = None
+        self.metrics = deque(maxlen=200)
+
+    # ---------- backend hooks ----------
+    def _stream_chunks(self, prompt: str, generation_config: dict = None):
+        """Yield response text pieces as the backend produces them."""
+        raise NotImplementedError
+
+    async def _generate_once_async(self, prompt: str, generation_config: dict = None) -> str:
+        """Full response text of one call; raises on API errors."""
+        raise NotImplementedError
+
+    # ---------- public API ----------
+    def cache_key(self, prompt: str, generation_config: dict = None) -> str:
+        payload = json.dumps([self.model_name, prompt, generation_config or {}], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def stream(self, prompt: str, max_tokens: int = None, use_cache: bool = True):
+        """
+        Yield the response text chunk by chunk, as the backend sends it.
+        Time-to-first-token and total latency of the call are recorded in
+        self.last_metrics (and kept in self.metrics); printing is up to the caller.
+        A response cached for the same (model, prompt, generation config) is
+        returned as a single chunk without calling the backend; pass
+        use_cache=False for prompts that should get a fresh answer every time.
+        """
+        gen_cfg = {"max_output_tokens": max_tokens} if max_tokens else None
+        start = time.perf_counter()
+        metrics = {"ttft": None, "total": None, "chars": 0, "chunks": 0, "cached": False, "error": None}
+        key = self.cache_key(prompt, gen_cfg) if use_cache and self.cache is not None else None
+        parts = []
+        try:
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                metrics["cached"] = True
+                chunks = [cached.decode("utf-8")]
+            else:
+                chunks = self._stream_chunks(prompt, gen_cfg)
+            for text in chunks:
+                if not text:
+                    continue
+                if metrics["ttft"] is None:
+                    metrics["ttft"] = time.perf_counter() - start
+                metrics["chars"] += len(text)
+                metrics["chunks"] += 1
+                parts.append(text)
+                yield text
+
+            if key and not metrics["cached"] and parts:
+                self.cache.put(key, "".join(parts).encode("utf-8"))
+
+        except Exception as e:
+            metrics["error"] = str(e)
+            print(f"\n⚠️ LLM call failed: {e}")
+            if not metrics["chunks"]:
+                yield LLM_UNAVAILABLE
+
+        finally:
+            metrics["total"] = time.perf_counter() - start
+            self.last_metrics = metrics
+            self.metrics.append(metrics)
+
+    def generate(self, prompt: str, max_tokens: int = None, use_cache: bool = True) -> str:
+        """
+        Return the full response text (no printing, no artificial delay).
+        """
+        return "".join(self.stream(prompt, max_tokens, use_cache=use_cache))
+
+    async def generate_async(self, prompt: str, max_tokens: int = None, use_cache: bool = True) -> str:
+        """
+        Non-streaming async call for AsyncLLMClient. Unlike generate(), API
+        errors (quota, timeouts, ...) are raised so the caller can retry them.
+        """
+        gen_cfg = {"max_output_tokens": max_tokens} if max_tokens else None
+        key = self.cache_key(prompt, gen_cfg) if use_cache and self.cache is not None else None
+        start = time.perf_counter()
+        metrics = {"ttft": None, "total": None, "chars": 0, "chunks": 0, "cached": False, "error": None}
+        try:
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                metrics["cached"] = True
+                text = cached.decode("utf-8")
+            else:
+                text = await self._generate_once_async(prompt, gen_cfg) or ""
+                if key and text:
+                    self.cache.put(key, text.encode("utf-8"))
+            metrics["ttft"] = time.perf_counter() - start
+            metrics["chars"] = len(text)
+            metrics["chunks"] = 1
+            return text
+        except Exception as e:
+            metrics["error"] = str(e)
+            raise
+        finally:
+            metrics["total"] = time.perf_counter() - start
+            self.last_metrics = metrics
+            self.metrics.append(metrics)
+
+    def latency_summary(self) -> dict:
+        """
+        Mean / p50 / p95 of time-to-first-token and total latency over recent
+        calls (cache hits included), plus how many of them were cache hits.
+        """
+        summary = {"calls": len(self.metrics), "cached": sum(1 for m in self.metrics if m["cached"])}
+        for key in ("ttft", "total"):
+            values = sorted(m[key] for m in self.metrics if m[key] is not None)
+            if not values:
+                continue
+            summary[key] = {
+                "mean": sum(values) / len(values),
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+            }
+        return summary
+
+
+def llm_backend(config: dict = None) -> str:
+    cfg = config if config is not None else (load_config() or {})
+    backend = ((cfg.get("llm") or {}).get("backend") or "gemini").lower()
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend} (expected one of {', '.join(LLM_BACKENDS)})")
+    return backend
+
+
+def create_llm(config: dict = None) -> BaseLLM:
+    """Build the LLM backend selected by `llm: backend` (gemini | offline)."""
+    cfg = config if config is not None else (load_config() or {})
+    if llm_backend(cfg) == "offline":
+        from agent.models.offline_llm import OfflineLLM
+        return OfflineLLM.from_config(cfg)
+    from agent.models.llm_interface import GeminiLLM
+    return GeminiLLM()
@@ -1,17 +1,40 @@
 import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
-from sentence_transformers import SentenceTransformer
+from agent.models.registry import get_embedding_model
+from agent.cache import get_embedding_cache, cached_encode
 
 # Suppress warnings globally
 warnings.filterwarnings("ignore")
 
+GEMINI_EMBEDDING_MODEL = "models/text-embedding-004"
+# batchEmbedContents accepts at most 100 texts per request
+GEMINI_MAX_BATCH = 100
+
+
 class Embedder:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, batch_size: int = GEMINI_MAX_BATCH, max_concurrency: int = 4,
+                 local_batch_size: int = 64, client=None, use_cache: bool = True):
+        """
+        client: object exposing embed_content(model=..., content=...); defaults
+        to the google.generativeai module (tests and benchmarks pass a stub).
+        use_cache: look embeddings up in (and add them to) the on-disk
+        embedding cache, keyed by model name and text.
+        """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        self.local_model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.client = client or genai
+        self.batch_size = max(1, min(batch_size, GEMINI_MAX_BATCH))
+        self.max_concurrency = max(1, max_concurrency)
+        self.local_batch_size = local_batch_size
+        self.cache = get_embedding_cache() if use_cache else None
+        # shared registry handle; weights load only if the local fallback is used
+        self.local_model = get_embedding_model()
         self.use_local = False
 
+        if client is not None:
+            return
+
         if not self.api_key:
             # No API key → fallback immediately
             self.use_local = True
@@ -30,15 +53,89 @@ class Embedder:
 
         # Try Gemini embeddings first
         if not self.use_local:
+            cached = self._cached([text])
+            if cached:
+                return cached[0]
             try:
-                response = genai.embed_content(
-                    model="models/text-embedding-004",
+                response = self.client.embed_content(
+                    model=GEMINI_EMBEDDING_MODEL,
                     content=text,
                 )
+                self._remember([text], [response["embedding"]])
                 return response["embedding"]
             except Exception:
                 # Switch once to local model silently
                 self.use_local = True
 
         # Use local embeddings as fallback
-        return self.local_model.encode([text])[0].tolist()
+        return self._encode_local([text])[0].tolist()
+
+    def embed_batch(self, texts, batch_size: int = None):
+        """
+        Embed many texts; returns one vector (list of floats) per input, in
+        order, with [] for blank inputs just like embed().
+        Gemini batches of up to batch_size texts are sent with at most
+        max_concurrency requests in flight. The first failed request switches
+        the embedder to the local model, as embed() does, and then every text
+        is encoded locally in one call: Gemini and local vectors have different
+        dimensions, so one call never mixes them.
+        Texts found in the embedding cache are not sent anywhere.
+        """
+        results = [[] for _ in texts]
+        todo = [i for i, t in enumerate(texts) if t and t.strip()]
+        if not todo:
+            return results
+
+        if not self.use_local:
+            cached = self._cached([texts[i] for i in todo])
+            for j, vector in cached.items():
+                results[todo[j]] = vector
+            hits = {todo[j] for j in cached}
+            misses = [i for i in todo if i not in hits]
+            size = max(1, min(batch_size or self.batch_size, GEMINI_MAX_BATCH))
+            batches = [misses[i:i + size] for i in range(0, len(misses), size)]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(batches)))) as pool:
+                futures = [pool.submit(self._embed_remote, [texts[i] for i in batch]) for batch in batches]
+                for batch, future in zip(batches, futures):
+                    if self.use_local:
+                        # stop sending requests once Gemini has failed
+                        future.cancel()
+                        continue
+                    try:
+                        vectors = future.result()
+                    except Exception:
+                        self.use_local = True
+                        continue
+                    for i, vector in zip(batch, vectors):
+                        results[i] = vector
+                    self._remember([texts[i] for i in batch], vectors)
+            if not self.use_local:
+                return results
+            # Gemini failed partway: drop its vectors (cached ones included) and
+            # re-encode the whole call locally so all rows share one dimension
+
+        vectors = self._encode_local([texts[i] for i in todo])
+        for i, vector in zip(todo, vectors):
+            results[i] = vector.tolist()
+        return results
+
+    def _embed_remote(self, batch):
+        response = self.client.embed_content(model=GEMINI_EMBEDDING_MODEL, content=batch)
+        vectors = response["embedding"]
+        if len(vectors) != len(batch):
+            raise ValueError(f"expected {len(batch)} embeddings, got {len(vectors)}")
+        return vectors
+
+    def _encode_local(self, texts):
+        return cached_encode(self.local_model, texts, use_cache=self.cache is not None,
+                             batch_size=self.local_batch_size)
+
+    def _cached(self, texts) -> dict:
+        """Cached Gemini embeddings of `texts`, as {position: list of floats}."""
+        if self.cache is None:
+            return {}
+        return {i: v.tolist() for i, v in self.cache.get_many(GEMINI_EMBEDDING_MODEL, texts).items()}
+
+    def _remember(self, texts, vectors):
+        if self.cache is not None:
+            self.cache.put_many(GEMINI_EMBEDDING_MODEL, texts, vectors)
@@ -1,81 +1,71 @@
-import google.generativeai as genai
-import os, yaml
-import sys
-import time
+import os
+import threading
+from agent.cache import get_cache
+from agent.models.base_llm import BaseLLM, LLM_UNAVAILABLE
+from agent.utils import load_config
 
-# Import your custom tools
-from agent.tools.ats_score import ATSAnalyzer
-from agent.tools.file_parser import extract_text
-from agent.tools.linkedin_search import LinkedInSearch
-from agent.tools.resume_optimizer import ResumeOptimizer
+MODEL_NAME = "gemini-2.5-flash"
 
-class GeminiLLM:
-    def __init__(self):
+class GeminiLLM(BaseLLM):
+    def __init__(self, api_key: str = None):
         """
-        Initialize the Gemini LLM using API key from configs/config.yaml
+        Gemini client. Nothing is imported or configured here: the API key
+        (argument, then GEMINI_API_KEY in the environment, then
+        configs/config.yaml) is applied on the first real request, so a bad
+        key surfaces as a failed call instead of a startup round-trip.
         """
-        print("⚙️  Initializing agent...")
-
-        try:
-            config_path = os.path.join("configs", "config.yaml")
-            if not os.path.exists(config_path):
-                raise FileNotFoundError(f"Missing config file: {config_path}")
-
-            with open(config_path, "r") as f:
-                cfg = yaml.safe_load(f)
-
-            if "GEMINI_API_KEY" not in cfg:
-                raise KeyError("GEMINI_API_KEY not found in config.yaml")
-
-            genai.configure(api_key=cfg["GEMINI_API_KEY"])
-
-            self.model = genai.GenerativeModel(
-                model_name="gemini-2.5-flash",
-                tools=[
-                    ResumeOptimizer(self).generate,
-                    ATSAnalyzer(self).analyze,
-                    extract_text,
-                    LinkedInSearch().search_jobs,
-                ]
-            )
-
-            print("✅ Agent initialized successfully with custom tools!")
-
-        except Exception as e:
-            print(f"❌ LLM initialization failed: {e}")
-            sys.exit(1)
-
-    def generate(self, prompt: str, max_tokens: int = None) -> str:
-        """
-        Generate text from the LLM with live streaming effect.
-        """
-        try:
-            gen_cfg = {"max_output_tokens": max_tokens} if max_tokens else {}
-
-            stream = self.model.generate_content(
-                prompt,
-                stream=True,
-                generation_config=gen_cfg if gen_cfg else None
-            )
-
-            full_text = ""
-            print("💬 Generating response...\n")
-
-            for chunk in stream:
-                if chunk.text:
-                    for ch in chunk.text:
-                        print(ch, end="", flush=True)
-                        time.sleep(0.01)
-                        full_text += ch
-
-            print()  
-            return ""
-
-        except Exception as e:
-            print(f"\n⚠️ LLM call failed: {e}")
-            return "LLM not available. Please check API key or network."
-
-    def stream(self, prompt: str, max_tokens: int = None):
-        """Alias for generate(), to support .stream() calls from core.py"""
-        return self.generate(prompt, max_tokens)
+        # on-disk response cache (None if disabled in config)
+        super().__init__(MODEL_NAME, cache=get_cache("llm"))
+        self.api_key = api_key
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._configure()
+        return self._model
+
+    def _configure(self):
+        import google.generativeai as genai
+
+        # Import your custom tools
+        from agent.tools.ats_score import ATSAnalyzer
+        from agent.tools.file_parser import extract_text
+        from agent.tools.linkedin_search import LinkedInSearch
+        from agent.tools.resume_optimizer import ResumeOptimizer
+
+        api_key = self.api_key or os.getenv("GEMINI_API_KEY") or (load_config() or {}).get("GEMINI_API_KEY")
+        if not api_key:
+            raise KeyError("GEMINI_API_KEY not set (environment or configs/config.yaml)")
 
+        print("⚙️  Initializing agent...")
+        genai.configure(api_key=api_key)
+
+        model = genai.GenerativeModel(
+            model_name=self.model_name,
+            tools=[
+                ResumeOptimizer(self).generate,
+                ATSAnalyzer(self).analyze,
+                extract_text,
+                LinkedInSearch().search_jobs,
+            ]
+        )
+
+        print("✅ Agent initialized successfully with custom tools!")
+        return model
+
+    def _stream_chunks(self, prompt: str, generation_config: dict = None):
+        response = self.model.generate_content(
+            prompt,
+            stream=True,
+            generation_config=generation_config
+        )
+        for chunk in response:
+            yield chunk.text
+
+    async def _generate_once_async(self, prompt: str, generation_config: dict = None) -> str:
+        response = await self.model.generate_content_async(prompt, generation_config=generation_config)
+        return response.text
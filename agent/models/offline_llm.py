@@ -0,0 +1,180 @@
+"""
+Deterministic stand-in for GeminiLLM that needs no API key or network.
+
+Select it with
+
+    llm:
+      backend: offline
+
+in configs/config.yaml to run the whole agent end-to-end offline (CI,
+benchmarks, load tests). Responses are templated from the prompt, so the
+same prompt always gets the same text; latency, token rate and 429 /
+timeout errors are simulated.
+"""
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from agent.models.base_llm import BaseLLM
+from agent.rag.chunker import estimate_tokens
+
+
+class OfflineRateLimitError(Exception):
+    """Simulated quota error; carries code 429 like google.api_core's ResourceExhausted."""
+    code = 429
+
+
+class OfflineTimeoutError(TimeoutError):
+    code = 504
+
+
+# (marker found in the prompt, response template); first match wins
+DEFAULT_TEMPLATES = [
+    ("ats scoring report",
+     "==========================\n"
+     "ATS SCORING REPORT\n"
+     "==========================\n"
+     "Candidate Name: Not Found\n"
+     "Target Role: Not Found\n"
+     "ATS Match Score: {score}\n\n"
+     "Feedback Summary:\n"
+     "The resume covers {coverage} of the core requirements for this role. "
+     "Stronger evidence of impact and role-specific keywords would raise the score.\n"
+     "=========================="),
+    ("latex",
+     "\\documentclass[11pt]{{article}}\n"
+     "\\usepackage[utf8]{{inputenc}}\n"
+     "\\pagestyle{{empty}}\n"
+     "\\begin{{document}}\n"
+     "\\section*{{Summary}}\n"
+     "Offline optimized resume (prompt {digest}).\n"
+     "\\end{{document}}"),
+    ("candidate summary report",
+     "==========================\n"
+     "CANDIDATE SUMMARY REPORT\n"
+     "==========================\n"
+     "Candidate Name: Name not found\n"
+     "Summary:\n"
+     "Offline summary of a {words}-word prompt (id {digest}). The candidate shows relevant "
+     "experience and a consistent record of delivery across the listed roles.\n"
+     "=========================="),
+    ("optimiz",
+     "SUMMARY\nResults-driven professional (offline draft {digest}).\n"
+     "SKILLS\nCommunication, Problem Solving, Python\n"
+     "EXPERIENCE\n- Delivered projects with measurable impact.\n"),
+]
+DEFAULT_RESPONSE = "Offline response {digest}: the resume fragments above answer this in {words} words of context."
+
+
+class OfflineLLM(BaseLLM):
+    def __init__(self, latency: float = 0.3, tokens_per_second: float = 150.0, chunk_tokens: int = 8,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, timeout_seconds: float = 1.0,
+                 seed: int = 0, templates=None, default_response: str = DEFAULT_RESPONSE,
+                 model_name: str = "offline", cache=None):
+        """
+        latency: seconds before the first chunk (time to first token).
+        tokens_per_second: simulated generation speed after the first chunk.
+        chunk_tokens: tokens per streamed chunk.
+        error_rate / timeout_rate: probability that a call raises a 429
+        (OfflineRateLimitError) or, after timeout_seconds, a timeout.
+        Error injection uses its own random.Random(seed), so a run with the
+        same call order fails on the same calls.
+        templates: [(marker, template)] matched case-insensitively against
+        the prompt; templates may use {score}, {coverage}, {digest} and {words}.
+        """
+        super().__init__(model_name, cache=cache)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.templates = list(templates) if templates is not None else DEFAULT_TEMPLATES
+        self.default_response = default_response
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+
+    @classmethod
+    def from_config(cls, config: dict = None):
+        """Settings from the `llm: offline` block (latency_ms, tokens_per_second, error_rate, ...)."""
+        offline = ((config or {}).get("llm") or {}).get("offline") or {}
+        kwargs = {}
+        if "latency_ms" in offline:
+            kwargs["latency"] = offline["latency_ms"] / 1000.0
+        if "timeout_ms" in offline:
+            kwargs["timeout_seconds"] = offline["timeout_ms"] / 1000.0
+        for key in ("tokens_per_second", "chunk_tokens", "error_rate", "timeout_rate", "seed"):
+            if offline.get(key) is not None:
+                kwargs[key] = offline[key]
+        if offline.get("cache"):
+            from agent.cache import get_cache
+            kwargs["cache"] = get_cache("llm")
+        return cls(**kwargs)
+
+    # ---------- canned responses ----------
+    def respond(self, prompt: str, max_tokens: int = None) -> str:
+        """The deterministic response text for `prompt`."""
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+        values = {
+            "digest": digest[:8],
+            "score": 40 + int(digest[:4], 16) % 56,
+            "coverage": ("most", "many", "some", "few")[int(digest[4], 16) % 4],
+            "words": len(prompt.split()),
+        }
+        lowered = prompt.lower()
+        template = next((t for marker, t in self.templates if marker in lowered), self.default_response)
+        text = template.format(**values)
+        if max_tokens:
+            text = text[:max_tokens * 4]
+        return text
+
+    def _pieces(self, text: str):
+        words = text.split(" ")
+        step = max(1, self.chunk_tokens * 3 // 4)  # roughly 0.75 words per token
+        for i in range(0, len(words), step):
+            piece = " ".join(words[i:i + step])
+            yield piece + (" " if i + step < len(words) else "")
+
+    def _fault(self):
+        """Decide (reproducibly) whether this call fails: None, "429" or "timeout"."""
+        with self._rng_lock:
+            self.calls += 1
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return "429"
+        if roll < self.error_rate + self.timeout_rate:
+            return "timeout"
+        return None
+
+    # ---------- backend hooks ----------
+    def _stream_chunks(self, prompt: str, generation_config: dict = None):
+        max_tokens = (generation_config or {}).get("max_output_tokens")
+        fault = self._fault()
+        if fault == "timeout":
+            time.sleep(self.timeout_seconds)
+            raise OfflineTimeoutError("Simulated deadline exceeded")
+        time.sleep(self.latency)
+        if fault == "429":
+            raise OfflineRateLimitError("429 Simulated quota exceeded")
+        first = True
+        for piece in self._pieces(self.respond(prompt, max_tokens)):
+            if not first and self.tokens_per_second:
+                time.sleep(estimate_tokens(piece) / self.tokens_per_second)
+            first = False
+            yield piece
+
+    async def _generate_once_async(self, prompt: str, generation_config: dict = None) -> str:
+        max_tokens = (generation_config or {}).get("max_output_tokens")
+        fault = self._fault()
+        if fault == "timeout":
+            await asyncio.sleep(self.timeout_seconds)
+            raise OfflineTimeoutError("Simulated deadline exceeded")
+        await asyncio.sleep(self.latency)
+        if fault == "429":
+            raise OfflineRateLimitError("429 Simulated quota exceeded")
+        text = self.respond(prompt, max_tokens)
+        if self.tokens_per_second:
+            await asyncio.sleep(max(0, estimate_tokens(text) - self.chunk_tokens) / self.tokens_per_second)
+        return text
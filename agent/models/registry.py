@@ -0,0 +1,107 @@
+import os
+import time
+import threading
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# output size of known models, so it can be reported without loading weights
+EMBEDDING_DIMENSIONS = {"all-MiniLM-L6-v2": 384}
+
+
+def _rss_bytes():
+    """Resident set size of this process, or None if it cannot be read."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        pass
+    try:
+        with open(f"/proc/{os.getpid()}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+class LazyModel:
+    """
+    Stand-in for a SentenceTransformer that loads the real model on first use.
+    All attribute access (encode, get_sentence_embedding_dimension, ...) is
+    forwarded to the shared instance.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._model = None
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.rss_delta_bytes = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def dimension(self) -> int:
+        """Embedding size; loads the model only if the name is not in EMBEDDING_DIMENSIONS."""
+        if self._model is None and self.name in EMBEDDING_DIMENSIONS:
+            return EMBEDDING_DIMENSIONS[self.name]
+        return self.get().get_sentence_embedding_dimension()
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    rss_before = _rss_bytes()
+                    start = time.perf_counter()
+                    model = SentenceTransformer(self.name)
+                    self.load_seconds = time.perf_counter() - start
+                    rss_after = _rss_bytes()
+                    if rss_before is not None and rss_after is not None:
+                        self.rss_delta_bytes = rss_after - rss_before
+                    self._model = model
+        return self._model
+
+    def encode(self, *args, **kwargs):
+        return self.get().encode(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # only reached for attributes not defined on LazyModel itself
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "loaded": self.loaded,
+            "load_seconds": self.load_seconds,
+            "rss_delta_bytes": self.rss_delta_bytes,
+        }
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_embedding_model(name: str = DEFAULT_EMBEDDING_MODEL) -> LazyModel:
+    """
+    Process-wide handle for a sentence-transformers model.
+    Every caller asking for the same name gets the same LazyModel, so the
+    weights are loaded at most once, on the first encode.
+    """
+    with _models_lock:
+        if name not in _models:
+            _models[name] = LazyModel(name)
+        return _models[name]
+
+
+def model_stats() -> list:
+    """Load time and resident-memory growth for every requested model."""
+    with _models_lock:
+        models = list(_models.values())
+    stats = [m.stats() for m in models]
+    rss = _rss_bytes()
+    for s in stats:
+        s["process_rss_bytes"] = rss
+    return stats
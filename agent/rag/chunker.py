@@ -0,0 +1,138 @@
+import re
+from typing import List
+
+# Headings commonly used in resumes, matched case-insensitively on their own line.
+SECTION_HEADINGS = {
+    "summary": "SUMMARY",
+    "professional summary": "SUMMARY",
+    "profile": "SUMMARY",
+    "about me": "SUMMARY",
+    "objective": "OBJECTIVE",
+    "career objective": "OBJECTIVE",
+    "skills": "SKILLS",
+    "technical skills": "SKILLS",
+    "core skills": "SKILLS",
+    "key skills": "SKILLS",
+    "core competencies": "SKILLS",
+    "tools and technologies": "SKILLS",
+    "experience": "EXPERIENCE",
+    "work experience": "EXPERIENCE",
+    "professional experience": "EXPERIENCE",
+    "employment history": "EXPERIENCE",
+    "internships": "EXPERIENCE",
+    "internship": "EXPERIENCE",
+    "projects": "PROJECTS",
+    "academic projects": "PROJECTS",
+    "personal projects": "PROJECTS",
+    "education": "EDUCATION",
+    "academic background": "EDUCATION",
+    "certifications": "CERTIFICATIONS",
+    "certificates": "CERTIFICATIONS",
+    "licenses and certifications": "CERTIFICATIONS",
+    "achievements": "ACHIEVEMENTS",
+    "awards": "ACHIEVEMENTS",
+    "honors and awards": "ACHIEVEMENTS",
+    "publications": "PUBLICATIONS",
+    "languages": "LANGUAGES",
+    "interests": "INTERESTS",
+    "hobbies": "INTERESTS",
+    "volunteering": "VOLUNTEERING",
+    "extracurricular activities": "ACTIVITIES",
+    "activities": "ACTIVITIES",
+    "additional information": "ADDITIONAL",
+    "contact": "CONTACT",
+}
+
+HEADER_SECTION = "HEADER"
+
+_BULLET = re.compile(r"^\s*(?:[-*•●▪◦‣\uf0b7]|\d+[.)])\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9(\"'])")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token for English text)."""
+    return max(1, (len(text) + 3) // 4) if text else 0
+
+
+def detect_heading(line: str):
+    """Return the canonical section name if `line` is a section heading, else None."""
+    stripped = line.strip().strip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    key = re.sub(r"[^a-z& ]", "", stripped.lower()).replace("&", "and")
+    key = re.sub(r"\s+", " ", key).strip()
+    if key in SECTION_HEADINGS:
+        return SECTION_HEADINGS[key]
+    return None
+
+
+def split_sections(text: str):
+    """Split resume text into [(section, [lines])] in document order."""
+    sections = [(HEADER_SECTION, [])]
+    for line in text.splitlines():
+        heading = detect_heading(line)
+        if heading:
+            sections.append((heading, []))
+        elif line.strip():
+            sections[-1][1].append(line.strip())
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def _units(lines: List[str], target_tokens: int) -> List[str]:
+    """Break section lines into sentence-sized units no larger than target_tokens."""
+    units = []
+    for line in lines:
+        pieces = [line] if _BULLET.match(line) else _SENTENCE_END.split(line)
+        for piece in pieces:
+            piece = piece.strip()
+            if not piece:
+                continue
+            if estimate_tokens(piece) <= target_tokens:
+                units.append(piece)
+                continue
+            # a single run-on sentence: fall back to word windows
+            words, current = piece.split(), []
+            for word in words:
+                if current and estimate_tokens(" ".join(current + [word])) > target_tokens:
+                    units.append(" ".join(current))
+                    current = []
+                current.append(word)
+            if current:
+                units.append(" ".join(current))
+    return units
+
+
+def chunk_resume(text: str, target_tokens: int = 200, overlap_tokens: int = 40) -> List[dict]:
+    """
+    Split resume text into section-aware chunks.
+    Chunks never cross a section heading and never cut a sentence or bullet;
+    consecutive chunks of the same section share up to overlap_tokens of
+    trailing units. Returns dicts with "text", "section" and "tokens".
+    """
+    chunks = []
+    for section, lines in split_sections(text or ""):
+        units = _units(lines, target_tokens)
+        current, size = [], 0
+        for unit in units:
+            cost = estimate_tokens(unit)
+            if current and size + cost > target_tokens:
+                chunks.append(_make_chunk(current, section))
+                # carry the tail of the previous chunk over as overlap
+                carry, carry_size = [], 0
+                for prev in reversed(current):
+                    prev_cost = estimate_tokens(prev)
+                    if carry_size + prev_cost > overlap_tokens or carry_size + prev_cost + cost > target_tokens:
+                        break
+                    carry.insert(0, prev)
+                    carry_size += prev_cost
+                current, size = carry, carry_size
+            current.append(unit)
+            size += cost
+        if current:
+            chunks.append(_make_chunk(current, section))
+    return chunks
+
+
+def _make_chunk(units: List[str], section: str) -> dict:
+    text = "\n".join(units)
+    return {"text": text, "section": section, "tokens": estimate_tokens(text)}
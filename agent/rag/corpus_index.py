@@ -0,0 +1,396 @@
+"""
+Approximate nearest-neighbour index over every resume in data/vector_dbs.
+
+IVF layout in pure NumPy: rows are grouped into `n_lists` clusters by
+spherical k-means, and a query only scores the rows of its `nprobe` closest
+clusters. Raising nprobe trades latency for recall; nprobe == n_lists is
+exact search.
+
+Files under <root>/_corpus/:
+    manifest.json   dim, n_lists, training state, resume_id -> owner number
+    centroids.npy   float32 (n_lists, dim)
+    vectors.f32     float32 rows (normalized); grouped by cluster up to
+                    trained_rows, appended in arrival order after that
+    assign.i32      cluster id per row (-1 until trained)
+    owners.i32      append-only owner number per row
+    local.i32       append-only chunk index inside the resume's own store
+
+Re-adding a resume gives it a new owner number; its old rows become dead
+and are dropped the next time the index is re-clustered.
+Chunk texts are not duplicated here; they are read from the per-resume
+store only for the rows that are returned.
+"""
+import os
+import json
+import threading
+import numpy as np
+from agent.rag.vector_index import normalize_rows, top_k_indices
+from agent.rag import vector_store
+
+CORPUS_DIR_NAME = "_corpus"
+INDEX_VERSION = 1
+
+_ROW_FILES = {
+    "vectors": ("vectors.f32", np.float32),
+    "assign": ("assign.i32", np.int32),
+    "owners": ("owners.i32", np.int32),
+    "local": ("local.i32", np.int32),
+}
+
+
+def _spherical_kmeans(sample: np.ndarray, n_lists: int, iterations: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=n_lists)
+        empty = counts == 0
+        # re-seed empty clusters from random points so no list stays unused
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class CorpusIndex:
+    def __init__(self, root: str = os.path.join("data", "vector_dbs"), n_lists: int = None,
+                 nprobe: int = 8, min_train_size: int = 2048, retrain_factor: float = 4.0):
+        """
+        root: folder holding one vector store per resume.
+        n_lists: number of IVF clusters (default: ~sqrt(rows) when trained).
+        nprobe: clusters scanned per query unless overridden in search().
+        min_train_size: rows needed before clustering kicks in; below it
+            every query is an exact scan, which is already fast at that size.
+        retrain_factor: re-cluster once the index has grown this many times
+            past the size it was trained on.
+        """
+        self.root = root
+        self.path = os.path.join(root, CORPUS_DIR_NAME)
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_factor = retrain_factor
+        self._lock = threading.RLock()
+        self._load()
+
+    # ---------- persistence ----------
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self):
+        self.manifest = {
+            "version": INDEX_VERSION, "dim": 0, "trained_rows": 0,
+            "resumes": {}, "next_owner": 0,
+        }
+        manifest_path = self._file("manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == INDEX_VERSION:
+                self.manifest = manifest
+
+        self.centroids = None
+        if self.manifest["trained_rows"] and os.path.exists(self._file("centroids.npy")):
+            self.centroids = np.load(self._file("centroids.npy"))
+        self._map_rows()
+
+    def _map_rows(self):
+        dim = self.manifest["dim"]
+        sizes = []
+        for key, (name, dtype) in _ROW_FILES.items():
+            path = self._file(name)
+            itemsize = np.dtype(dtype).itemsize * (dim if key == "vectors" else 1)
+            sizes.append(os.path.getsize(path) // itemsize if dim and os.path.exists(path) else 0)
+        # a crash between appends can leave files of different lengths; only
+        # rows present in every file count
+        n = min(sizes)
+        for key, (name, dtype) in _ROW_FILES.items():
+            shape = (n, dim) if key == "vectors" else (n,)
+            if n:
+                arr = np.memmap(self._file(name), dtype=dtype, mode="r", shape=shape)
+            else:
+                arr = np.zeros(shape, dtype=dtype)
+            setattr(self, "_" + key, arr)
+        self._lists = None
+        self._alive = None
+
+    def _unmap_rows(self):
+        # drop our own mappings before files are truncated or replaced (Windows)
+        for key, (_, dtype) in _ROW_FILES.items():
+            setattr(self, "_" + key, np.zeros((0,) if key != "vectors" else (0, 0), dtype=dtype))
+
+    def _save_manifest(self):
+        tmp = self._file("manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self._file("manifest.json"))
+
+    def _append_rows(self, vectors, assign, owners, local):
+        os.makedirs(self.path, exist_ok=True)
+        n = len(self._owners)
+        self._unmap_rows()
+        for key, values in (("vectors", vectors), ("assign", assign), ("owners", owners), ("local", local)):
+            name, dtype = _ROW_FILES[key]
+            with open(self._file(name), "r+b" if os.path.exists(self._file(name)) else "wb") as f:
+                # truncate any torn tail left by an interrupted append
+                row_bytes = np.dtype(dtype).itemsize * (self.manifest["dim"] if key == "vectors" else 1)
+                f.truncate(n * row_bytes)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def __len__(self):
+        return int(self._owners.shape[0])
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def resume_ids(self):
+        return list(self.manifest["resumes"])
+
+    # ---------- insertion ----------
+    def add(self, resume_id: str, vectors):
+        """Insert (or replace) one resume's chunk embeddings."""
+        self.add_many([(resume_id, vectors)])
+
+    def add_many(self, entries):
+        """
+        Insert many (resume_id, vectors) pairs with a single append per file.
+        Vectors are row-aligned with the resume's own store.
+        """
+        with self._lock:
+            blocks, owners, local = [], [], []
+            for resume_id, vectors in entries:
+                mat = normalize_rows(vectors) if len(vectors) else np.zeros((0, 0), dtype=np.float32)
+                owner = self.manifest["next_owner"]
+                self.manifest["next_owner"] += 1
+                self.manifest["resumes"][resume_id] = owner
+                if not len(mat):
+                    continue
+                if not self.manifest["dim"]:
+                    self.manifest["dim"] = int(mat.shape[1])
+                elif mat.shape[1] != self.manifest["dim"]:
+                    raise ValueError(f"{resume_id}: dim {mat.shape[1]} != index dim {self.manifest['dim']}")
+                blocks.append(mat)
+                owners.append(np.full(len(mat), owner, dtype=np.int32))
+                local.append(np.arange(len(mat), dtype=np.int32))
+
+            if blocks:
+                mat = np.vstack(blocks)
+                assign = self._nearest_lists(mat) if self.trained else np.full(len(mat), -1, dtype=np.int32)
+                self._append_rows(mat, assign, np.concatenate(owners), np.concatenate(local))
+            self._save_manifest()
+            self._map_rows()
+            self._maybe_train()
+
+    def remove(self, resume_id: str):
+        with self._lock:
+            if self.manifest["resumes"].pop(resume_id, None) is not None:
+                self._save_manifest()
+                self._alive = None
+
+    # ---------- clustering ----------
+    def _nearest_lists(self, mat: np.ndarray, batch: int = 65536) -> np.ndarray:
+        out = np.empty(len(mat), dtype=np.int32)
+        for start in range(0, len(mat), batch):
+            out[start:start + batch] = np.argmax(mat[start:start + batch] @ self.centroids.T, axis=1)
+        return out
+
+    def _maybe_train(self):
+        n = int(self.alive_mask().sum())
+        trained_rows = self.manifest["trained_rows"]
+        if n < self.min_train_size:
+            return
+        if not trained_rows or n >= trained_rows * self.retrain_factor:
+            self.train()
+
+    def train(self, n_lists: int = None, iterations: int = 10, sample_size: int = 65536, seed: int = 0):
+        """
+        (Re)cluster all live rows. The row files are rewritten grouped by
+        cluster, so each inverted list is one contiguous slice of vectors.f32;
+        dead rows are dropped on the way.
+        """
+        with self._lock:
+            alive = np.flatnonzero(self.alive_mask())
+            if not len(alive):
+                return
+            n_lists = n_lists or self.n_lists or max(1, int(round(np.sqrt(len(alive)))))
+            n_lists = min(n_lists, len(alive))
+            rng = np.random.default_rng(seed)
+            pick = alive if len(alive) <= sample_size else np.sort(rng.choice(alive, sample_size, replace=False))
+            self.centroids = _spherical_kmeans(np.asarray(self._vectors[pick]), n_lists, iterations, seed=seed)
+
+            assign = np.empty(len(alive), dtype=np.int32)
+            for start in range(0, len(alive), 65536):
+                assign[start:start + 65536] = self._nearest_lists(np.asarray(self._vectors[alive[start:start + 65536]]))
+            order = np.argsort(assign, kind="stable")
+            rows = alive[order]
+
+            tmp = ".tmp"
+            for key, (name, dtype) in _ROW_FILES.items():
+                with open(self._file(name + tmp), "wb") as f:
+                    if key == "assign":
+                        f.write(assign[order].tobytes())
+                        continue
+                    src = getattr(self, "_" + key)
+                    for start in range(0, len(rows), 65536):
+                        f.write(np.ascontiguousarray(src[rows[start:start + 65536]], dtype=dtype).tobytes())
+            np.save(self._file("centroids.npy"), self.centroids)
+            self._unmap_rows()
+            for name, _ in _ROW_FILES.values():
+                os.replace(self._file(name + tmp), self._file(name))
+            self.manifest["trained_rows"] = len(alive)
+            self.manifest["n_lists"] = n_lists
+            self._save_manifest()
+            self._map_rows()
+
+    def reset(self):
+        """Drop every row and the clustering, leaving an empty index on disk."""
+        with self._lock:
+            self._unmap_rows()
+            for name in [n for n, _ in _ROW_FILES.values()] + ["centroids.npy"]:
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            self.centroids = None
+            self.manifest = {
+                "version": INDEX_VERSION, "dim": 0, "trained_rows": 0,
+                "resumes": {}, "next_owner": 0,
+            }
+            os.makedirs(self.path, exist_ok=True)
+            self._save_manifest()
+            self._map_rows()
+
+    def rebuild(self):
+        """
+        Compact the index from the per-resume stores under root: drops dead
+        rows, picks up stores written outside store_resume, then re-clusters.
+        """
+        with self._lock:
+            entries = []
+            for name in sorted(os.listdir(self.root)) if os.path.isdir(self.root) else []:
+                db_path = os.path.join(self.root, name)
+                if name.startswith("_") or not os.path.isdir(db_path):
+                    continue
+                if not vector_store.has_store(db_path):
+                    vector_store.migrate_pickle(db_path)
+                loaded = vector_store.load_store(db_path)
+                if loaded:
+                    entries.append((name, loaded[1]))
+
+            self.reset()
+            self.add_many(entries)
+            if not self.trained and len(self) >= self.min_train_size:
+                self.train()
+        return len(entries)
+
+    # ---------- search ----------
+    def alive_mask(self) -> np.ndarray:
+        if self._alive is None:
+            live = np.fromiter(self.manifest["resumes"].values(), dtype=np.int32)
+            self._alive = np.isin(self._owners, live)
+        return self._alive
+
+    def _list_bounds(self) -> np.ndarray:
+        # rows [0, trained_rows) are grouped by cluster; later appends form an unsorted tail
+        if self._lists is None:
+            sorted_assign = self._assign[:self.manifest["trained_rows"]]
+            self._lists = np.searchsorted(sorted_assign, np.arange(len(self.centroids) + 1))
+        return self._lists
+
+    def _candidate_scores(self, q: np.ndarray, nprobe: int):
+        if not self.trained or nprobe >= len(self.centroids):
+            return np.arange(len(self)), self._vectors @ q
+
+        probe = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+        bounds = self._list_bounds()
+        rows, scores = [], []
+        for c in probe:
+            start, end = bounds[c], bounds[c + 1]
+            rows.append(np.arange(start, end))
+            scores.append(self._vectors[start:end] @ q)
+        tail_start = self.manifest["trained_rows"]
+        tail = tail_start + np.flatnonzero(np.isin(self._assign[tail_start:], probe))
+        rows.append(tail)
+        scores.append(np.asarray(self._vectors[tail]) @ q)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def search_rows(self, query_vec, top_k: int = 10, nprobe: int = None, per_resume: bool = True):
+        """
+        Return (row_ids, scores) of the best rows, best first.
+        per_resume keeps only each resume's best-scoring chunk.
+        """
+        with self._lock:
+            if not len(self):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            q = normalize_rows(query_vec)[0]
+            rows, scores = self._candidate_scores(q, nprobe or self.nprobe)
+            keep = self.alive_mask()[rows]
+            rows, scores = rows[keep], scores[keep]
+            if not per_resume:
+                best = top_k_indices(scores, top_k)
+                return rows[best], scores[best]
+            order = np.argsort(-scores, kind="stable")
+            rows, scores = rows[order], scores[order]
+            _, first = np.unique(self._owners[rows], return_index=True)
+            first.sort()
+            return rows[first][:top_k], scores[first][:top_k]
+
+    def _search_owned(self, query_vec, top_k: int, nprobe: int, per_resume: bool):
+        # rows are resolved to ids under the same lock as the search, so a
+        # concurrent add cannot remap owners in between
+        with self._lock:
+            rows, scores = self.search_rows(query_vec, top_k=top_k, nprobe=nprobe, per_resume=per_resume)
+            owner_to_id = {v: k for k, v in self.manifest["resumes"].items()}
+            return [(owner_to_id[int(self._owners[row])], int(self._local[row]), float(score))
+                    for row, score in zip(rows, scores)]
+
+    def search_ids(self, query_vec, top_k: int = 10, nprobe: int = None, per_resume: bool = True):
+        """Return a list of (resume_id, score), best first."""
+        return [(resume_id, score) for resume_id, _, score in
+                self._search_owned(query_vec, top_k, nprobe, per_resume)]
+
+    def search(self, query_vec, top_k: int = 10, nprobe: int = None, per_resume: bool = True):
+        """Return a list of (resume_id, chunk_text, score), best first."""
+        return [(resume_id, self._chunk_text(resume_id, local), score) for resume_id, local, score in
+                self._search_owned(query_vec, top_k, nprobe, per_resume)]
+
+    def _chunk_text(self, resume_id: str, local_idx: int) -> str:
+        # opened per result and closed again so the store can be rewritten later
+        loaded = vector_store.load_store(os.path.join(self.root, resume_id))
+        if not loaded:
+            return ""
+        texts = loaded[0]
+        try:
+            return texts[local_idx] if local_idx < len(texts) else ""
+        finally:
+            texts.close()
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def get_corpus_index(root: str = os.path.join("data", "vector_dbs")) -> CorpusIndex:
+    """Process-wide CorpusIndex per root folder."""
+    key = os.path.abspath(root)
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = CorpusIndex(root)
+        return _shared[key]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resumini corpus index tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    reb = sub.add_parser("rebuild", help="Rebuild the corpus index from every resume store")
+    reb.add_argument("root", nargs="?", default=os.path.join("data", "vector_dbs"))
+    reb.add_argument("--n-lists", type=int, default=None)
+    args = parser.parse_args()
+
+    index = CorpusIndex(args.root, n_lists=args.n_lists)
+    count = index.rebuild()
+    print(f"Indexed {count} resume(s), {len(index)} chunk(s), trained={index.trained}.")
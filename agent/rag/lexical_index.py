@@ -0,0 +1,126 @@
+import os
+import re
+import json
+import math
+from collections import Counter
+from typing import List
+import numpy as np
+
+LEXICAL_FILE = "bm25.json"
+LEXICAL_VERSION = 1
+
+# keeps skill tokens such as c++, c#, node.js, scikit-learn and ci/cd intact
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./\-]*[a-z0-9+#]|[a-z0-9]")
+
+# abbreviation -> canonical token, applied to documents and queries alike
+ALIASES = {
+    "k8s": "kubernetes",
+    "js": "javascript",
+    "ts": "typescript",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "postgres": "postgresql",
+    "golang": "go",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "gcp": "google-cloud",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "of", "on", "or", "the", "to", "with", "what", "which", "who",
+    "does", "do", "did", "any", "this", "that", "their", "his", "her", "candidate",
+    "resume", "experience", "years", "year",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for tok in _TOKEN.findall((text or "").lower()):
+        tok = ALIASES.get(tok, tok)
+        if tok not in STOPWORDS:
+            tokens.append(tok)
+    return tokens
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Okapi BM25 over a list of chunk texts (one document per chunk)."""
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> [[doc, tf], ...]
+        self.doc_lens = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return int(self.doc_lens.shape[0])
+
+    def build(self, texts):
+        self.postings = {}
+        lens = []
+        for doc, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lens.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append([doc, tf])
+        self.doc_lens = np.asarray(lens, dtype=np.float32)
+        return self
+
+    def idf(self, term: str) -> float:
+        n = len(self.postings.get(term, ()))
+        return math.log(1.0 + (len(self) - n + 0.5) / (n + 0.5))
+
+    def scores(self, query_tokens: List[str]) -> np.ndarray:
+        scores = np.zeros(len(self), dtype=np.float32)
+        if not len(self):
+            return scores
+        avgdl = float(self.doc_lens.mean()) or 1.0
+        for term in set(query_tokens):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            docs, tfs = np.asarray(plist, dtype=np.int64).T
+            tfs = tfs.astype(np.float32)
+            norm = self.k1 * (1.0 - self.b + self.b * self.doc_lens[docs] / avgdl)
+            scores[docs] += self.idf(term) * tfs * (self.k1 + 1.0) / (tfs + norm)
+        return scores
+
+    def matched_terms(self, query_tokens: List[str], doc: int) -> set:
+        return {t for t in set(query_tokens) if any(d == doc for d, _ in self.postings.get(t, ()))}
+
+    # ---------- persistence ----------
+    def save(self, db_path: str):
+        data = {
+            "version": LEXICAL_VERSION, "k1": self.k1, "b": self.b,
+            "doc_lens": self.doc_lens.astype(int).tolist(), "postings": self.postings,
+        }
+        tmp = os.path.join(db_path, LEXICAL_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, os.path.join(db_path, LEXICAL_FILE))
+
+    @classmethod
+    def load(cls, db_path: str, count: int):
+        """Return the saved index, or None if missing, outdated or out of sync with the store."""
+        path = os.path.join(db_path, LEXICAL_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        if data.get("version") != LEXICAL_VERSION or len(data.get("doc_lens", [])) != count:
+            return None
+        index = cls(k1=data["k1"], b=data["b"])
+        index.postings = data["postings"]
+        index.doc_lens = np.asarray(data["doc_lens"], dtype=np.float32)
+        return index
+
+
+def reciprocal_rank_fusion(rankings, k: int = 60) -> dict:
+    """Fuse ranked lists of doc ids: score(d) = sum over lists of 1 / (k + rank)."""
+    fused = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            fused[doc] = fused.get(doc, 0.0) + 1.0 / (k + rank)
+    return fused
@@ -1,17 +1,31 @@
 from agent.rag.retriever import Retriever
 from agent.prompts import SUMMARY_PROMPT
+from agent.utils import load_config
 import textwrap
 
 class RAGPipeline:
-    def __init__(self, llm, memory):
+    def __init__(self, llm, memory, top_k: int = None, max_context_tokens: int = None):
+        rag_cfg = (load_config() or {}).get("rag", {}) or {}
         self.llm = llm
         self.memory = memory
-        self.retriever = Retriever(memory)
+        self.retriever = Retriever(memory, mode=rag_cfg.get("retrieval_mode", "hybrid"))
+        self.top_k = top_k or rag_cfg.get("top_k", 4)
+        self.max_context_tokens = max_context_tokens or rag_cfg.get("max_context_tokens", 600)
+
+    def build_prompt(self, user_query: str) -> str:
+        # retrieve relevant chunks, labelled with their resume section
+        records = self.retriever.retrieve_records(user_query, top_k=self.top_k,
+                                                  token_budget=self.max_context_tokens)
+        combined = "\n\n".join(
+            f"[{r['section']}]\n{r['text']}" if r.get("section") else r["text"] for r in records
+        )
+        return f"{user_query}\n\nRelevant resume fragments:\n{combined}\n\nAnswer concisely."
 
     def query(self, user_query: str):
-        # retrieve relevant chunks
-        chunks = self.retriever.retrieve(user_query, top_k=3)
-        combined = "\n\n".join(chunks) if chunks else ""
-        prompt = f"{user_query}\n\nRelevant resume fragments:\n{combined}\n\nAnswer concisely."
+        prompt = self.build_prompt(user_query)
         resp = self.llm.generate(prompt)
         return textwrap.fill(resp.strip(), width=100)
+
+    def stream_query(self, user_query: str, use_cache: bool = True):
+        """Yield the answer's text chunks as the LLM produces them (unwrapped)."""
+        yield from self.llm.stream(self.build_prompt(user_query), use_cache=use_cache)
@@ -1,6 +1,32 @@
+from agent.rag.chunker import estimate_tokens
+
+
 class Retriever:
-    def __init__(self, memory):
+    def __init__(self, memory, mode: str = "hybrid"):
+        """mode: default ranking, "dense", "lexical" or "hybrid" (see ResumeMemory.get_top_chunk_records)."""
         self.memory = memory
+        self.mode = mode
+
+    def retrieve(self, query: str, top_k: int = 3, mode: str = None):
+        return self.memory.get_top_chunks(query, top_k=top_k, mode=mode or self.mode)
 
-    def retrieve(self, query: str, top_k: int = 3):
-        return self.memory.get_top_chunks(query, top_k=top_k)
+    def retrieve_records(self, query: str, top_k: int = 3, token_budget: int = None, mode: str = None):
+        """
+        Ranked chunk records (text, section, score) for the query.
+        Lines already returned by a higher-ranked chunk (chunk overlap) are
+        dropped. With token_budget, stops before the combined chunk text
+        would exceed it, so the prompt stays small regardless of top_k.
+        """
+        kept, used, seen = [], 0, set()
+        for r in self.memory.get_top_chunk_records(query, top_k=top_k, mode=mode or self.mode):
+            lines = [l for l in r["text"].splitlines() if l not in seen]
+            if not lines:
+                continue
+            text = "\n".join(lines)
+            cost = estimate_tokens(text)
+            if token_budget is not None and kept and used + cost > token_budget:
+                break
+            seen.update(lines)
+            kept.append(dict(r, text=text))
+            used += cost
+        return kept
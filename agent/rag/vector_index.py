@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    """
+    Return a float32 copy of `matrix` with every row scaled to unit length.
+    Zero rows stay zero so they score 0.0 against any query (same as the old _cosine).
+    """
+    mat = np.asarray(matrix, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat.reshape(1, -1)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return mat / norms
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Indices of the `top_k` highest scores, best first.
+    Uses argpartition so only the selected slice is sorted; ties keep the
+    lower index first, matching Python's stable sorted(..., reverse=True).
+    """
+    n = scores.shape[0]
+    if top_k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k < n:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        # argpartition may pick any member of a tie at the boundary; pull in
+        # every index tied with the k-th score so ordering stays deterministic
+        kth = scores[candidates].min()
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:top_k]
+
+
+class VectorIndex:
+    def __init__(self, embeddings=None, normalized: bool = False):
+        """
+        Exact cosine-similarity index over one float32 matrix.
+        embeddings: (n, dim) array-like. Rows are normalized once on build
+        unless normalized=True (e.g. a matrix read back from disk).
+        """
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        if embeddings is not None and len(embeddings):
+            if normalized:
+                self.matrix = np.asarray(embeddings, dtype=np.float32)
+            else:
+                self.matrix = normalize_rows(embeddings)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    def scores(self, query_vec) -> np.ndarray:
+        """Cosine score of every row against one query vector."""
+        q = normalize_rows(query_vec)[0]
+        return self.matrix @ q
+
+    def search(self, query_vec, top_k: int = 3):
+        """
+        Return (indices, scores) of the top_k rows for one query, best first.
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.scores(query_vec)
+        idxs = top_k_indices(scores, top_k)
+        return idxs, scores[idxs]
@@ -0,0 +1,285 @@
+"""
+On-disk vector store for one resume (one folder under data/vector_dbs/).
+
+Layout (format version 4):
+    manifest.json   format name, version, generation, count, dim, dtype, model
+    vectors.<generation>.npy   float32 (count, dim) matrix, rows already L2-normalized
+    chunks.<generation>.bin    UTF-8 chunk texts, concatenated
+    offsets.<generation>.npy   int64 (count + 1,) byte offsets into chunks.bin
+    keys.<generation>.npy      uint8 (count, 20) sha1 of (model, chunk text) per row
+    chunks_meta.<generation>.json  per-chunk metadata list (e.g. {"section": "SKILLS"})
+
+Every save writes a new generation of data files and then replaces the
+manifest, which names the generation to read; a crash mid-save leaves the
+previous manifest pointing at the previous, complete set of files.
+
+Older stores are still readable: versions 1-3 use the file names without
+a generation, version 1 has no keys.npy (keys are recomputed from the
+chunk texts) and versions 1-2 have no metadata.
+
+Loading memory-maps vectors.npy and chunks.bin, so startup cost does not
+grow with the corpus and chunk text is only decoded when it is read.
+
+Migrate legacy vectors.pkl folders with:
+    python -m agent.rag.vector_store migrate [data/vector_dbs]
+"""
+import os
+import json
+import mmap
+import uuid
+import pickle
+import hashlib
+import numpy as np
+from agent.rag.vector_index import normalize_rows
+
+FORMAT_NAME = "resumini-vectors"
+FORMAT_VERSION = 4
+READABLE_VERSIONS = (1, 2, 3, 4)
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.bin"
+OFFSETS_FILE = "offsets.npy"
+KEYS_FILE = "keys.npy"
+META_FILE = "chunks_meta.json"
+LEGACY_PICKLE_FILE = "vectors.pkl"
+DATA_FILES = (VECTORS_FILE, CHUNKS_FILE, OFFSETS_FILE, KEYS_FILE, META_FILE)
+
+
+class ChunkTexts:
+    """
+    Read-only sequence of chunk strings backed by a memory-mapped chunks.bin.
+    Each item is decoded on access.
+    """
+
+    def __init__(self, path: str, offsets: np.ndarray):
+        self.offsets = offsets
+        self._file = None
+        self._buf = b""
+        if int(offsets[-1]) > 0:
+            self._file = open(path, "rb")
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("chunk index out of range")
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self._buf[start:end].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        """Release the mapping (needed on Windows before the files can be replaced)."""
+        if self._file is not None:
+            self._buf.close()
+            self._file.close()
+            self._file = None
+            self._buf = b""
+
+
+def chunk_key(model_name: str, text: str) -> bytes:
+    """Content key of one embedding: sha1 over the model id and the chunk text."""
+    return hashlib.sha1(f"{model_name or ''}\0{text}".encode("utf-8")).digest()
+
+
+def has_store(db_path: str) -> bool:
+    return os.path.exists(os.path.join(db_path, MANIFEST_FILE))
+
+
+def read_manifest(db_path: str) -> dict:
+    with open(os.path.join(db_path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def data_file(db_path: str, name: str, manifest: dict) -> str:
+    """Path of data file `name` (e.g. VECTORS_FILE) for the generation the manifest names."""
+    generation = manifest.get("generation")
+    if generation:
+        stem, ext = os.path.splitext(name)
+        name = f"{stem}.{generation}{ext}"
+    return os.path.join(db_path, name)
+
+
+def _remove_stale(db_path: str, generation: str):
+    """Delete data files of other generations (and pre-version-4 names)."""
+    keep = {os.path.basename(data_file(db_path, n, {"generation": generation})) for n in DATA_FILES}
+    for entry in os.listdir(db_path):
+        if entry in keep:
+            continue
+        for name in DATA_FILES:
+            stem, ext = os.path.splitext(name)
+            if entry == name or (entry.startswith(stem + ".") and entry.endswith(ext)):
+                try:
+                    os.remove(os.path.join(db_path, entry))
+                except OSError:
+                    pass  # still mapped (Windows); removed by a later save
+                break
+
+
+def save_store(db_path: str, texts, vectors, model_name: str = None, normalized: bool = False,
+               keys=None, meta=None):
+    """
+    Write chunk texts and their embeddings in the binary layout.
+    Data files go to a new generation and the manifest is replaced last, so
+    readers see either the old store or the new one, never a mix.
+    """
+    os.makedirs(db_path, exist_ok=True)
+    texts = list(texts)
+    if len(texts):
+        matrix = np.asarray(vectors, dtype=np.float32) if normalized else normalize_rows(vectors)
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    if matrix.shape[0] != len(texts):
+        raise ValueError(f"{len(texts)} chunks but {matrix.shape[0]} vectors")
+
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+
+    if keys is None:
+        keys = [chunk_key(model_name, t) for t in texts]
+
+    if meta is None:
+        meta = [{} for _ in texts]
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "generation": uuid.uuid4().hex[:12],
+        "count": len(texts),
+        "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "dtype": "float32",
+        "normalized": True,
+        "model": model_name,
+    }
+    with open(data_file(db_path, META_FILE, manifest), "w", encoding="utf-8") as f:
+        json.dump(list(meta), f)
+    with open(data_file(db_path, KEYS_FILE, manifest), "wb") as f:
+        np.save(f, np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(len(texts), 20))
+    with open(data_file(db_path, VECTORS_FILE, manifest), "wb") as f:
+        np.save(f, np.ascontiguousarray(matrix))
+    with open(data_file(db_path, OFFSETS_FILE, manifest), "wb") as f:
+        np.save(f, offsets)
+    with open(data_file(db_path, CHUNKS_FILE, manifest), "wb") as f:
+        f.write(b"".join(encoded))
+
+    # the manifest switches readers to the new generation in one rename
+    tmp = os.path.join(db_path, MANIFEST_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(db_path, MANIFEST_FILE))
+    _remove_stale(db_path, manifest["generation"])
+
+
+def load_store(db_path: str):
+    """
+    Open a store without copying it into memory.
+    Returns (texts, matrix, manifest) where texts is a ChunkTexts and matrix a
+    read-only np.memmap, or None if the folder holds no valid store.
+    """
+    if not has_store(db_path):
+        return None
+    manifest = read_manifest(db_path)
+    if manifest.get("format") != FORMAT_NAME or manifest.get("version") not in READABLE_VERSIONS:
+        return None
+
+    count = manifest.get("count", 0)
+    try:
+        offsets = np.load(data_file(db_path, OFFSETS_FILE, manifest), mmap_mode="r" if count else None)
+        if count:
+            matrix = np.load(data_file(db_path, VECTORS_FILE, manifest), mmap_mode="r")
+        else:
+            matrix = np.zeros((0, manifest.get("dim", 0)), dtype=np.float32)
+        if matrix.shape[0] != count or offsets.shape[0] != count + 1:
+            return None
+        texts = ChunkTexts(data_file(db_path, CHUNKS_FILE, manifest), offsets)
+    except FileNotFoundError:
+        return None  # a concurrent save replaced this generation after the manifest was read
+    return texts, matrix, manifest
+
+
+def load_keys(db_path: str, texts, manifest: dict) -> list:
+    """Per-row content keys of a loaded store, recomputed for version 1 stores."""
+    path = data_file(db_path, KEYS_FILE, manifest)
+    if manifest.get("version", 1) >= 2 and os.path.exists(path):
+        keys = np.load(path)
+        if keys.shape[0] == len(texts):
+            return [k.tobytes() for k in keys]
+    return [chunk_key(manifest.get("model"), t) for t in texts]
+
+
+def load_meta(db_path: str, count: int, manifest: dict = None) -> list:
+    """Per-chunk metadata dicts; empty dicts for stores written before version 3."""
+    if manifest is None:
+        manifest = read_manifest(db_path) if has_store(db_path) else {}
+    path = data_file(db_path, META_FILE, manifest)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if len(meta) == count:
+            return meta
+    return [{} for _ in range(count)]
+
+
+# ---------- legacy migration ----------
+def migrate_pickle(db_path: str, model_name: str = None, remove_pickle: bool = False) -> bool:
+    """
+    Convert <db_path>/vectors.pkl into the binary layout.
+    Returns True if a store was written.
+    """
+    pkl_path = os.path.join(db_path, LEGACY_PICKLE_FILE)
+    if not os.path.exists(pkl_path):
+        return False
+    with open(pkl_path, "rb") as f:
+        data = pickle.load(f)
+    texts = data.get("texts", []) or []
+    embeddings = data.get("embeddings", []) or []
+    save_store(db_path, texts, embeddings, model_name=model_name)
+    if remove_pickle:
+        os.remove(pkl_path)
+    return True
+
+
+def migrate_all(root: str = os.path.join("data", "vector_dbs"), model_name: str = None,
+                remove_pickle: bool = False, force: bool = False):
+    """Migrate every <root>/<name>/vectors.pkl that has no binary store yet."""
+    migrated = []
+    if not os.path.isdir(root):
+        return migrated
+    for name in sorted(os.listdir(root)):
+        db_path = os.path.join(root, name)
+        if not os.path.isdir(db_path) or (has_store(db_path) and not force):
+            continue
+        try:
+            if migrate_pickle(db_path, model_name=model_name, remove_pickle=remove_pickle):
+                migrated.append(name)
+                print(f"✅ Migrated {db_path}")
+        except Exception as e:
+            print(f"⚠️ Could not migrate {db_path}: {e}")
+    return migrated
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resumini vector store tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    mig = sub.add_parser("migrate", help="Convert legacy vectors.pkl folders")
+    mig.add_argument("root", nargs="?", default=os.path.join("data", "vector_dbs"))
+    mig.add_argument("--model", default="all-MiniLM-L6-v2")
+    mig.add_argument("--remove-pickle", action="store_true")
+    mig.add_argument("--force", action="store_true", help="Re-migrate folders that already have a store")
+    args = parser.parse_args()
+
+    done = migrate_all(args.root, model_name=args.model, remove_pickle=args.remove_pickle, force=args.force)
+    print(f"Migrated {len(done)} folder(s).")
@@ -0,0 +1,179 @@
+"""
+In-process LRU of loaded resumes.
+
+Loading a resume means extracting its text and opening (or building) its
+ResumeMemory. ResumeCache keeps recently used ones, keyed by their vector
+store folder, so switching back to a candidate loaded a moment ago skips
+both. The budget is in bytes (embedding matrix + chunk texts + extracted
+text), set by `session_cache: max_mb` in configs/config.yaml; the least
+recently used resumes are dropped first.
+
+A cached entry is reused only while its source is unchanged: file loads
+compare size and mtime, text loads compare the text itself.
+"""
+import os
+import threading
+from collections import OrderedDict
+from agent.tools.file_parser import extract_text
+from agent.utils import load_config, resume_id_for
+
+DEFAULT_DB_ROOT = os.path.join("data", "vector_dbs")
+DEFAULT_SESSION_CACHE_MB = 512
+BUILD_LOCK_STRIPES = 64
+
+
+def memory_nbytes(memory, text: str = "") -> int:
+    """
+    Approximate footprint of a loaded resume. Memory-mapped matrices and
+    chunk files are counted at full size even if the OS has not paged them in.
+    """
+    matrix = memory.index.matrix
+    size = int(matrix.nbytes) if matrix is not None else 0
+    size += sum(len(c.encode("utf-8")) for c in memory.text_chunks)
+    size += len(text.encode("utf-8"))
+    return size
+
+
+class CachedResume:
+    def __init__(self, resume_id: str, db_path: str, memory, text: str, signature=None):
+        self.resume_id = resume_id
+        self.db_path = db_path
+        self.memory = memory
+        self.text = text
+        self.signature = signature
+        self.nbytes = memory_nbytes(memory, text)
+
+
+class ResumeCache:
+    def __init__(self, max_bytes: int, db_root: str = DEFAULT_DB_ROOT):
+        self.max_bytes = int(max_bytes)
+        self.db_root = db_root
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._entries = OrderedDict()  # db_path -> CachedResume, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # striped by db_path, so one resume is built once and its store written by one
+        # thread, without keeping a lock per resume ever loaded
+        self._build_locks = [threading.Lock() for _ in range(BUILD_LOCK_STRIPES)]
+
+    # ---------- lookups ----------
+    def load(self, path: str, resume_id: str = None, extractor=None, db_root: str = None):
+        """
+        Cached resume for the file at `path`, extracting and embedding it on a miss.
+        Returns (CachedResume or None if no text could be extracted, hit).
+        """
+        resume_id = resume_id or resume_id_for(path)
+        st = os.stat(path)
+        signature = ("file", os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        return self._get_or_build(resume_id, signature, lambda: (extractor or extract_text)(path), db_root)
+
+    def load_text(self, resume_id: str, text: str, db_root: str = None):
+        """Same as load() for text that was already extracted."""
+        return self._get_or_build(resume_id, ("text", text), lambda: text, db_root)
+
+    def _get_or_build(self, resume_id: str, signature, get_text, db_root: str = None):
+        from agent.memory import ResumeMemory
+
+        db_path = os.path.join(db_root or self.db_root, resume_id)
+        build_lock = self._build_locks[hash(db_path) % len(self._build_locks)]
+        with build_lock:
+            entry = self._lookup(db_path, signature)
+            if entry is not None:
+                return entry, True
+
+            text = get_text()
+            if not text or not text.strip():
+                return None, False
+            memory = ResumeMemory(db_path=db_path)
+            memory.store_resume(text, resume_id=resume_id)
+            entry = CachedResume(resume_id, db_path, memory, text, signature)
+            self._insert(entry)
+            return entry, False
+
+    def _lookup(self, db_path: str, signature):
+        with self._lock:
+            entry = self._entries.get(db_path)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(db_path)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                # source changed since it was cached
+                self._remove(db_path)
+            self.misses += 1
+            return None
+
+    # ---------- bookkeeping ----------
+    def _insert(self, entry: CachedResume):
+        with self._lock:
+            if entry.db_path in self._entries:
+                self._remove(entry.db_path)
+            self._entries[entry.db_path] = entry
+            self._bytes += entry.nbytes
+            self._evict(keep=entry.db_path)
+
+    def _remove(self, db_path: str):
+        entry = self._entries.pop(db_path)
+        self._bytes -= entry.nbytes
+        return entry
+
+    def _evict(self, keep: str = None):
+        # entries are only dropped from the cache, not closed: a session may
+        # still be reading the memory, and its mmaps are released when unused
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break  # a single resume larger than the budget stays until the next insert
+            entry = self._remove(oldest)
+            self.evictions += 1
+            self.evicted_bytes += entry.nbytes
+
+    def discard(self, resume_id: str, db_root: str = None):
+        with self._lock:
+            db_path = os.path.join(db_root or self.db_root, resume_id)
+            if db_path in self._entries:
+                self._remove(db_path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, resume_id: str):
+        return os.path.join(self.db_root, resume_id) in self._entries
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "occupancy": self._bytes / self.max_bytes if self.max_bytes else 0.0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+                "resumes": [e.resume_id for e in reversed(self._entries.values())],  # most recent first
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_cache() -> ResumeCache:
+    """Process-wide ResumeCache sized by `session_cache: max_mb`."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cfg = (load_config() or {}).get("session_cache", {}) or {}
+            _cache = ResumeCache(int(cfg.get("max_mb", DEFAULT_SESSION_CACHE_MB) * 2 ** 20))
+        return _cache
@@ -0,0 +1,136 @@
+"""
+Headless execution of Resumini commands for scripts and pipelines.
+
+    python main.py run commands.txt            # one chat-style command per line
+    python main.py run --jsonl requests.jsonl  # {"command": ..., "args": {...}} or {"line": ...}
+    cat requests.jsonl | python main.py run --jsonl -
+
+Commands go through the same handlers as the daemon and the HTTP API
+(agent/service.py): no typing effects, sleeps, browser windows or preview
+files (unless --previews DIR is given). Every command produces one JSON
+line on stdout:
+
+    {"index": 1, "command": "score", "ok": true, "seconds": 0.41, "data": {...}, "log": [...]}
+    {"index": 2, "command": "query", "ok": false, "seconds": 0.0, "error": "...", "code": 400}
+
+Progress messages printed by the tools go to stderr so stdout stays
+machine-readable.
+"""
+import os
+import sys
+import json
+import time
+import contextlib
+from agent.service import ResuminiService
+
+
+def read_script(lines):
+    """Chat-style commands, skipping blank lines and # comments."""
+    for number, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if line and not line.startswith("#"):
+            yield number, {"line": line}
+
+
+def read_jsonl(lines):
+    for number, raw in enumerate(lines, 1):
+        if not raw.strip():
+            continue
+        try:
+            request = json.loads(raw)
+        except ValueError as e:
+            yield number, {"invalid": f"Invalid JSON on line {number}: {e}"}
+            continue
+        if not isinstance(request, dict):
+            request = {"invalid": f"Line {number} is not a JSON object"}
+        yield number, request
+
+
+class HeadlessRunner:
+    def __init__(self, service: ResuminiService = None, session: str = "default", previews_dir: str = None,
+                 stream_events: bool = False, stop_on_error: bool = False, out=None, log=None):
+        """
+        previews_dir: write the HTML resume preview / ATS report for load and
+        score results here (nothing is written or opened otherwise).
+        stream_events: also emit every log/chunk event as its own JSON line.
+        out / log: streams for results (default stdout) and tool output (default stderr).
+        """
+        self.service = service or ResuminiService()
+        self.session = session
+        self.previews_dir = previews_dir
+        self.stream_events = stream_events
+        self.stop_on_error = stop_on_error
+        self.out = out or sys.stdout
+        self.log = log or sys.stderr
+
+    def _emit(self, record: dict):
+        self.out.write(json.dumps(record, default=str) + "\n")
+        self.out.flush()
+
+    def run(self, requests) -> dict:
+        """Execute (index, request) pairs in order; returns a summary (also emitted last)."""
+        summary = {"summary": True, "commands": 0, "ok": 0, "failed": 0, "seconds": 0.0}
+        start_all = time.perf_counter()
+        for index, request in requests:
+            record = self.execute(index, request)
+            self._emit(record)
+            summary["commands"] += 1
+            summary["ok" if record["ok"] else "failed"] += 1
+            if not record["ok"] and self.stop_on_error:
+                break
+        summary["seconds"] = round(time.perf_counter() - start_all, 3)
+        self._emit(summary)
+        return summary
+
+    def execute(self, index: int, request: dict) -> dict:
+        if "invalid" in request:
+            return {"index": index, "command": None, "ok": False, "seconds": 0.0,
+                    "error": request["invalid"], "code": 400}
+        session = request.get("session") or self.session
+        if "line" in request:
+            events = self.service.execute(request["line"], session_id=session)
+        else:
+            events = self.service.handle(request.get("command"), request.get("args"), session_id=session)
+
+        record = {"index": index, "command": request.get("command"), "ok": False}
+        if "line" in request:
+            record.update(command=self.service.parse(request["line"])[0], line=request["line"])
+        if "id" in request:
+            record["id"] = request["id"]
+        logs = []
+        start = time.perf_counter()
+        # tools print progress to stdout; keep it off the JSON stream
+        with contextlib.redirect_stdout(self.log):
+            for event in events:
+                kind = event["event"]
+                if kind == "result":
+                    record.update(command=event["command"], ok=True, data=event["data"])
+                elif kind == "error":
+                    record.update(error=event["message"], code=event.get("code", 500))
+                elif kind == "log":
+                    logs.append(event["text"])
+                if self.stream_events and kind in ("log", "chunk"):
+                    self._emit(dict(event, index=index))
+        record["seconds"] = round(time.perf_counter() - start, 3)
+        if logs:
+            record["log"] = logs
+        if record["ok"] and self.previews_dir:
+            preview = self.write_preview(record["command"], record["data"], session)
+            if preview:
+                record["preview"] = preview
+        return record
+
+    def write_preview(self, command: str, data: dict, session: str):
+        from agent.ui.previews import resume_preview_html, ats_report_html, write_preview
+
+        state = self.service.session(session)
+        if command == "load":
+            name = f"{data['resume_id']}_preview.html"
+            return write_preview(resume_preview_html(state.resume_path or data["resume_id"], state.resume_text),
+                                 name, self.previews_dir)
+        if command == "score":
+            name = f"{state.memory and os.path.basename(state.memory.db_path) or session}_ats_report.html"
+            html_content = ats_report_html(data["report"], ai_text=data["feedback"], role=data["role"],
+                                           ai_score=data["ai_score"])
+            return write_preview(html_content, name, self.previews_dir)
+        return None
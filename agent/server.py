@@ -0,0 +1,355 @@
+"""
+Multi-tenant HTTP API for Resumini (plain ASGI, served by uvicorn).
+
+    python main.py api --host 127.0.0.1 --port 8000
+
+Endpoints (JSON bodies; every command but load/ingest/jobs/models needs "session"):
+
+    POST /load        {"text": ..., "resume_id": ...} | raw file body (?filename=cv.pdf)
+    POST /ingest      {"directory": ..., "recursive": false}
+    POST /score       {"session": ..., "role": ...}
+    POST /coverage    {"session": ..., "jd": ...}
+    POST /summarize   {"session": ...}
+    POST /query       {"session": ..., "question": ...}
+    POST /optimize    {"session": ..., "role": ...}
+    POST /jobs        {"jobs": [{"id", "title", "text", "company", "location", "link"}, ...]}
+    POST /jobs/best   {"session": ..., "top_k": 10}
+    GET  /models      GET /health      DELETE /sessions/<id>
+
+/load answers with a new session id (minted here, never chosen by the
+client) unless the id of an open session is given to reload it. Each session
+holds its own resume, vector store and RAG pipeline (see
+agent/service.py), so concurrent recruiters never see each other's state.
+Stores are named after the resume's content (resume_id + hash), so a
+client reusing another's resume id or file name gets a store of its own.
+/candidates (search across every stored resume) is off while tenants are
+isolated, and otherwise answers with resume ids and scores only.
+Add ?stream=1 to get the command's events as NDJSON while it runs
+(LLM text arrives as "chunk" events).
+
+Clients send files as uploads or inline text, never as server paths:
+"path" / "directory" arguments are refused unless `server: allowed_root`
+is set, and then only for paths that resolve inside that folder (so
+/ingest is only available with allowed_root). Uploads are kept in
+data/uploads while their session uses them and deleted when the session
+closes or the load fails.
+
+Commands run in a thread pool, text extraction in a process pool, and the
+event loop only moves bytes, so slow LLM streams do not block other
+requests.
+"""
+import os
+import re
+import json
+import uuid
+import asyncio
+import threading
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from agent.service import ResuminiService
+from agent.tools.file_parser import extract_text
+from agent.utils import load_config, resume_id_for
+
+UPLOAD_DIR = os.path.join("data", "uploads")
+SESSION_ID = re.compile(r"[0-9a-f]{32}")
+SESSIONLESS = ("ingest", "models", "candidates", "addjobs")
+PATH_ARGS = ("path", "directory")
+ROUTES = {
+    ("POST", "/load"): "load",
+    ("POST", "/ingest"): "ingest",
+    ("POST", "/score"): "score",
+    ("POST", "/coverage"): "coverage",
+    ("POST", "/summarize"): "summarize",
+    ("POST", "/query"): "query",
+    ("POST", "/optimize"): "optimize",
+    ("POST", "/candidates"): "candidates",
+    ("POST", "/jobs"): "addjobs",
+    ("POST", "/jobs/best"): "bestjobs",
+    ("GET", "/models"): "models",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ResuminiApp:
+    def __init__(self, service: ResuminiService = None, threads: int = None, extract_workers: int = None,
+                 max_body_mb: float = None, warm: bool = True, allowed_root: str = None):
+        """
+        threads: commands running at once (LLM calls wait in these threads).
+        extract_workers: processes for PDF/DOCX extraction (0 = extract in the command thread).
+        allowed_root: folder whose files clients may name by "path" / "directory"
+        (default: none, only uploads and inline text are accepted).
+        Defaults come from the `server` block of configs/config.yaml.
+        """
+        cfg = (load_config() or {}).get("server", {}) or {}
+        self.threads = threads or cfg.get("threads", 32)
+        self.extract_workers = extract_workers if extract_workers is not None else \
+            cfg.get("extract_workers", min(4, os.cpu_count() or 1))
+        self.max_body = int((max_body_mb or cfg.get("max_body_mb", 20)) * 1024 * 1024)
+        allowed_root = allowed_root or cfg.get("allowed_root")
+        self.allowed_root = os.path.realpath(allowed_root) if allowed_root else None
+        self.warm = warm
+        self.service = service or ResuminiService(isolate_tenants=True)
+        self._thread_pool = None
+        self._process_pool = None
+        self._uploads = {}  # session id -> upload file its loaded resume came from
+        self._uploads_lock = threading.Lock()
+
+    # ---------- lifecycle ----------
+    def startup(self):
+        self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="resumini")
+        if self.extract_workers:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.extract_workers)
+            self.service.extractor = self._extract
+        if self.warm:
+            self.service.warm_up()
+
+    def shutdown(self):
+        if self._thread_pool:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _extract(self, path: str) -> str:
+        # called from a command thread; blocks that thread only
+        return self._process_pool.submit(extract_text, path).result()
+
+    # ---------- sessions & uploads ----------
+    def _close_session(self, session_id: str):
+        self.service.close_session(session_id)
+        with self._uploads_lock:
+            upload = self._uploads.pop(session_id, None)
+        if upload:
+            self._remove_upload(upload)
+
+    def _keep_upload(self, session_id: str, upload: str):
+        # a session holds one resume, so the upload of the one it replaces can go
+        with self._uploads_lock:
+            previous = self._uploads.get(session_id)
+            self._uploads[session_id] = upload
+        if previous and previous != upload:
+            self._remove_upload(previous)
+
+    @staticmethod
+    def _remove_upload(upload: str):
+        try:
+            os.remove(upload)
+        except OSError:
+            pass
+
+    def _check_paths(self, args: dict):
+        """Refuse server-side paths, or resolve them and require them under allowed_root."""
+        for key in PATH_ARGS:
+            if key not in args:
+                continue
+            if self.allowed_root is None:
+                raise HTTPError(400, f'"{key}" is not accepted over HTTP; upload the file or send its text')
+            resolved = os.path.realpath(str(args[key]))
+            if os.path.commonpath([resolved, self.allowed_root]) != self.allowed_root:
+                raise HTTPError(403, f"{key} is outside the server's allowed root")
+            args[key] = resolved
+
+    # ---------- ASGI ----------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if self._thread_pool is None:  # server started without lifespan events
+            self.startup()
+        try:
+            await self._dispatch(scope, receive, send)
+        except HTTPError as e:
+            await self._json(send, e.status, {"error": str(e)})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self.startup)
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope, receive, send):
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+
+        if path == "/health":
+            await self._json(send, 200, {"status": "ok", "sessions": len(self.service.sessions)})
+            return
+        if method == "DELETE" and path.startswith("/sessions/"):
+            session_id = path[len("/sessions/"):]
+            if session_id not in self.service.sessions:
+                raise HTTPError(404, f"Unknown session: {session_id}")
+            self._close_session(session_id)
+            await self._json(send, 200, {"closed": session_id})
+            return
+
+        command = ROUTES.get((method, path))
+        if command is None:
+            allowed = [m for m, p in ROUTES if p == path]
+            raise HTTPError(405 if allowed else 404, f"No route for {method} {path}")
+        if command == "candidates" and self.service.isolate_tenants:
+            # corpus-wide search would show other tenants' resumes
+            raise HTTPError(404, "Candidate search is not available while tenants are isolated")
+
+        headers = dict(scope.get("headers") or [])
+        body = await self._read_body(receive)
+        args, upload = await self._parse_args(command, body, headers, query)
+        session_id = args.pop("session", None) or headers.get(b"x-resumini-session", b"").decode() or None
+        stream = str(args.pop("stream", query.get("stream", ""))).lower() in ("1", "true", "yes")
+
+        if command == "candidates":
+            args["with_text"] = False
+
+        # session ids are minted here; a client may only name one it was given
+        if session_id is not None:
+            if not SESSION_ID.fullmatch(session_id):
+                raise HTTPError(400, f"Invalid session id: {session_id}")
+            if session_id not in self.service.sessions:
+                raise HTTPError(404, f"Unknown session: {session_id}")
+        elif command != "load" and command not in SESSIONLESS:
+            raise HTTPError(400, "Missing session (load a resume first)")
+        new_session = session_id is None
+        if new_session:
+            # load starts a session; session-less commands get a throwaway one
+            session_id = uuid.uuid4().hex
+
+        events = self._events(command, args, session_id)
+        try:
+            if stream:
+                await self._stream(send, events, session_id)
+            else:
+                await self._respond(send, events, session_id)
+        finally:
+            session = self.service.sessions.get(session_id)
+            loaded = session is not None and bool(session.resume_text)
+            if new_session and not loaded:
+                self._close_session(session_id)  # failed load or session-less command; don't keep it
+            if upload:
+                if loaded and session.resume_path == os.path.abspath(upload):
+                    self._keep_upload(session_id, upload)
+                else:
+                    self._remove_upload(upload)
+
+    async def _read_body(self, receive) -> bytes:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                raise HTTPError(413, f"Request body larger than {self.max_body // (1024 * 1024)} MB")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def _parse_args(self, command: str, body: bytes, headers: dict, query: dict):
+        """Command arguments and the upload file written for them (or None)."""
+        content_type = headers.get(b"content-type", b"").decode().split(";")[0].strip()
+        if command == "load" and body and content_type not in ("application/json", ""):
+            # raw upload: keep the file in data/uploads and extract it like a local path
+            name = os.path.basename(query.get("filename") or "resume.pdf")
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            upload = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex[:8]}_{name}")
+            with open(upload, "wb") as f:
+                f.write(body)
+            args = {"path": upload, "resume_id": query.get("resume_id") or resume_id_for(upload)}
+            if query.get("session"):
+                args["session"] = query["session"]
+            return args, upload
+        if not body:
+            args = dict(query)
+        else:
+            try:
+                args = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON body: {e}")
+            if not isinstance(args, dict):
+                raise HTTPError(400, "JSON body must be an object")
+        self._check_paths(args)
+        return args, None
+
+    async def _events(self, command: str, args: dict, session_id: str):
+        """Run a service command in the thread pool and yield its events as they are produced."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        finished = object()
+        cancelled = threading.Event()
+
+        def run():
+            events = self.service.handle(command, args, session_id=session_id)
+            try:
+                for event in events:
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+                    if cancelled.is_set():
+                        events.close()
+                        break
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        future = loop.run_in_executor(self._thread_pool, run)
+        try:
+            while True:
+                event = await queue.get()
+                if event is finished:
+                    break
+                yield event
+            await future
+        finally:
+            cancelled.set()
+
+    async def _respond(self, send, events, session_id: str):
+        result, error, logs = None, None, []
+        async for event in events:
+            if event["event"] == "result":
+                result = event
+            elif event["event"] == "error":
+                error = event
+            elif event["event"] == "log":
+                logs.append(event["text"])
+        if error is not None:
+            await self._json(send, error.get("code", 500), {"error": error["message"], "session": session_id})
+        else:
+            await self._json(send, 200, {"session": session_id, "command": result["command"],
+                                         "data": result["data"], "log": logs})
+
+    async def _stream(self, send, events, session_id: str):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson"),
+                                (b"x-resumini-session", session_id.encode())]})
+        async for event in events:
+            line = json.dumps(dict(event, session=session_id), default=str) + "\n"
+            await send({"type": "http.response.body", "body": line.encode("utf-8"), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _json(send, status: int, payload: dict):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def run(host: str = None, port: int = None, **app_kwargs):
+    """Serve ResuminiApp with uvicorn (host/port default to the `server` config block)."""
+    import uvicorn
+
+    cfg = (load_config() or {}).get("server", {}) or {}
+    host = host or cfg.get("host", "127.0.0.1")
+    port = port or cfg.get("port", 8000)
+    print(f"🌐 Resumini API listening on http://{host}:{port}")
+    uvicorn.run(ResuminiApp(**app_kwargs), host=host, port=port, log_level="warning")
@@ -0,0 +1,374 @@
+"""
+Headless command layer shared by the daemon and other front ends.
+
+ResuminiService holds the warm, shared pieces (LLM client, embedding
+model, tools) and one Session per client (loaded resume, its vector
+store and RAG pipeline). Every command is a generator of events:
+
+    {"event": "log", "text": ...}       progress message
+    {"event": "chunk", "text": ...}     streamed LLM text
+    {"event": "result", "data": {...}}  final result (always last on success)
+    {"event": "error", "message": ..., "code": 400|500}  failure (last)
+
+Nothing here prints, sleeps or opens files in a viewer; rendering is up to
+the caller (see agent/daemon.py for the socket client).
+"""
+import os
+import re
+import shlex
+import hashlib
+import inspect
+import threading
+from functools import cached_property
+from agent.models.base_llm import create_llm
+from agent.resume_cache import ResumeCache, get_resume_cache
+from agent.tools.file_parser import extract_text
+from agent.utils import resume_id_for
+
+
+class CommandError(Exception):
+    """A command that cannot run (bad arguments, no resume loaded, ...)."""
+
+
+class Session:
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.resume_path = None
+        self.resume_text = None
+        self.memory = None
+        self.rag = None
+        self.lock = threading.Lock()
+
+    def require_resume(self):
+        if not self.resume_text:
+            raise CommandError("Please load a resume first.")
+
+
+class ResuminiService:
+    # command -> (method name, usage)
+    COMMANDS = {
+        "load": ("load", "load <path>"),
+        "ingest": ("ingest", "ingest <directory>"),
+        "score": ("score", "score <role>"),
+        "coverage": ("coverage", "coverage <job description file or text>"),
+        "summarize": ("summarize", "summarize"),
+        "query": ("query", "query <question>"),
+        "optimize": ("optimize", "optimize <role>"),
+        "jobs": ("jobs", "jobs <query>"),
+        "addjobs": ("add_jobs", "addjobs <file or directory>"),
+        "bestjobs": ("best_jobs", "bestjobs [count]"),
+        "candidates": ("candidates", "candidates <query>"),
+        "models": ("models", "models"),
+    }
+    ALIASES = {"ats": "score", "ats_score": "score", "ask": "query"}
+
+    def __init__(self, llm=None, db_root: str = os.path.join("data", "vector_dbs"), extractor=None,
+                 resumes: ResumeCache = None, job_root: str = os.path.join("data", "job_dbs"),
+                 isolate_tenants: bool = False):
+        """
+        llm: shared LLM backend (default: create_llm() on first use).
+        extractor: callable(path) -> text used by `load`; the HTTP server
+        passes one that runs extract_text in its process pool.
+        resumes: LRU of loaded resumes shared by all sessions (default: the
+        process-wide one from get_resume_cache()).
+        job_root: job description store used by jobs / addjobs / bestjobs.
+        isolate_tenants: name each loaded resume's store after its content
+        (resume_id + content hash), so one client cannot overwrite another
+        client's vectors or corpus rows by reusing a resume id or file name.
+        The HTTP server turns this on.
+        """
+        if llm is not None:
+            self.llm = llm
+        self.db_root = db_root
+        self.job_root = job_root
+        self.isolate_tenants = isolate_tenants
+        self.extractor = extractor or extract_text
+        self.resumes = resumes or get_resume_cache()
+        self.sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    # ---------- shared components (built on first use) ----------
+    @cached_property
+    def llm(self):
+        return create_llm()
+
+    @cached_property
+    def ats(self):
+        from agent.tools.ats_score import ATSAnalyzer
+        return ATSAnalyzer(self.llm)
+
+    @cached_property
+    def optimizer(self):
+        from agent.tools.resume_optimizer import ResumeOptimizer
+        return ResumeOptimizer(self.llm)
+
+    @cached_property
+    def linkedin(self):
+        from agent.tools.linkedin_search import LinkedInSearch
+        return LinkedInSearch(self.llm)
+
+    def warm_up(self):
+        """Load the embedding model now instead of on the first command."""
+        from agent.models.registry import get_embedding_model
+        get_embedding_model().get()
+
+    def session(self, session_id: str = None) -> Session:
+        session_id = session_id or "default"
+        with self._sessions_lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = Session(session_id)
+            return self.sessions[session_id]
+
+    def close_session(self, session_id: str):
+        # the session's ResumeMemory stays in self.resumes for the next load of that resume
+        with self._sessions_lock:
+            self.sessions.pop(session_id, None)
+
+    # ---------- dispatch ----------
+    def handle(self, command: str, args: dict = None, session_id: str = None):
+        """Run one command; yields events and always ends with a result or error event."""
+        command = self.ALIASES.get((command or "").lower(), (command or "").lower())
+        if command not in self.COMMANDS:
+            yield {"event": "error", "message": f"Unknown command: {command}. "
+                                                f"Try: {', '.join(sorted(self.COMMANDS))}", "code": 404}
+            return
+        handler = getattr(self, self.COMMANDS[command][0])
+        session = self.session(session_id)
+        args = args or {}
+        try:
+            # only a wrong set of arguments is a usage error; a TypeError raised
+            # inside the handler is a bug and is reported as one (500)
+            inspect.signature(handler).bind(session, **args)
+        except TypeError as e:
+            yield {"event": "error", "message": f"Usage: {self.COMMANDS[command][1]} ({e})", "code": 400}
+            return
+        try:
+            with session.lock:
+                result = yield from handler(session, **args)
+            yield {"event": "result", "command": command, "data": result}
+        except CommandError as e:
+            yield {"event": "error", "message": str(e), "code": 400}
+        except Exception as e:
+            yield {"event": "error", "message": f"{type(e).__name__}: {e}", "code": 500}
+
+    def parse(self, line: str):
+        """Turn a chat-style line ("score Data Scientist") into (command, args)."""
+        line = (line or "").strip()
+        if not line:
+            return None, {}
+        command, _, rest = line.partition(" ")
+        command = self.ALIASES.get(command.lower(), command.lower())
+        rest = rest.strip()
+        if command == "load":
+            parts = shlex.split(rest, posix=os.name != "nt") if rest else []
+            return command, ({"path": " ".join(parts)} if parts else {})
+        if command in ("score", "optimize"):
+            return command, ({"role": rest} if rest else {})
+        if command == "coverage":
+            if not rest:
+                return command, {}
+            path = os.path.expanduser(rest.strip('"'))
+            return command, ({"path": path} if os.path.isfile(path) else {"jd": rest})
+        if command in ("jobs", "candidates"):
+            return command, ({"query": rest} if rest else {})
+        if command == "ingest":
+            return command, ({"directory": rest} if rest else {})
+        if command == "addjobs":
+            return command, ({"path": os.path.expanduser(rest.strip('"'))} if rest else {})
+        if command == "bestjobs":
+            return command, ({"top_k": int(rest)} if rest.isdigit() else {})
+        if command in ("summarize", "models"):
+            return command, {}
+        if command == "query":
+            return command, {"question": rest}
+        # anything else is a free-form question about the loaded resume
+        return "query", {"question": line}
+
+    def execute(self, line: str, session_id: str = None):
+        command, args = self.parse(line)
+        if command is None:
+            yield {"event": "error", "message": "Empty command.", "code": 400}
+            return
+        yield from self.handle(command, args, session_id=session_id)
+
+    # ---------- commands ----------
+    def load(self, session: Session, path: str = None, text: str = None, resume_id: str = None):
+        """Load a resume file from `path`, or already extracted `text` (then resume_id names it)."""
+        from agent.rag.pipeline import RAGPipeline
+
+        if text is None and not path:
+            raise CommandError("Usage: load <path>")
+        if text is None and not os.path.exists(path):
+            raise CommandError(f"File not found: {path}")
+        resume_id = resume_id or (resume_id_for(path) if path else session.id)
+        if os.path.basename(resume_id) != resume_id or resume_id in ("", ".", ".."):
+            raise CommandError(f"Invalid resume id: {resume_id}")
+        if self.isolate_tenants:
+            resume_id = f"{resume_id}-{self._content_id(path, text)}"
+
+        yield {"event": "log", "text": f"Loading {resume_id}"}
+        if text is None:
+            entry, hit = self.resumes.load(path, resume_id, extractor=self.extractor, db_root=self.db_root)
+        else:
+            entry, hit = self.resumes.load_text(resume_id, text, db_root=self.db_root)
+        if entry is None:
+            raise CommandError("Could not extract text — may be a scanned file.")
+
+        session.resume_path = os.path.abspath(path) if path else None
+        session.resume_text = entry.text
+        session.memory = entry.memory
+        session.rag = RAGPipeline(self.llm, entry.memory)
+        return {
+            "resume_id": resume_id,
+            "path": session.resume_path,
+            "chars": len(entry.text),
+            "chunks": len(entry.memory.text_chunks),
+            "cached": hit,
+            "preview": entry.text[:2000],
+        }
+
+    @staticmethod
+    def _content_id(path: str = None, text: str = None) -> str:
+        h = hashlib.sha1()
+        if text is not None:
+            h.update(text.encode("utf-8"))
+        else:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        return h.hexdigest()[:16]
+
+    def ingest(self, session: Session, directory: str, workers: int = None, recursive: bool = False,
+               restart: bool = False):
+        from agent.ingest import ingest_directory
+
+        if not os.path.isdir(directory):
+            raise CommandError(f"Not a directory: {directory}")
+        yield {"event": "log", "text": f"Ingesting resumes from {directory}"}
+        log = []
+        stats = ingest_directory(directory, workers=workers, recursive=recursive, restart=restart,
+                                 db_root=self.db_root, log=log.append)
+        for line in log:
+            yield {"event": "log", "text": line}
+        return stats
+
+    def score(self, session: Session, role: str):
+        from agent.tools.ats_score import keyword_report
+
+        session.require_resume()
+        yield {"event": "log", "text": f"Scoring resume against: {role}"}
+        analysis = self.ats.analyze(session.resume_text, role)
+        return {
+            "role": role,
+            "ai_score": analysis.get("score", 0),
+            "feedback": analysis.get("feedback") or analysis.get("message", ""),
+            "report": keyword_report(session.resume_text, role=role),
+        }
+
+    def coverage(self, session: Session, jd: str = None, path: str = None):
+        from agent.tools.jd_coverage import jd_coverage
+
+        session.require_resume()
+        if path:
+            if not os.path.isfile(path):
+                raise CommandError(f"File not found: {path}")
+            with open(path, "r", encoding="utf-8") as f:
+                jd = f.read()
+        if not jd or not jd.strip():
+            raise CommandError("Usage: coverage <job description file or text>")
+        yield {"event": "log", "text": "Checking job requirements against the resume"}
+        return jd_coverage(session.memory, jd, resume_text=session.resume_text)
+
+    def _answer(self, session: Session, question: str):
+        session.require_resume()
+        parts = []
+        for chunk in session.rag.stream_query(question):
+            parts.append(chunk)
+            yield {"event": "chunk", "text": chunk}
+        return {"text": "".join(parts).strip()}
+
+    def summarize(self, session: Session):
+        return (yield from self._answer(
+            session, "Summarize the loaded resume (key strengths, education, and roles)."))
+
+    def query(self, session: Session, question: str):
+        if not question.strip():
+            raise CommandError("Usage: query <question>")
+        return (yield from self._answer(session, question))
+
+    def optimize(self, session: Session, role: str, candidate_name: str = None):
+        session.require_resume()
+        if not candidate_name:
+            match = re.search(r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)", session.resume_text)
+            candidate_name = match.group(1).strip() if match else None
+        yield {"event": "log", "text": f"Optimizing resume for {role}"}
+        # one output folder per session so concurrent users never overwrite each other's files
+        if os.path.basename(session.id) != session.id or session.id in (".", ".."):
+            raise CommandError(f"Invalid session id for an output folder: {session.id}")
+        out_dir = os.path.join(os.getcwd(), "optimized_resume_latex", session.id)
+        latex = self.optimizer.generate_latex(role, session.resume_text, out_dir=out_dir)
+        return dict(latex, role=role, candidate_name=candidate_name)
+
+    def jobs(self, session: Session, query: str, location: str = None, max_results: int = 10):
+        from agent.job_store import get_job_store
+
+        yield {"event": "log", "text": f"Searching LinkedIn for: {query}"}
+        jobs = self.linkedin.search_jobs(query, location=location, max_results=max_results)
+        # scraped postings go to the job store so bestjobs can match against them later
+        stored = get_job_store(self.job_root).add_jobs(jobs, source=f"linkedin: {query}") if jobs else {}
+        return {"query": query, "jobs": jobs, "stored": stored}
+
+    def add_jobs(self, session: Session, path: str = None, jobs: list = None, recursive: bool = False):
+        from agent.job_store import get_job_store
+
+        store = get_job_store(self.job_root)
+        if jobs is not None:
+            if not isinstance(jobs, list):
+                raise CommandError("jobs must be a list of job objects")
+            stats = store.add_jobs(jobs, source="api")
+        elif path:
+            if not os.path.exists(path):
+                raise CommandError(f"File not found: {path}")
+            yield {"event": "log", "text": f"Adding job descriptions from {path}"}
+            stats = store.add_path(path, recursive=recursive)
+        else:
+            raise CommandError("Usage: addjobs <file or directory>")
+        return dict(stats, total=len(store))
+
+    def best_jobs(self, session: Session, top_k: int = 10):
+        from agent.job_store import get_job_store
+
+        session.require_resume()
+        store = get_job_store(self.job_root)
+        if not len(store):
+            raise CommandError("No job descriptions stored yet. Add some with: addjobs <file or directory>")
+        yield from ()
+        return {"total": len(store), "jobs": store.best_jobs(session.memory, session.resume_text, top_k=int(top_k))}
+
+    def candidates(self, session: Session, query: str, top_k: int = 10, with_text: bool = True):
+        """Best-matching resumes across the corpus; with_text=False leaves out the matched chunk."""
+        from agent.memory import ResumeMemory
+
+        if self.isolate_tenants:
+            raise CommandError("Candidate search spans every tenant's resumes and is off when tenants are isolated.")
+        memory = session.memory or ResumeMemory(db_path=os.path.join(self.db_root, "default"))
+        results = memory.search_corpus(query, top_k=top_k)
+        yield from ()
+        return {"query": query, "results": [
+            dict({"resume_id": resume_id, "score": float(score)}, **({"chunk": chunk} if with_text else {}))
+            for resume_id, chunk, score in results
+        ]}
+
+    def models(self, session: Session):
+        from agent.cache import cache_stats
+        from agent.models.registry import model_stats
+
+        yield from ()
+        llm = self.__dict__.get("llm")
+        return {
+            "embedding_models": model_stats(),
+            "llm": llm.latency_summary() if llm is not None else None,
+            "caches": cache_stats(),
+            "resume_cache": self.resumes.stats(),
+            "sessions": len(self.sessions),
+        }
@@ -0,0 +1,242 @@
+"""
+Local, rule-based ATS scoring (no LLM call).
+
+Every skill term and synonym of configs/ats_taxonomy.yaml is compiled
+into one Aho-Corasick automaton over word tokens, so a resume is scanned
+once no matter how many terms the taxonomy has, and a term only matches
+whole words ("ai" is not found in "maintained", "java" not in
+"javascript"). Role scoring is then a set lookup on the skills found.
+
+    engine = get_ats_engine()
+    report = engine.score(resume_text, role="Data Scientist")
+"""
+import os
+import re
+import threading
+from collections import deque
+import yaml
+
+TAXONOMY_PATH = os.path.join("configs", "ats_taxonomy.yaml")
+
+# words keep "+", "#" and inner dots so c++, c#, node.js and asp.net stay one token
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*|\.[a-z0-9]+")
+
+DEFAULT_LENGTH = {"min_words": 400, "max_words": 900, "short_score": 60, "long_score": 70}
+DEFAULT_WEIGHTS = {"keywords": 0.4, "structure": 0.3, "length": 0.3}
+HEADING_MAX_TOKENS = 6
+GENERIC_ROLE_WORDS = {"engineer", "developer", "senior", "junior", "sr", "jr", "lead", "principal", "staff",
+                      "intern", "associate", "specialist", "ii", "iii"}
+# used when the taxonomy file is missing: the original hard-coded keyword check
+FALLBACK_TAXONOMY = {
+    "roles": {"default": ["python", "machine learning", "ai", "flask", "tensorflow", "sql", "data analysis"]},
+    "sections": {s: [] for s in ("education", "projects", "experience", "skills", "certifications")},
+}
+
+
+def tokenize(text: str):
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton whose alphabet is word tokens instead of characters."""
+
+    def __init__(self):
+        self._goto = [{}]   # node -> {token: next node}
+        self._fail = [0]
+        self._out = [()]    # node -> labels of every phrase ending here (fail chain included)
+        self._vocab = set()
+        self.patterns = 0
+        self._built = False
+
+    def add(self, phrase: str, label):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        if label not in self._out[node]:
+            self._out[node] = self._out[node] + (label,)
+        self._vocab.update(tokens)
+        self.patterns += 1
+        self._built = False
+
+    def build(self):
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + tuple(
+                        label for label in self._out[self._fail[child]] if label not in self._out[child])
+                queue.append(child)
+        self._built = True
+        return self
+
+    def labels(self, tokens) -> set:
+        """Labels of every phrase occurring in the token sequence (one pass)."""
+        if not self._built:
+            self.build()
+        goto, fail, out, vocab = self._goto, self._fail, self._out, self._vocab
+        found = set()
+        node = 0
+        for token in tokens:
+            if token not in vocab:
+                node = 0
+                continue
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def __len__(self):
+        return self.patterns
+
+
+class ATSEngine:
+    def __init__(self, taxonomy: dict):
+        self.taxonomy = taxonomy
+        self.skills = {}            # canonical -> [synonyms]
+        self.roles = {}             # role -> [canonical skills]
+        self.sections = {}          # section -> [headings]
+        self.length = dict(DEFAULT_LENGTH, **(taxonomy.get("length") or {}))
+        self.weights = dict(DEFAULT_WEIGHTS, **(taxonomy.get("weights") or {}))
+
+        self.skill_matcher = KeywordMatcher()
+        for skill, synonyms in (taxonomy.get("skills") or {}).items():
+            skill = str(skill).lower()
+            self.skills[skill] = [str(s).lower() for s in (synonyms or [])]
+            for phrase in [skill] + self.skills[skill]:
+                self.skill_matcher.add(phrase, skill)
+
+        for role, skills in (taxonomy.get("roles") or {}).items():
+            self.roles[str(role).lower()] = [str(s).lower() for s in (skills or [])]
+            for skill in self.roles[str(role).lower()]:
+                if skill not in self.skills:
+                    # a role may list a term that has no synonyms entry
+                    self.skills[skill] = []
+                    self.skill_matcher.add(skill, skill)
+        self.skill_matcher.build()
+        self._role_tokens = {role: set(tokenize(role)) for role in self.roles}
+
+        self.section_matcher = KeywordMatcher()
+        for section, headings in (taxonomy.get("sections") or {}).items():
+            section = str(section).lower()
+            self.sections[section] = [str(h).lower() for h in (headings or [section])]
+            for heading in [section] + self.sections[section]:
+                self.section_matcher.add(heading, section)
+        self.section_matcher.build()
+
+    @classmethod
+    def from_file(cls, path: str = TAXONOMY_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    # ---------- matching ----------
+    def resolve_role(self, role: str = None) -> str:
+        """
+        Closest taxonomy role by shared words ("Senior Data Scientist" ->
+        "data scientist"); abbreviations known as skill synonyms count as
+        their skill ("ML Engineer" -> "machine learning engineer"). Titles
+        sharing only generic words like "engineer" fall back to "default".
+        """
+        if not role:
+            return "default"
+        wanted = role.strip().lower()
+        if wanted in self.roles:
+            return wanted
+        tokens = set(tokenize(wanted))
+        for skill in self.skill_matcher.labels(tokenize(wanted)):
+            tokens.update(tokenize(skill))
+        best, best_score = "default", 0.0
+        for name, name_tokens in self._role_tokens.items():
+            if not name_tokens:
+                continue
+            overlap = tokens & name_tokens
+            score = len(overlap) / len(name_tokens | tokens)
+            if overlap - GENERIC_ROLE_WORDS and score > best_score:
+                best, best_score = name, score
+        return best
+
+    def find_skills(self, text: str) -> set:
+        """Canonical names of every taxonomy skill mentioned in text."""
+        return self.skill_matcher.labels(tokenize(text))
+
+    def find_sections(self, text: str) -> set:
+        """Sections whose heading appears on a heading-like line (short, or before a colon)."""
+        found = set()
+        for line in text.lower().splitlines():
+            tokens = tokenize(line.split(":", 1)[0])
+            if 0 < len(tokens) <= HEADING_MAX_TOKENS:
+                found |= self.section_matcher.labels(tokens)
+        return found
+
+    def length_score(self, word_count: int) -> float:
+        if word_count < self.length["min_words"]:
+            return self.length["short_score"]
+        if word_count > self.length["max_words"]:
+            return self.length["long_score"]
+        return 100
+
+    def score(self, resume_text: str, role: str = None, skills_found: set = None) -> dict:
+        """
+        Keyword, structure and length scores (0-100) plus their weighted
+        overall score, with the matched and missing skills and sections.
+        skills_found: result of find_skills() if the caller already has it.
+        """
+        role_name = self.resolve_role(role)
+        wanted = self.roles.get(role_name) or []
+        found = skills_found if skills_found is not None else self.find_skills(resume_text)
+        matched = [s for s in wanted if s in found]
+        sections = self.find_sections(resume_text)
+        word_count = len(resume_text.split())
+
+        report = {
+            "role": role_name,
+            "keyword_score": len(matched) / len(wanted) * 100 if wanted else 0.0,
+            "structure_score": len(sections) / len(self.sections) * 100 if self.sections else 0.0,
+            "length_score": self.length_score(word_count),
+        }
+        report["overall_score"] = round(
+            report["keyword_score"] * self.weights["keywords"] +
+            report["structure_score"] * self.weights["structure"] +
+            report["length_score"] * self.weights["length"], 2
+        )
+        report.update({
+            "found_keywords": matched,
+            "missing_keywords": [s for s in wanted if s not in found],
+            "other_skills": sorted(found - set(wanted)),
+            "sections_found": [s for s in self.sections if s in sections],
+            "sections_missing": [s for s in self.sections if s not in sections],
+            "word_count": word_count,
+        })
+        return report
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_ats_engine(path: str = TAXONOMY_PATH) -> ATSEngine:
+    """Process-wide engine for the taxonomy file, compiled on first use."""
+    with _engines_lock:
+        if path not in _engines:
+            _engines[path] = ATSEngine.from_file(path) if os.path.exists(path) else ATSEngine(FALLBACK_TAXONOMY)
+        return _engines[path]
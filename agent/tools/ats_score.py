@@ -1,6 +1,17 @@
 from agent.prompts import ATS_SCORING_PROMPT
 # from google.generativeai.types import tool  
 
+
+def keyword_report(resume_text: str, role: str = None) -> dict:
+    """
+    Local ATS metrics (keywords, structure, length) for the target role,
+    from the compiled skill taxonomy in configs/ats_taxonomy.yaml.
+    """
+    from agent.tools.ats_engine import get_ats_engine
+
+    return get_ats_engine().score(resume_text, role=role)
+
+
 class ATSAnalyzer:
     def __init__(self, llm):
         self.llm = llm
@@ -13,36 +24,65 @@ class ATSAnalyzer:
         """
         try:
             # Build the structured prompt
-            prompt = ATS_SCORING_PROMPT.format(
-                resume=resume_text,
-                job=role_description
-            )
+            prompt = self.build_prompt(resume_text, role_description)
 
             # Generate response via Gemini LLM
             response = self.llm.generate(prompt)
 
-            # Safety check
-            if not response or not response.strip():
-                return {
-                    "score": 0,
-                    "message": "AI analysis not available. Please check API key or network."
-                }
-
-            # Extract ATS score (percentage if mentioned)
-            score = 0
-            for token in response.split():
-                if token.strip('%').isdigit():
-                    score = int(token.strip('%'))
-                    break
+            return self.parse_response(response)
 
+        except Exception as e:
             return {
-                "score": score,
-                "feedback": response.strip()
+                "score": 0,
+                "feedback": f"Error in AI analysis: {e}"
             }
 
-        except Exception as e:
+    def analyze_batch(self, pairs, client=None):
+        """
+        Analyze many (resume_text, role_description) pairs concurrently
+        through an AsyncLLMClient (built from config if not given).
+        Returns one result dict per pair, in order, shaped like analyze().
+        """
+        from agent.models.async_llm import AsyncLLMClient
+
+        client = client or AsyncLLMClient.from_config(self.llm)
+        prompts = [self.build_prompt(resume, role) for resume, role in pairs]
+        return [self._result(r) for r in client.run_batch(prompts)]
+
+    async def analyze_batch_async(self, pairs, client):
+        """analyze_batch for callers already running an event loop."""
+        prompts = [self.build_prompt(resume, role) for resume, role in pairs]
+        return [self._result(r) for r in await client.generate_many(prompts)]
+
+    def _result(self, response):
+        if isinstance(response, Exception):
+            return {"score": 0, "feedback": f"Error in AI analysis: {response}"}
+        return self.parse_response(response)
+
+    @staticmethod
+    def build_prompt(resume_text: str, role_description: str) -> str:
+        return ATS_SCORING_PROMPT.format(
+            resume=resume_text,
+            job=role_description
+        )
+
+    @staticmethod
+    def parse_response(response: str) -> dict:
+        # Safety check
+        if not response or not response.strip():
             return {
                 "score": 0,
-                "feedback": f"Error in AI analysis: {e}"
+                "message": "AI analysis not available. Please check API key or network."
             }
 
+        # Extract ATS score (percentage if mentioned)
+        score = 0
+        for token in response.split():
+            if token.strip('%').isdigit():
+                score = int(token.strip('%'))
+                break
+
+        return {
+            "score": score,
+            "feedback": response.strip()
+        }
@@ -0,0 +1,274 @@
+"""
+Batch ATS scoring: every resume in a directory against every job description.
+
+    python main.py batch-score resumes/ jobs.txt --out scores.csv --json scores.json --llm-rescore 3
+
+The N x M score matrix is computed locally:
+
+    semantic  = 0.7 * best chunk similarity + 0.3 * mean chunk similarity
+                (MiniLM cosine between each resume chunk and the job text)
+    coverage  = share of the skills the job mentions that the resume also
+                mentions (ATS taxonomy, see agent/tools/ats_engine.py)
+    score     = 100 * (semantic_weight * semantic + (1 - semantic_weight) * coverage)
+
+Resumes are processed in blocks of block_size: one block's chunk
+embeddings and chunk x job similarity matrix are the only large arrays
+alive at a time. Optionally the top-k resumes of every job are re-scored
+by the LLM (ATSAnalyzer through AsyncLLMClient), and only those pairs.
+
+Job files: .json (a list) or .jsonl with {"id", "title", "text"} objects
+(or "description" instead of "text"), or plain text with jobs separated
+by lines containing only "---" (the first line of each is its title).
+"""
+import os
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from agent.cache import cached_encode
+from agent.ingest import find_resumes
+from agent.memory import MODEL_NAME
+from agent.models.registry import get_embedding_model
+from agent.rag.chunker import chunk_resume
+from agent.rag.vector_index import normalize_rows
+from agent.tools.ats_engine import get_ats_engine
+from agent.tools.file_parser import extract_worker
+from agent.utils import resume_id_for
+
+BEST_CHUNK_WEIGHT = 0.7
+
+
+def load_jobs(path: str, id_prefix: str = "job") -> list:
+    """
+    [{"id", "title", "text"}] from a .json / .jsonl / plain-text job file.
+    Jobs without an "id" get id_prefix + their position (1-based).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        items = json.loads(raw)
+    elif ext == ".jsonl":
+        items = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    else:
+        items = []
+        for block in raw.replace("\r\n", "\n").split("\n---"):
+            block = block.strip("-\n ")
+            if block:
+                title = block.splitlines()[0].strip()
+                items.append({"title": title, "text": block})
+
+    jobs = []
+    for i, item in enumerate(items, 1):
+        if isinstance(item, str):
+            item = {"text": item}
+        text = item.get("text") or item.get("description") or ""
+        title = item.get("title") or (text.strip().splitlines() or [f"job {i}"])[0][:80]
+        jobs.append({"id": str(item.get("id") or f"{id_prefix}{i}"), "title": title, "text": text})
+    return [j for j in jobs if j["text"].strip()]
+
+
+class BatchScorer:
+    def __init__(self, semantic_weight: float = 0.6, block_size: int = 256, workers: int = None,
+                 chunk_tokens: int = 200, encode_batch_size: int = 64, log=print):
+        """
+        semantic_weight: share of the score from embedding similarity (the
+        rest is keyword coverage).
+        block_size: resumes embedded and scored at a time (bounds memory).
+        workers: extraction processes (default: CPU count).
+        """
+        self.semantic_weight = semantic_weight
+        self.block_size = max(1, block_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_tokens = chunk_tokens
+        self.encode_batch_size = encode_batch_size
+        self.log = log
+        self.engine = get_ats_engine()
+        self.model = get_embedding_model(MODEL_NAME)
+
+    # ---------- inputs ----------
+    def extract(self, paths: list) -> dict:
+        """{path: text} for every resume with extractable text."""
+        texts = {}
+        with ProcessPoolExecutor(max_workers=min(self.workers, max(1, len(paths)))) as pool:
+            for path, text, _, error in pool.map(extract_worker, paths, chunksize=4):
+                if error:
+                    self.log(f"⚠️ {os.path.basename(path)}: {error}")
+                elif text.strip():
+                    texts[path] = text
+                else:
+                    self.log(f"⚠️ {os.path.basename(path)}: no text extracted")
+        return texts
+
+    def _encode(self, texts: list) -> np.ndarray:
+        return normalize_rows(cached_encode(self.model, texts, MODEL_NAME, batch_size=self.encode_batch_size))
+
+    def _chunks(self, texts: list):
+        """All chunks of texts, flattened, and the index where each text's chunks start."""
+        chunks, offsets = [], []
+        for text in texts:
+            offsets.append(len(chunks))
+            chunks.extend([c["text"] for c in chunk_resume(text, target_tokens=self.chunk_tokens)] or [text])
+        return chunks, np.asarray(offsets, dtype=np.intp)
+
+    def _skill_matrix(self, skill_sets: list, vocab: dict) -> np.ndarray:
+        matrix = np.zeros((len(skill_sets), len(vocab)), dtype=np.float32)
+        for row, skills in enumerate(skill_sets):
+            cols = [vocab[s] for s in skills if s in vocab]
+            matrix[row, cols] = 1.0
+        return matrix
+
+    # ---------- scoring ----------
+    def score(self, resumes: dict, jobs: list) -> dict:
+        """
+        resumes: {resume id: text}; jobs: load_jobs() output.
+        Returns {"resume_ids", "jobs", "score", "semantic", "coverage",
+        "job_skills", "resume_skills"}, the three matrices shaped (N, M).
+        """
+        ids = list(resumes)
+        n, m = len(ids), len(jobs)
+        semantic = np.zeros((n, m), dtype=np.float32)
+        coverage = np.zeros((n, m), dtype=np.float32)
+
+        # jobs: one normalized mean-of-chunks vector each, and the skills they ask for
+        job_chunks, job_offsets = self._chunks([job["text"] for job in jobs])
+        job_vectors = normalize_rows(np.add.reduceat(self._encode(job_chunks), job_offsets, axis=0))
+        job_skills = [self.engine.find_skills(job["text"]) for job in jobs]
+        vocab = {s: i for i, s in enumerate(sorted(set().union(*job_skills)))}
+        job_skill_matrix = self._skill_matrix(job_skills, vocab)          # (M, K)
+        wanted = job_skill_matrix.sum(axis=1)                             # (M,)
+
+        resume_skills = {}
+        for start in range(0, n, self.block_size):
+            block = ids[start:start + self.block_size]
+            chunk_texts, offsets = self._chunks([resumes[rid] for rid in block])
+
+            # (chunks, M) similarities reduced to per-resume best / mean with reduceat
+            sims = self._encode(chunk_texts) @ job_vectors.T
+            counts = np.diff(np.append(offsets, len(chunk_texts))).astype(np.float32)
+            best = np.maximum.reduceat(sims, offsets, axis=0)
+            mean = np.add.reduceat(sims, offsets, axis=0) / counts[:, None]
+            semantic[start:start + len(block)] = np.clip(
+                BEST_CHUNK_WEIGHT * best + (1 - BEST_CHUNK_WEIGHT) * mean, 0.0, 1.0)
+
+            skill_sets = [self.engine.find_skills(resumes[rid]) for rid in block]
+            for rid, skills in zip(block, skill_sets):
+                resume_skills[rid] = skills
+            hits = self._skill_matrix(skill_sets, vocab) @ job_skill_matrix.T   # (block, M)
+            # a job naming no taxonomy skills is scored on similarity alone
+            coverage[start:start + len(block)] = np.divide(hits, wanted, out=semantic[start:start + len(block)].copy(),
+                                                           where=wanted > 0)
+            self.log(f"✔ {min(start + self.block_size, n)}/{n} resume(s) scored")
+
+        score = 100.0 * (self.semantic_weight * semantic + (1 - self.semantic_weight) * coverage)
+        return {"resume_ids": ids, "jobs": jobs, "score": score, "semantic": semantic, "coverage": coverage,
+                "job_skills": job_skills, "resume_skills": resume_skills}
+
+    def rescore_top_k(self, result: dict, resumes: dict, k: int, llm=None, client=None) -> dict:
+        """LLM ATS score of the top-k resumes per job; returns {(row, col): score}."""
+        from agent.tools.ats_score import ATSAnalyzer
+        from agent.models.base_llm import create_llm
+
+        analyzer = ATSAnalyzer(llm or create_llm())
+        pairs, keys = [], []
+        for col, job in enumerate(result["jobs"]):
+            for row in top_k_rows(result["score"][:, col], k):
+                pairs.append((resumes[result["resume_ids"][row]], job["text"]))
+                keys.append((int(row), col))
+        self.log(f"🤖 LLM re-scoring {len(pairs)} top pair(s)...")
+        return {key: analysis.get("score", 0) for key, analysis in zip(keys, analyzer.analyze_batch(pairs, client))}
+
+
+def top_k_rows(column: np.ndarray, k: int) -> np.ndarray:
+    """Row indices of the k largest values, best first."""
+    k = min(k, len(column))
+    if k <= 0:
+        return np.array([], dtype=int)
+    top = np.argpartition(-column, k - 1)[:k]
+    return top[np.argsort(-column[top], kind="stable")]
+
+
+# ---------- output ----------
+def result_rows(result: dict, paths: dict = None, llm_scores: dict = None):
+    """Long-format rows (one per resume x job pair), sorted by job then rank."""
+    paths, llm_scores = paths or {}, llm_scores or {}
+    ids, jobs = result["resume_ids"], result["jobs"]
+    for col, job in enumerate(jobs):
+        order = top_k_rows(result["score"][:, col], len(ids))
+        for rank, row in enumerate(order, 1):
+            rid = ids[row]
+            missing = sorted(result["job_skills"][col] - result["resume_skills"].get(rid, set()))
+            yield {
+                "job_id": job["id"],
+                "job_title": job["title"],
+                "rank": rank,
+                "resume_id": rid,
+                "resume_path": paths.get(rid, ""),
+                "score": round(float(result["score"][row, col]), 2),
+                "semantic": round(float(result["semantic"][row, col]), 4),
+                "keyword_coverage": round(float(result["coverage"][row, col]), 4),
+                "llm_score": llm_scores.get((int(row), col), ""),
+                "missing_skills": "; ".join(missing),
+            }
+
+
+def write_csv(rows, path: str):
+    rows = list(rows)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["job_id"])
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def write_json(result: dict, rows, path: str, top_k: int = 10):
+    rows = list(rows)
+    payload = {
+        "resumes": result["resume_ids"],
+        "jobs": [{"id": j["id"], "title": j["title"], "skills": sorted(s)}
+                 for j, s in zip(result["jobs"], result["job_skills"])],
+        "score": np.round(result["score"], 2).tolist(),
+        "semantic": np.round(result["semantic"], 4).tolist(),
+        "coverage": np.round(result["coverage"], 4).tolist(),
+        "top": [r for r in rows if r["rank"] <= top_k],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def run_batch_score(resume_dir: str, jobs_path: str, out_csv: str = None, out_json: str = None,
+                    top_k: int = 10, llm_rescore: int = 0, recursive: bool = False, log=print, **scorer_kwargs):
+    """Extract, score, optionally LLM re-score, and write the results; returns the result dict."""
+    start = time.perf_counter()
+    jobs = load_jobs(jobs_path)
+    if not jobs:
+        raise ValueError(f"No job descriptions found in {jobs_path}")
+    paths = find_resumes(resume_dir, recursive=recursive)
+    if not paths:
+        raise ValueError(f"No resumes found in {resume_dir}")
+
+    scorer = BatchScorer(log=log, **scorer_kwargs)
+    log(f"📂 Extracting {len(paths)} resume(s)...")
+    texts = scorer.extract(paths)
+    resumes, id_paths = {}, {}
+    for path, text in texts.items():
+        rid = resume_id_for(path, resume_dir)
+        resumes[rid], id_paths[rid] = text, path
+
+    log(f"📊 Scoring {len(resumes)} resume(s) x {len(jobs)} job(s)...")
+    result = scorer.score(resumes, jobs)
+    llm_scores = scorer.rescore_top_k(result, resumes, llm_rescore) if llm_rescore else {}
+    result["llm_scores"] = llm_scores
+
+    rows = list(result_rows(result, id_paths, llm_scores))
+    if out_csv:
+        write_csv(rows, out_csv)
+        log(f"✅ {len(rows)} row(s) written to {out_csv}")
+    if out_json:
+        write_json(result, rows, out_json, top_k=top_k)
+        log(f"✅ Matrix and top {top_k} per job written to {out_json}")
+    result["seconds"] = time.perf_counter() - start
+    return result
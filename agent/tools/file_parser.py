@@ -1,21 +1,78 @@
 import os
+import io
+import time
+import contextlib
+import threading
+import multiprocessing
 # from google.generativeai.types import tool 
 
+# below this many pages a PDF is extracted in-process (pool startup would dominate)
+PARALLEL_MIN_PAGES = 4
+
+_pdf_pool = None
+_pdf_pool_workers = 0
+_pdf_pool_lock = threading.Lock()
+_pdf_config = None
+
+# bump when a change here alters the extracted text, so cached results are not reused
+EXTRACTOR_VERSION = 1
+CACHED_EXTENSIONS = (".pdf", ".docx", ".doc")
+
+
+def extractor_version(ext: str) -> str:
+    """This module's version plus the version of the library that reads `ext` files."""
+    from importlib import metadata
+
+    package = "pdfplumber" if ext == ".pdf" else "python-docx"
+    try:
+        return f"{EXTRACTOR_VERSION}/{package}-{metadata.version(package)}"
+    except metadata.PackageNotFoundError:
+        return f"{EXTRACTOR_VERSION}/{package}-missing"
+
+
+def _extraction_cache():
+    from agent.cache import get_extraction_cache
+    return get_extraction_cache()
+
+
+def cached_text(path: str):
+    """Text of a PDF / DOCX extracted earlier and still valid, or None (never extracts)."""
+    ext = os.path.splitext(path.lower())[1]
+    cache = _extraction_cache() if ext in CACHED_EXTENSIONS else None
+    if cache is None:
+        return None
+    try:
+        return cache.get(path, extractor_version(ext))
+    except OSError:
+        return None
+
+
 # @tool
-def extract_text(path: str) -> str:
+def extract_text(path: str, use_cache: bool = True, raise_errors: bool = False) -> str:
     """
     Extract text content from a file (.pdf, .docx, or .txt).
     Used by the Agentic Resume Optimizer and ATS Analyzer.
+    PDF / DOCX results are kept in the extraction cache (data/cache), keyed
+    by file content and extractor version; an unchanged file is not parsed again.
+    raise_errors: raise when a file cannot be read (missing parser, corrupt
+    or unreadable file) instead of returning "", so callers such as bulk
+    ingest can tell a failure from a file without text.
     """
     print(f"📂 Processing file: {path}")
     _, ext = os.path.splitext(path.lower())
 
+    if use_cache and ext in CACHED_EXTENSIONS:
+        text = cached_text(path)
+        if text is not None:
+            print(f"⚡ Same content as a file read before — reusing its extracted text ({len(text)} chars).")
+            return text
+
     if ext == ".pdf":
         print("🧾 Detected PDF file — extracting text...")
-        return _extract_pdf(path)
+        text = _extract_pdf(path, raise_errors)
     elif ext in [".docx", ".doc"]:
         print("📘 Detected Word document — extracting text...")
-        return _extract_docx(path)
+        text = _extract_docx(path, raise_errors)
     else:
         print("📄 Reading plain text file...")
         try:
@@ -25,37 +82,161 @@ def extract_text(path: str) -> str:
                 return text
         except Exception as e:
             print(f"⚠️ Text extraction failed: {e}")
+            if raise_errors:
+                raise
             return ""
 
+    cache = _extraction_cache() if use_cache and text.strip() else None
+    if cache is not None:
+        try:
+            cache.put(path, extractor_version(ext), text)
+        except OSError:
+            pass
+    return text
+
+
+def extract_worker(path: str):
+    """
+    extract_text for process pools (bulk ingest, batch scoring): progress
+    prints are swallowed and a file that cannot be read comes back with an
+    error instead of as empty text.
+    Returns (path, text, seconds, error or None).
+    """
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            text = extract_text(path, raise_errors=True)
+        error = None
+    except Exception as e:
+        text, error = "", str(e)
+    return path, text, time.perf_counter() - start, error
+
+
+def _pdf_settings() -> dict:
+    """The `extraction` block of configs/config.yaml, read once per process."""
+    global _pdf_config
+    if _pdf_config is None:
+        from agent.utils import load_config
+
+        cfg = (load_config() or {}).get("extraction") or {}
+        _pdf_config = {
+            "workers": cfg.get("pdf_workers") or min(4, os.cpu_count() or 1),
+            "min_pages": cfg.get("parallel_min_pages", PARALLEL_MIN_PAGES),
+        }
+    return _pdf_config
+
+
+def _get_pdf_pool(workers: int):
+    """Process pool shared by every PDF extraction in this process (started once)."""
+    global _pdf_pool, _pdf_pool_workers
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_workers != workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=False)
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers)
+            _pdf_pool_workers = workers
+        return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown()
+            _pdf_pool = None
+
+
+def _extract_pages(pdf, start: int, end: int):
+    """Pages [start, end) of an open pdfplumber document as (texts, seconds per page)."""
+    texts, seconds = [], []
+    for page in pdf.pages[start:end]:
+        t0 = time.perf_counter()
+        texts.append(page.extract_text() or "")
+        seconds.append(time.perf_counter() - t0)
+        page.close()  # drop the page's cached layout objects
+    return texts, seconds
+
+
+def _extract_page_range(path: str, start: int, end: int):
+    """Pages [start, end) of the PDF at path; runs in a pool process."""
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return _extract_pages(pdf, start, end)
+
+
+def extract_pdf_pages(path: str, workers: int = None, min_pages: int = None) -> dict:
+    """
+    Text of every page of a PDF, in page order.
+
+    Documents with at least min_pages pages are split into one contiguous
+    page range per worker and extracted in a process pool (each worker opens
+    the file itself); smaller ones, and calls made from inside a pool worker
+    (ingest, the HTTP server), are extracted serially from the document
+    already opened to count the pages, because pool startup and the
+    per-worker re-parse would cost more than they save.
+    Defaults come from the `extraction` block of configs/config.yaml.
+
+    Returns {"pages": [text, ...], "page_seconds": [...], "mode": "serial" |
+    "parallel", "workers": n, "seconds": wall time}.
+    """
+    import pdfplumber
+
+    settings = _pdf_settings()
+    workers = workers or settings["workers"]
+    min_pages = settings["min_pages"] if min_pages is None else min_pages
+    start = time.perf_counter()
+    with pdfplumber.open(path) as pdf:
+        n_pages = len(pdf.pages)
+        parallel = workers > 1 and n_pages >= max(min_pages, 2) and multiprocessing.parent_process() is None
+        if not parallel:
+            pages, page_seconds = _extract_pages(pdf, 0, n_pages)
+            workers = 1
+
+    if parallel:
+        workers = min(workers, n_pages)
+        bounds = [n_pages * i // workers for i in range(workers + 1)]
+        pool = _get_pdf_pool(workers)
+        futures = [pool.submit(_extract_page_range, path, lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+        pages, page_seconds = [], []
+        for future in futures:  # submission order == page order
+            texts, seconds = future.result()
+            pages.extend(texts)
+            page_seconds.extend(seconds)
+    return {"pages": pages, "page_seconds": page_seconds, "mode": "parallel" if parallel else "serial",
+            "workers": workers, "seconds": time.perf_counter() - start}
+
 
-def _extract_pdf(path: str) -> str:
+def _extract_pdf(path: str, raise_errors: bool = False) -> str:
     """
-    Extract text from a PDF file using pdfplumber.
+    Extract text from a PDF file using pdfplumber (see extract_pdf_pages).
     """
     try:
-        import pdfplumber
+        import pdfplumber  # noqa: F401
     except ImportError:
         print("⚠️ Missing dependency: install with `pip install pdfplumber`.")
+        if raise_errors:
+            raise
         return ""
 
-    text_parts = []
     try:
-        with pdfplumber.open(path) as pdf:
-            print(f"🔍 Reading {len(pdf.pages)} pages...")
-            for i, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-                print(f"  • Page {i} processed.")
-        combined = "\n".join(text_parts)
-        print(f"✅ PDF extraction complete ({len(combined)} chars).")
+        result = extract_pdf_pages(path)
+        print(f"🔍 Read {len(result['pages'])} pages ({result['mode']}, {result['workers']} worker(s))...")
+        for i, seconds in enumerate(result["page_seconds"], start=1):
+            print(f"  • Page {i} processed ({seconds * 1000:.0f} ms).")
+        combined = "\n".join(text for text in result["pages"] if text)
+        print(f"✅ PDF extraction complete ({len(combined)} chars in {result['seconds']:.2f}s).")
         return combined
     except Exception as e:
         print(f"❌ PDF extraction failed: {e}")
+        if raise_errors:
+            raise
         return ""
 
 
-def _extract_docx(path: str) -> str:
+def _extract_docx(path: str, raise_errors: bool = False) -> str:
     """
     Extract text from a DOCX file using python-docx.
     """
@@ -63,6 +244,8 @@ def _extract_docx(path: str) -> str:
         from docx import Document
     except ImportError:
         print("⚠️ Missing dependency: install with `pip install python-docx`.")
+        if raise_errors:
+            raise
         return ""
 
     try:
@@ -73,5 +256,7 @@ def _extract_docx(path: str) -> str:
         return text
     except Exception as e:
         print(f"❌ DOCX extraction failed: {e}")
+        if raise_errors:
+            raise
         return ""
 
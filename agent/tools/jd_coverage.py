@@ -0,0 +1,150 @@
+"""
+Requirement-level coverage of a job description (no LLM call).
+
+The job description is split into requirement lines (bullets, sentences
+of long paragraphs); all of them are embedded in one batch and scored
+against every chunk of the loaded resume with one matrix product
+(ResumeMemory.search_batch). Each requirement gets its best-matching
+resume chunk as evidence, a credit from 0 to 1 and a status:
+
+    credit = semantic credit            (similarity scaled between
+                                         min_similarity and full_similarity)
+           = 0.5 * semantic + 0.5 * skills
+                                        when the line names taxonomy skills
+                                        (share of them the resume mentions)
+    status = met (credit >= met) | partial (>= partial) | missing
+
+coverage is the credit average over all requirements, in percent, with
+"nice to have" requirements weighted by optional_weight. Thresholds come
+from the `coverage` block of configs/config.yaml.
+"""
+import re
+import time
+from agent.tools.ats_engine import get_ats_engine, tokenize
+from agent.utils import load_config
+
+DEFAULTS = {"min_similarity": 0.25, "full_similarity": 0.6, "met": 0.7, "partial": 0.4, "optional_weight": 0.5}
+
+BULLET_RE = re.compile(r"^\s*(?:[-*•·▪◦●–—>]+|\(?\d{1,2}[.)])\s*")
+SENTENCE_RE = re.compile(r"(?<=[.;!?])\s+(?=[A-Z(])")
+OPTIONAL_RE = re.compile(r"\b(nice to have|nice-to-have|preferred|bonus|a plus|desirable|good to have)\b", re.I)
+# sections whose lines are not requirements
+SKIP_SECTION_RE = re.compile(r"\b(about|benefits|perks|we offer|compensation|salary|equal opportunity|how to apply)\b",
+                             re.I)
+MIN_WORDS = 4
+LONG_LINE_WORDS = 40
+HEADING_MAX_WORDS = 6
+
+
+def _is_heading(line: str, engine) -> bool:
+    """"Requirements:", "About us", "NICE TO HAVE": short, no sentence punctuation, no skill named."""
+    words = line.rstrip(":").split()
+    if line.endswith(":"):
+        return len(words) <= HEADING_MAX_WORDS
+    return (0 < len(words) <= 4 and line[:1].isupper() and not re.search(r"[.,;]", line)
+            and not engine.find_skills(line))
+
+
+def split_requirements(jd_text: str, engine=None) -> list:
+    """
+    Requirement lines of a job description: [{"text", "optional"}].
+    Bullets and numbering are stripped, long paragraphs are split into
+    sentences, headings become context ("Nice to have:" marks everything
+    under it optional) and lines under "About us" / "Benefits" style
+    headings are dropped. Short lines are kept only if they name a skill.
+    """
+    engine = engine or get_ats_engine()
+    requirements, seen = [], set()
+    optional_section, skip_section = False, False
+    for raw in (jd_text or "").replace("\r\n", "\n").split("\n"):
+        line = BULLET_RE.sub("", raw).strip()
+        if not line:
+            continue
+        if _is_heading(line, engine) and not BULLET_RE.match(raw):
+            optional_section = bool(OPTIONAL_RE.search(line))
+            skip_section = bool(SKIP_SECTION_RE.search(line))
+            continue
+        if skip_section:
+            continue
+        sentences = SENTENCE_RE.split(line) if len(line.split()) > LONG_LINE_WORDS else [line]
+        for sentence in sentences:
+            sentence = sentence.strip(" ;")
+            key = " ".join(tokenize(sentence))
+            if not key or key in seen:
+                continue
+            if len(sentence.split()) < MIN_WORDS and not engine.find_skills(sentence):
+                continue
+            seen.add(key)
+            requirements.append({"text": sentence,
+                                 "optional": optional_section or bool(OPTIONAL_RE.search(sentence))})
+    return requirements
+
+
+class JDCoverage:
+    def __init__(self, memory, config: dict = None, engine=None):
+        """
+        memory: ResumeMemory holding the resume's chunks and vectors.
+        config: overrides for the thresholds (default: `coverage` block of
+        configs/config.yaml).
+        """
+        self.memory = memory
+        self.engine = engine or get_ats_engine()
+        cfg = config if config is not None else ((load_config() or {}).get("coverage") or {})
+        self.cfg = dict(DEFAULTS, **cfg)
+        if not self.cfg["full_similarity"] > self.cfg["min_similarity"]:
+            raise ValueError(f"coverage: full_similarity ({self.cfg['full_similarity']}) must be greater "
+                             f"than min_similarity ({self.cfg['min_similarity']})")
+
+    def _semantic_credit(self, similarity: float) -> float:
+        low, high = self.cfg["min_similarity"], self.cfg["full_similarity"]
+        return min(1.0, max(0.0, (similarity - low) / (high - low)))
+
+    def _status(self, credit: float) -> str:
+        if credit >= self.cfg["met"]:
+            return "met"
+        return "partial" if credit >= self.cfg["partial"] else "missing"
+
+    def analyze(self, jd_text: str, resume_text: str = None) -> dict:
+        """
+        Per-requirement evidence and the aggregate coverage score.
+        resume_text: used for skill matching (default: the stored chunks).
+        """
+        start = time.perf_counter()
+        requirements = split_requirements(jd_text, self.engine)
+        hits = self.memory.search_batch([r["text"] for r in requirements], top_k=1)
+        resume_skills = self.engine.find_skills(resume_text or "\n".join(self.memory.text_chunks))
+
+        total = weight_sum = 0.0
+        counts = {"met": 0, "partial": 0, "missing": 0}
+        for req, best in zip(requirements, hits):
+            evidence = best[0] if best else None
+            similarity = evidence["score"] if evidence else 0.0
+            credit = self._semantic_credit(similarity)
+            skills = sorted(self.engine.find_skills(req["text"]))
+            matched = [s for s in skills if s in resume_skills]
+            if skills:
+                credit = 0.5 * credit + 0.5 * len(matched) / len(skills)
+            req.update({
+                "status": self._status(credit),
+                "credit": round(credit, 3),
+                "similarity": round(similarity, 4),
+                "skills": skills,
+                "missing_skills": [s for s in skills if s not in resume_skills],
+                "evidence": evidence["text"] if evidence else None,
+                "evidence_section": evidence["section"] if evidence else None,
+            })
+            counts[req["status"]] += 1
+            weight = self.cfg["optional_weight"] if req["optional"] else 1.0
+            total += weight * credit
+            weight_sum += weight
+
+        return {
+            "coverage": round(100.0 * total / weight_sum, 2) if weight_sum else 0.0,
+            "requirements": requirements,
+            **counts,
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+
+
+def jd_coverage(memory, jd_text: str, resume_text: str = None) -> dict:
+    return JDCoverage(memory).analyze(jd_text, resume_text=resume_text)
@@ -1,7 +1,3 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
 # from google.generativeai.types import tool  
 import time
 import re
@@ -20,6 +16,10 @@ class LinkedInSearch:
 
     def _setup_driver(self):
         """Setup Chrome WebDriver with or without GUI."""
+        # selenium is only imported once a search actually runs
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         options = Options()
         if self.headless:
             # Use new headless flag for modern Chrome
@@ -72,6 +72,9 @@ class LinkedInSearch:
         Returns:
             list of dicts: {"title","company","location","link"}
         """
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import WebDriverException
+
         # Setup driver
         try:
             self._setup_driver()
@@ -1,7 +1,6 @@
 import os
-import docx
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import shutil
+import subprocess
 # from google.generativeai.types import tool
 class ResumeOptimizer:
     def __init__(self, llm):
@@ -15,16 +14,41 @@ class ResumeOptimizer:
         if not resume_text:
             return "⚠️ No resume text found. Please load a resume first."
 
-        safe_role = "_".join(target_role.split())
-        safe_name = "".join(c for c in candidate_name if c.isalnum())
+        prompt = self.build_prompt(target_role, resume_text)
 
-        desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-        os.makedirs(desktop, exist_ok=True)
-        filename = f"optimized_resume_{safe_role}_{safe_name}.docx"
-        out_path = os.path.join(desktop, filename)
+        try:
+            optimized_text = self.llm.generate(prompt)
+        except Exception as e:
+            return f"⚠️ LLM generation failed: {e}"
 
+        return self.save(optimized_text, target_role, candidate_name)
+
+    def generate_batch(self, jobs, client=None):
+        """
+        Optimize several resumes / roles concurrently through an
+        AsyncLLMClient (built from config if not given).
+        jobs: iterable of (target_role, candidate_name, resume_text).
+        Returns one saved path or error message per job, in order.
+        """
+        from agent.models.async_llm import AsyncLLMClient
+
+        jobs = list(jobs)
+        client = client or AsyncLLMClient.from_config(self.llm)
+        todo = [i for i, (_, _, resume_text) in enumerate(jobs) if resume_text]
+        results = ["⚠️ No resume text found. Please load a resume first."] * len(jobs)
+        responses = client.run_batch([self.build_prompt(jobs[i][0], jobs[i][2]) for i in todo])
+        for i, response in zip(todo, responses):
+            role, name, _ = jobs[i]
+            if isinstance(response, Exception):
+                results[i] = f"⚠️ LLM generation failed: {response}"
+            else:
+                results[i] = self.save(response, role, name)
+        return results
+
+    @staticmethod
+    def build_prompt(target_role: str, resume_text: str) -> str:
         # ✅ Prompt to LLM
-        prompt = f"""
+        return f"""
         You are Resumini, an expert AI resume optimization agent trained in HR standards, job market keywords, and ATS scoring systems.
         Your goal is to rewrite the given resume to maximize ATS compatibility and recruiter appeal for the role of **{target_role}**.
 
@@ -47,10 +71,118 @@ class ResumeOptimizer:
         ATS-Optimized Resume for {target_role}:
         """
 
+    # ---------- LaTeX export ----------
+    @staticmethod
+    def build_latex_prompt(target_role: str, resume_text: str) -> str:
+        return f"""
+                    You are an AI Resume Optimization Agent.
+                    Convert the resume below into clean, modern LaTeX format (single-page layout, 11pt font).
+                    add divider line for each section
+                    Use \\documentclass[11pt]{{article}}, \\usepackage[utf8]{{inputenc}}, \\usepackage[T1]{{fontenc}},
+                    \\usepackage{{geometry}}, \\usepackage{{enumitem}}, \\usepackage{{hyperref}}, and \\pagestyle{{empty}}.
+                    The layout must look like a professional single-page resume (no extra page).
+                    Compress vertical spaces using \\setlength commands.
+                    Do NOT include emojis or markdown.
+                    Tailor the text to the target role: {target_role}.
+                    Output *only* valid LaTeX code ready to compile.
+
+                    Resume:
+                    --------------------
+                    {resume_text}
+                    --------------------
+                    """
+
+    @staticmethod
+    def ensure_latex_document(latex: str) -> str:
+        """Clean the LLM output and force a compact utf8 preamble if it has none."""
+        latex = str(latex or "").strip()
+        latex = latex.encode("utf-8", "ignore").decode("utf-8")
+        if "\\documentclass" in latex:
+            return latex
+        return f"""
+            \\documentclass[11pt]{{article}}
+            \\usepackage[utf8]{{inputenc}}
+            \\usepackage[T1]{{fontenc}}
+            \\usepackage{{geometry}}
+            \\usepackage{{enumitem}}
+            \\usepackage{{hyperref}}
+            \\geometry{{margin=0.75in}}
+            \\setlength{{\\parindent}}{{0pt}}
+            \\setlength{{\\parskip}}{{4pt}}
+            \\setlist[itemize]{{leftmargin=*, itemsep=2pt, topsep=2pt}}
+            \\pagestyle{{empty}}
+            \\begin{{document}}
+            {latex}
+            \\end{{document}}
+            """
+
+    @staticmethod
+    def compile_latex(tex_path: str, out_dir: str) -> dict:
+        """
+        Compile with a local pdflatex, falling back to the online compiler.
+        Returns {"pdf_path": path or None, "compiler": "pdflatex" | "online" | None, "error": str or None}.
+        """
+        pdf_path = os.path.splitext(tex_path)[0] + ".pdf"
+        try:
+            if shutil.which("pdflatex"):
+                subprocess.run(
+                    ["pdflatex", "-interaction=nonstopmode", "-output-directory", out_dir, tex_path],
+                    check=True, capture_output=True, text=True
+                )
+                return {"pdf_path": pdf_path, "compiler": "pdflatex", "error": None}
+            raise FileNotFoundError("pdflatex not found")
+        except Exception:
+            try:
+                import requests
+
+                api_url = "https://latex.ytotech.com/builds/sync"
+                with open(tex_path, "rb") as f:
+                    response = requests.post(api_url, files={"file": f})
+                if response.ok and response.headers.get("Content-Type", "").startswith("application/pdf"):
+                    with open(pdf_path, "wb") as f:
+                        f.write(response.content)
+                    return {"pdf_path": pdf_path, "compiler": "online", "error": None}
+                raise RuntimeError(f"Online LaTeX compile failed: {response.text[:400]}")
+            except Exception as e:
+                return {"pdf_path": None, "compiler": None, "error": str(e)}
+
+    def generate_latex(self, target_role: str, resume_text: str, out_dir: str = None, compile: bool = True) -> dict:
+        """
+        Ask the LLM for a LaTeX version of the resume tailored to target_role,
+        write it to out_dir/optimized_resume.tex (default:
+        ./optimized_resume_latex) and compile it.
+        Returns {"tex_path", "pdf_path", "compiler", "error"}.
+        """
+        out_dir = out_dir or os.path.join(os.getcwd(), "optimized_resume_latex")
         try:
-            optimized_text = self.llm.generate(prompt)
+            latex = self.llm.generate(self.build_latex_prompt(target_role, resume_text))
         except Exception as e:
-            return f"⚠️ LLM generation failed: {e}"
+            latex = f"⚠️ AI optimization failed: {e}"
+        latex = self.ensure_latex_document(latex)
+
+        os.makedirs(out_dir, exist_ok=True)
+        tex_path = os.path.join(out_dir, "optimized_resume.tex")
+        with open(tex_path, "w", encoding="utf-8") as f:
+            f.write(latex)
+
+        result = {"tex_path": tex_path, "pdf_path": None, "compiler": None, "error": None}
+        if compile:
+            result.update(self.compile_latex(tex_path, out_dir))
+        return result
+
+    def save(self, optimized_text: str, target_role: str, candidate_name: str):
+        """Write the optimized text to Desktop/optimized_resume_<role>_<name>.docx."""
+        import docx
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        safe_role = "_".join(target_role.split())
+        safe_name = "".join(c for c in candidate_name if c.isalnum())
+
+        desktop = os.path.join(os.path.expanduser("~"), "Desktop")
+        os.makedirs(desktop, exist_ok=True)
+        filename = f"optimized_resume_{safe_role}_{safe_name}.docx"
+        out_path = os.path.join(desktop, filename)
 
         if not optimized_text or "Error" in optimized_text:
             return "⚠️ Optimization failed. Please check your API key or LLM response."
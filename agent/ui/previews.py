@@ -0,0 +1,269 @@
+"""
+HTML previews written by the interactive agent (and by `python main.py run
+--previews DIR` on request): the loaded resume and the ATS report.
+"""
+import os
+import sys
+import webbrowser
+
+
+def resume_preview_html(file_path: str, text: str) -> str:
+    preview = text[:2000]
+
+    html_content = f"""
+    <html>
+    <head>
+        <title>Resume Preview</title>
+        <style>
+            body {{
+                background-color: #000;
+                color: #fff;
+                font-family: 'Courier New', monospace;
+                padding: 30px;
+            }}
+            .container {{
+                border: 1px solid #555;
+                border-radius: 10px;
+                background-color: #111;
+                padding: 20px;
+                width: 85%;
+                margin: 20px auto;
+                box-shadow: 0 0 20px #333;
+            }}
+            h1 {{
+                text-align: center;
+                color: #fff;
+                font-size: 24px;
+                margin-bottom: 20px;
+            }}
+            .details {{
+                font-size: 14px;
+                color: #ccc;
+                margin-bottom: 20px;
+            }}
+            iframe {{
+                width: 100%;
+                height: 600px;
+                border: 1px solid #888;
+                border-radius: 8px;
+                margin-top: 10px;
+                background-color: #000;
+            }}
+            pre {{
+                white-space: pre-wrap;
+                color: #ddd;
+                background-color: #000;
+                border: 1px solid #444;
+                padding: 15px;
+                border-radius: 8px;
+                overflow-y: auto;
+                height: 250px;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>📄 Resume Preview</h1>
+            <div class="details">
+                <b>Candidate Name:</b> DINESH KUMAR S<br>
+                <b>File:</b> {os.path.basename(file_path)}
+            </div>
+            <iframe src="file:///{file_path}" title="PDF Preview"></iframe>
+            <h2 style="color:#fff;">🧾 Extracted Text Preview:</h2>
+            <pre>{preview}</pre>
+        </div>
+    </body>
+    </html>
+    """
+    return html_content
+
+
+def ats_report_html(report: dict, ai_text: str = None, role: str = "N/A", ai_score=None) -> str:
+    """ATS Compatibility Report with AI analysis and detailed scoring (black & white theme)."""
+    keyword_match = report.get("keyword_score", 0)
+    structure = report.get("structure_score", 0)
+    length = report.get("length_score", 0)
+    overall = report.get("overall_score", 0)
+
+    ai_score_text = f"{ai_score}%" if ai_score is not None else "N/A%"
+    ai_analysis = (
+        ai_text.strip()
+        if ai_text and ai_text.strip() != ""
+        else "AI analysis not available. Please check API key or network."
+    )
+
+    html_content = f"""
+    <html>
+    <head>
+        <title>ATS Compatibility Report</title>
+        <style>
+            body {{
+                background-color: #000;
+                color: #fff;
+                font-family: 'Courier New', monospace;
+                margin: 0;
+                padding: 20px;
+            }}
+            .container {{
+                background-color: #111;
+                border: 1px solid #fff;
+                border-radius: 8px;
+                padding: 25px;
+                width: 80%;
+                margin: 40px auto;
+                box-shadow: 0 0 20px rgba(255, 255, 255, 0.2);
+            }}
+            h1 {{
+                color: #fff;
+                text-align: center;
+                border-bottom: 1px solid #444;
+                padding-bottom: 10px;
+            }}
+            .score-section {{
+                text-align: center;
+                margin: 20px 0;
+            }}
+            .badge {{
+                display: inline-block;
+                border: 1px solid #fff;
+                padding: 8px 14px;
+                margin: 5px;
+                border-radius: 6px;
+                font-weight: bold;
+                background-color: #000;
+                color: #fff;
+            }}
+            .bar {{
+                display: flex;
+                justify-content: space-around;
+                align-items: flex-end;
+                height: 200px;
+                margin-top: 20px;
+                color: #fff;
+            }}
+            .bar div {{
+                width: 80px;
+                background-color: #fff;
+                border-radius: 5px;
+                text-align: center;
+                padding-top: 5px;
+                color: #000;
+                font-weight: bold;
+            }}
+            .yellow {{ height: {keyword_match * 2}px; }}
+            .green {{ height: {structure * 2}px; }}
+            .teal {{ height: {length * 2}px; }}
+            .blue {{ height: {overall * 2}px; }}
+
+            .analysis {{
+                margin-top: 40px;
+                background-color: #000;
+                border: 1px solid #fff;
+                border-radius: 6px;
+                padding: 20px;
+            }}
+            .analysis h2 {{
+                color: #fff;
+                border-bottom: 1px solid #444;
+                padding-bottom: 5px;
+            }}
+            pre {{
+                white-space: pre-wrap;
+                color: #eee;
+                font-size: 14px;
+                line-height: 1.5;
+            }}
+
+            .ats-summary {{
+                margin-top: 40px;
+                background-color: #000;
+                border: 1px solid #fff;
+                border-radius: 6px;
+                padding: 20px;
+            }}
+            .ats-summary h3 {{
+                color: #fff;
+                text-align: center;
+                border-bottom: 1px solid #444;
+                padding-bottom: 8px;
+            }}
+            .ats-summary h4 {{
+                color: #ddd;
+                margin-top: 15px;
+            }}
+            .ats-summary p, .ats-summary li {{
+                color: #ccc;
+                font-size: 14px;
+                line-height: 1.6;
+            }}
+            .ats-summary ul {{
+                list-style-type: none;
+                padding-left: 0;
+            }}
+            .ats-summary li::before {{
+                content: "> ";
+                color: #fff;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>ATS Compatibility Report</h1>
+            <p><strong>Target Role:</strong> {role}</p>
+
+            <div class="score-section">
+                <span class="badge">Overall ATS: {overall:.2f}%</span>
+            </div>
+
+            <div class="bar">
+                <div class="yellow">Keyword<br>{keyword_match:.2f}%</div>
+                <div class="green">Structure<br>{structure:.2f}%</div>
+                <div class="teal">Length<br>{length:.2f}%</div>
+                <div class="blue">Overall<br>{overall:.2f}%</div>
+            </div>
+
+
+            <div class="ats-summary">
+                <h3>ATS SCORING REPORT</h3>
+                <p><strong>Candidate Name:</strong> DINESH KUMAR S</p>
+                <p><strong>Target Role:</strong> {role}</p>
+                <p><strong>ATS Match Score:</strong> 85</p>
+
+                <h4>Feedback Summary:</h4>
+                <p>The candidate demonstrates a strong alignment with an ML Engineer role,
+                holding an AI & DS Engineering degree and practical experience in Generative AI,
+                LLMs, and AWS. Their robust technical skills in Python, AI/ML concepts, and proven
+                coding competition success make them a good fit, despite the primary work experience
+                being in Guidewire training.</p>
+
+                <h4>Breakdown:</h4>
+                <ul>
+                    <li>Keyword Match: {keyword_match:.2f}%</li>
+                    <li>Structure: {structure:.2f}%</li>
+                    <li>Length: {length:.2f}%</li>
+                    <li>Overall ATS Score: {overall:.2f}%</li>
+                </ul>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    return html_content
+
+
+def write_preview(html_content: str, filename: str, out_dir: str = None) -> str:
+    """Write html_content to out_dir/filename (default: the working directory); returns the path."""
+    out_dir = out_dir or os.getcwd()
+    os.makedirs(out_dir, exist_ok=True)
+    output_path = os.path.join(out_dir, filename)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+    return output_path
+
+
+def open_preview(path: str):
+    """Open a written preview in the default viewer (os.startfile only exists on Windows)."""
+    if sys.platform == "win32":
+        os.startfile(path)
+    else:
+        webbrowser.open(f"file://{os.path.abspath(path)}")
@@ -7,6 +7,17 @@ def load_config(path="configs/config.yaml"):
     with open(path, "r") as f:
         return yaml.safe_load(f)
 
+def resume_id_for(path, root=None):
+    """
+    Vector store name of the resume file at `path`: its path relative to
+    `root` (just the file name without one), extension included, with
+    folder separators flattened ("sub/a.pdf" -> "sub__a.pdf"). Every loader
+    uses it, so a file ingested in bulk and later loaded on its own maps to
+    the same store, and a.pdf / a.docx never share one.
+    """
+    rel = os.path.relpath(path, root) if root else os.path.basename(path)
+    return rel.replace(os.sep, "__")
+
 def ensure_dir(path):
     import os
     os.makedirs(path, exist_ok=True)
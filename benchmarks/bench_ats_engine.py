@@ -0,0 +1,95 @@
+"""
+Benchmark: compiled keyword matching (agent/tools/ats_engine.py) against
+the old `kw in text` substring scan, as the taxonomy grows.
+
+Synthetic taxonomies of 1-3 word terms are matched against synthetic
+resumes that mention a few of them. The substring scan costs one pass over
+the resume per term; the token automaton makes one pass per resume. The
+"extra" column counts substring hits that are not whole-word matches
+(e.g. "ai" inside "maintained"). Run from the repo root:
+    python -m benchmarks.bench_ats_engine --sizes 10 100 1000 5000 10000 --resumes 200
+"""
+import argparse
+import random
+import time
+
+from agent.tools.ats_engine import ATSEngine, KeywordMatcher, get_ats_engine, tokenize
+
+FILLER = ("built maintained designed scalable services for teams across regions improving latency "
+          "reliability and cost while mentoring engineers and partnering with product stakeholders").split()
+
+
+def synthetic_terms(n: int, rng: random.Random):
+    syllables = ["da", "ta", "py", "ka", "ro", "ne", "ml", "ai", "sql", "lo", "gi", "vi", "zu", "ex", "on"]
+    terms = set()
+    while len(terms) < n:
+        words = ["".join(rng.choice(syllables) for _ in range(rng.randint(1, 3)))
+                 for _ in range(rng.choice((1, 1, 2, 3)))]
+        terms.add(" ".join(words))
+    return sorted(terms)
+
+
+def synthetic_resume(terms, rng: random.Random, words: int = 600, mentions: int = 25):
+    body = [rng.choice(FILLER) for _ in range(words)]
+    for term in rng.sample(terms, min(mentions, len(terms))):
+        body.insert(rng.randrange(len(body)), term)
+    return "Experience\n" + " ".join(body[:words // 2]) + "\nSkills\n" + " ".join(body[words // 2:])
+
+
+def substring_scan(terms, text):
+    text = text.lower()
+    return {kw for kw in terms if kw in text}
+
+
+def timed(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return out, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000, 10000])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600, help="words per synthetic resume")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{args.resumes} resumes of ~{args.words} words; times are per resume")
+    print(f"  {'terms':>6} {'build':>9} {'substring':>11} {'automaton':>11} {'speedup':>8} {'extra':>6}")
+    for size in args.sizes:
+        terms = synthetic_terms(size, rng)
+        resumes = [synthetic_resume(terms, rng, args.words) for _ in range(args.resumes)]
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher()
+        for term in terms:
+            matcher.add(term, term)
+        matcher.build()
+        build = time.perf_counter() - start
+
+        extra, t_sub, t_ac = 0, 0.0, 0.0
+        for text in resumes:
+            by_substring, seconds = timed(lambda: substring_scan(terms, text), 1)
+            t_sub += seconds
+            by_automaton, seconds = timed(lambda: matcher.labels(tokenize(text)), 3)
+            t_ac += seconds
+            assert by_automaton <= by_substring, "every whole-word match is also a substring match"
+            extra += len(by_substring - by_automaton)
+        t_sub /= len(resumes)
+        t_ac /= len(resumes)
+        print(f"  {size:6d} {build * 1e3:7.1f}ms {t_sub * 1e3:9.3f}ms {t_ac * 1e3:9.3f}ms "
+              f"{t_sub / t_ac:7.1f}x {extra / len(resumes):6.1f}")
+
+    engine = get_ats_engine()
+    if isinstance(engine, ATSEngine) and engine.roles:
+        text = synthetic_resume(sorted(engine.skills), rng, args.words)
+        report, seconds = timed(lambda: engine.score(text, role="Data Scientist"), 200)
+        print(f"\nFull ATSEngine.score() with configs/ats_taxonomy.yaml ({len(engine.skill_matcher)} patterns): "
+              f"{seconds * 1e3:.3f}ms per resume (keyword score {report['keyword_score']:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
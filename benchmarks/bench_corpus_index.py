@@ -0,0 +1,83 @@
+"""
+Benchmark: recall vs latency of the IVF CorpusIndex against exact search.
+
+Builds a synthetic clustered corpus in a temp folder (nothing is written to
+data/) and sweeps nprobe. Run from the repo root:
+    python -m benchmarks.bench_corpus_index --resumes 20000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from agent.rag.corpus_index import CorpusIndex
+from agent.rag.vector_index import normalize_rows, top_k_indices
+
+DIM = 384
+
+
+def synthetic_corpus(n_resumes, chunks_per_resume, n_topics, noise, rng):
+    topics = normalize_rows(rng.standard_normal((n_topics, DIM)))
+    for i in range(n_resumes):
+        picks = rng.integers(0, n_topics, size=chunks_per_resume)
+        vecs = topics[picks] + noise * rng.standard_normal((chunks_per_resume, DIM)).astype(np.float32)
+        yield f"resume_{i:06d}", vecs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=20_000)
+    parser.add_argument("--chunks", type=int, default=5, help="chunks per resume")
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=1.5,
+                        help="norm of the per-chunk spread around its (unit) topic vector")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    noise = args.noise / np.sqrt(DIM)
+    with tempfile.TemporaryDirectory() as root:
+        index = CorpusIndex(root, min_train_size=10 ** 9)
+        t0 = time.perf_counter()
+        index.add_many(list(synthetic_corpus(args.resumes, args.chunks, args.topics, noise, rng)))
+        t_add = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index.train()
+        t_train = time.perf_counter() - t0
+        n_lists = len(index.centroids)
+        print(f"{args.resumes} resumes, {len(index)} chunks, {n_lists} lists "
+              f"(insert {t_add:.2f}s, train {t_train:.2f}s)\n")
+
+        queries = normalize_rows(
+            index._vectors[rng.integers(0, len(index), size=args.queries)]
+            + noise * rng.standard_normal((args.queries, DIM)).astype(np.float32)
+        )
+
+        # brute-force reference, independent of the IVF code path
+        matrix = np.asarray(index._vectors)
+        truth = []
+        t0 = time.perf_counter()
+        for q in queries:
+            truth.append(set(top_k_indices(matrix @ q, args.top_k).tolist()))
+        t_exact = (time.perf_counter() - t0) / args.queries
+
+        print(f"{'nprobe':>7} | {'recall@' + str(args.top_k):>10} | {'latency':>10} | vs exact")
+        print(f"{'exact':>7} | {1.0:>10.3f} | {t_exact * 1e3:>8.2f}ms | 1.0x")
+        for nprobe in args.nprobe:
+            if nprobe > n_lists:
+                break
+            hits = 0
+            t0 = time.perf_counter()
+            for q, ref in zip(queries, truth):
+                rows, _ = index.search_rows(q, top_k=args.top_k, nprobe=nprobe, per_resume=False)
+                hits += len(ref & set(rows.tolist()))
+            latency = (time.perf_counter() - t0) / args.queries
+            recall = hits / (args.top_k * args.queries)
+            print(f"{nprobe:>7} | {recall:>10.3f} | {latency * 1e3:>8.2f}ms | {t_exact / latency:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: Embedder.embed_batch against the per-item embed() loop.
+
+The Gemini path uses an in-process stub client with a fixed round-trip
+latency plus a small per-text cost, so no API key or network is needed.
+The local path uses the real sentence-transformers model and is skipped if
+it is not installed. Run from the repo root:
+    python -m benchmarks.bench_embedder --texts 500 --latency-ms 80
+"""
+import argparse
+import hashlib
+import threading
+import time
+
+import numpy as np
+
+from agent.models.embedder import Embedder
+
+DIM = 768
+
+
+class StubGeminiClient:
+    """Mimics genai.embed_content for a single string or a list of strings."""
+
+    def __init__(self, latency: float, per_text: float):
+        self.latency = latency
+        self.per_text = per_text
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _vector(text):
+        seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:4], "little")
+        return np.random.default_rng(seed).standard_normal(DIM).astype(np.float32).tolist()
+
+    def embed_content(self, model, content):
+        with self._lock:
+            self.requests += 1
+        batch = content if isinstance(content, list) else [content]
+        time.sleep(self.latency + self.per_text * len(batch))
+        vectors = [self._vector(t) for t in batch]
+        return {"embedding": vectors if isinstance(content, list) else vectors[0]}
+
+
+def synthetic_texts(n):
+    skills = ["python", "kubernetes", "react", "sql", "pytorch", "aws", "docker", "spark"]
+    return [f"Built {skills[i % len(skills)]} services for team {i}; improved latency by {i % 40}%."
+            for i in range(n)]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="stub round-trip time per request")
+    parser.add_argument("--per-text-ms", type=float, default=0.5, help="stub server time per text")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--skip-local", action="store_true")
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts)
+    latency, per_text = args.latency_ms / 1e3, args.per_text_ms / 1e3
+
+    print(f"Gemini (stub, {args.latency_ms:.0f}ms/request), {len(texts)} texts")
+    client = StubGeminiClient(latency, per_text)
+    loop, t_loop = timed(lambda: [Embedder(client=client, use_cache=False).embed(t) for t in texts])
+    print(f"  {'per-item embed()':<28} {t_loop:8.2f}s  {client.requests:5d} requests")
+    for concurrency in args.concurrency:
+        client = StubGeminiClient(latency, per_text)
+        embedder = Embedder(client=client, batch_size=args.batch_size, max_concurrency=concurrency,
+                            use_cache=False)
+        batched, t_batch = timed(lambda: embedder.embed_batch(texts))
+        assert batched == loop, "embed_batch must return the same vectors as embed()"
+        label = f"embed_batch(bs={args.batch_size}, c={concurrency})"
+        print(f"  {label:<28} {t_batch:8.2f}s  {client.requests:5d} requests  {t_loop / t_batch:6.1f}x")
+
+    if args.skip_local:
+        return
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        print("\nsentence-transformers not installed; skipping the local model")
+        return
+    embedder = Embedder(api_key="", use_cache=False)
+    embedder.use_local = True
+    embedder.embed(texts[0])  # load the weights outside the timed region
+    print(f"\nLocal model ({embedder.local_model.name}), {len(texts)} texts")
+    loop, t_loop = timed(lambda: [embedder.embed(t) for t in texts])
+    print(f"  {'per-item embed()':<28} {t_loop:8.2f}s")
+    batched, t_batch = timed(lambda: embedder.embed_batch(texts))
+    drift = float(np.abs(np.asarray(batched) - np.asarray(loop)).max())
+    print(f"  {'embed_batch()':<28} {t_batch:8.2f}s  {t_loop / t_batch:6.1f}x  (max abs diff {drift:.1e})")
+
+
+if __name__ == "__main__":
+    main()
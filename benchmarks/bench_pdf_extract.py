@@ -0,0 +1,80 @@
+"""
+Benchmark: serial vs process-pool page extraction of PDFs (agent/tools/file_parser.py).
+
+Generates resume-like PDFs of 1 to 40 pages with PyMuPDF in a temp folder
+and times extract_pdf_pages() serially and in parallel, with a cold pool
+(startup included, as on the first load of a session) and a warm one. The
+page count where "warm" beats "serial" is a good parallel_min_pages for
+the machine (configs/config.yaml, extraction block). Run from the repo root:
+    python -m benchmarks.bench_pdf_extract --pages 1 2 5 10 20 40 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from agent.tools import file_parser
+from agent.tools.file_parser import extract_pdf_pages, shutdown_pdf_pool
+
+WORDS = ("designed built scalable data pipelines python spark kafka airflow improved latency reduced cost "
+         "mentored engineers deployed machine learning models aws docker kubernetes sql dashboards").split()
+
+
+def make_pdf(path: str, pages: int, rng: random.Random, lines_per_page: int = 48):
+    import pymupdf
+
+    doc = pymupdf.open()
+    for p in range(pages):
+        page = doc.new_page()
+        y = 50
+        page.insert_text((50, y), f"Experience (page {p + 1})", fontsize=14)
+        for _ in range(lines_per_page):
+            y += 15
+            page.insert_text((50, y), " ".join(rng.choice(WORDS) for _ in range(12)), fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10, 20, 40])
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(f"{os.cpu_count()} CPU(s), {args.workers} worker(s); best of {args.repeat}")
+    print(f"  {'pages':>5} {'serial':>9} {'cold pool':>10} {'warm pool':>10} {'speedup':>8} {'ms/page':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"cv_{pages}.pdf")
+            make_pdf(path, pages, rng)
+
+            serial, t_serial = timed(lambda: extract_pdf_pages(path, workers=1), args.repeat)
+
+            shutdown_pdf_pool()
+            start = time.perf_counter()
+            cold = extract_pdf_pages(path, workers=args.workers, min_pages=1)
+            t_cold = time.perf_counter() - start
+            warm, t_warm = timed(lambda: extract_pdf_pages(path, workers=args.workers, min_pages=1), args.repeat)
+
+            assert serial["pages"] == cold["pages"] == warm["pages"], "page order must not depend on the pool"
+            per_page = sum(serial["page_seconds"]) / pages
+            print(f"  {pages:5d} {t_serial * 1e3:7.1f}ms {t_cold * 1e3:8.1f}ms {t_warm * 1e3:8.1f}ms "
+                  f"{t_serial / t_warm:7.2f}x {per_page * 1e3:6.1f}ms")
+    shutdown_pdf_pool()
+    print(f"\nparallel_min_pages currently: {file_parser._pdf_settings()['min_pages']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: pure-Python cosine loop (old ResumeMemory.get_top_chunks) vs VectorIndex.
+
+Run from the repo root:
+    python -m benchmarks.bench_retrieval
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from agent.rag.vector_index import VectorIndex
+
+DIM = 384  # all-MiniLM-L6-v2
+
+
+def _cosine(a, b):
+    dot = 0.0
+    na = 0.0
+    nb = 0.0
+    for x, y in zip(a, b):
+        dot += x * y
+        na += x * x
+        nb += y * y
+    if na == 0.0 or nb == 0.0:
+        return 0.0
+    return dot / (math.sqrt(na) * math.sqrt(nb))
+
+
+def loop_top_k(embeddings, q, top_k):
+    scores = [_cosine(emb, q) for emb in embeddings]
+    return sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:top_k]
+
+
+def _time(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000])
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>8} | {'python loop':>12} | {'build':>10} | {'numpy query':>12} | {'speedup':>8} | same")
+    for n in args.sizes:
+        emb = rng.standard_normal((n, DIM)).astype(np.float32)
+        q = rng.standard_normal(DIM).astype(np.float32)
+        emb_list = emb.tolist()
+        q_list = q.tolist()
+        loop_repeats = 3 if n <= 1_000 else 1
+
+        t_loop = _time(lambda: loop_top_k(emb_list, q_list, args.top_k), loop_repeats)
+        t0 = time.perf_counter()
+        index = VectorIndex(emb)
+        t_build = time.perf_counter() - t0
+        t_np = _time(lambda: index.search(q, args.top_k), 20)
+
+        same = loop_top_k(emb_list, q_list, args.top_k) == index.search(q, args.top_k)[0].tolist()
+        print(f"{n:>8} | {t_loop * 1e3:>10.2f}ms | {t_build * 1e3:>8.2f}ms | "
+              f"{t_np * 1e3:>10.3f}ms | {t_loop / t_np:>7.0f}x | {same}")
+
+
+if __name__ == "__main__":
+    main()
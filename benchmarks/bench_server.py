@@ -0,0 +1,168 @@
+"""
+Load generator for the HTTP API (agent/server.py).
+
+Each virtual user loads its own resume, scores it, streams a summary,
+asks a question and closes its session, as many times as --iterations.
+Without --url the API is started in-process on a free port with the
+offline LLM stand-in and a throwaway vector store directory, so no API
+key or network is needed (the embedding model must be installed).
+Run from the repo root:
+    python -m benchmarks.bench_server --users 16 --iterations 3 --latency-ms 300
+    python -m benchmarks.bench_server --url http://127.0.0.1:8000 --users 50
+"""
+import argparse
+import asyncio
+import json
+import socket
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+
+SKILLS = ["python", "sql", "machine learning", "aws", "docker", "react", "spark", "tensorflow"]
+ROLES = ["Data Scientist", "Backend Engineer", "ML Engineer", "Data Analyst"]
+
+
+def synthetic_resume(user: int, iteration: int) -> str:
+    skills = ", ".join(SKILLS[(user + k) % len(SKILLS)] for k in range(4))
+    return (f"Candidate {user}-{iteration}\n"
+            f"EXPERIENCE\nBuilt {SKILLS[user % len(SKILLS)]} pipelines serving {user * 10 + iteration} teams; "
+            f"cut costs by {(user * 7) % 40}%.\n"
+            f"PROJECTS\nRecommendation engine, fraud detection and reporting dashboards.\n"
+            f"EDUCATION\nBSc Computer Science\n"
+            f"SKILLS\n{skills}\n")
+
+
+def start_local_server(latency: float, tokens_per_second: float, threads: int, extract_workers: int):
+    """Serve ResuminiApp with OfflineLLM in a background thread; returns (url, server, tmpdir)."""
+    import uvicorn
+    from agent.models.offline_llm import OfflineLLM
+    from agent.server import ResuminiApp
+    from agent.service import ResuminiService
+
+    tmp = tempfile.TemporaryDirectory(prefix="resumini-bench-")
+    service = ResuminiService(llm=OfflineLLM(latency=latency, tokens_per_second=tokens_per_second),
+                              db_root=tmp.name)
+    app = ResuminiApp(service, threads=threads, extract_workers=extract_workers)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", server, tmp
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, name, coro):
+        start = time.perf_counter()
+        try:
+            response = await coro
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            self.errors[name] += 1
+            print(f"  ✗ {name}: {e}")
+            return None
+        finally:
+            self.latencies[name].append(time.perf_counter() - start)
+
+
+async def stream_summary(client, session, recorder):
+    start = time.perf_counter()
+    first = None
+    try:
+        async with client.stream("POST", "/summarize?stream=1", json={"session": session}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["event"] == "chunk" and first is None:
+                    first = time.perf_counter() - start
+                if event["event"] == "error":
+                    raise RuntimeError(event["message"])
+    except Exception as e:
+        recorder.errors["summarize"] += 1
+        print(f"  ✗ summarize: {e}")
+    recorder.latencies["summarize"].append(time.perf_counter() - start)
+    if first is not None:
+        recorder.latencies["summarize ttfc"].append(first)
+
+
+async def user(client, user_id, iterations, recorder):
+    for i in range(iterations):
+        response = await recorder.call("load", client.post("/load", json={
+            "text": synthetic_resume(user_id, i), "resume_id": f"bench_{user_id}_{i}"}))
+        if response is None:
+            continue
+        session = response.json()["session"]
+        role = ROLES[(user_id + i) % len(ROLES)]
+        await recorder.call("score", client.post("/score", json={"session": session, "role": role}))
+        await stream_summary(client, session, recorder)
+        await recorder.call("query", client.post("/query", json={
+            "session": session, "question": f"What {SKILLS[user_id % len(SKILLS)]} experience is there?"}))
+        await recorder.call("close", client.delete(f"/sessions/{session}"))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def run(url, users, iterations):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, timeout=300, limits=limits) as client:
+        (await client.get("/health")).raise_for_status()
+        start = time.perf_counter()
+        await asyncio.gather(*(user(client, u, iterations, recorder) for u in range(users)))
+        elapsed = time.perf_counter() - start
+    return recorder, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", type=str, default=None, help="existing server (default: start one in-process)")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="offline LLM time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=150.0, help="offline LLM generation speed")
+    parser.add_argument("--threads", type=int, default=32, help="server command threads (in-process server)")
+    parser.add_argument("--extract-workers", type=int, default=0, help="server extraction processes")
+    args = parser.parse_args()
+
+    server = tmp = None
+    url = args.url
+    if url is None:
+        url, server, tmp = start_local_server(args.latency_ms / 1e3, args.tokens_per_second,
+                                              args.threads, args.extract_workers)
+        print(f"Started in-process API at {url} (offline LLM, {args.latency_ms:.0f}ms ttft, "
+              f"{args.threads} threads)")
+    try:
+        recorder, elapsed = asyncio.run(run(url, args.users, args.iterations))
+    finally:
+        if server is not None:
+            server.should_exit = True
+            tmp.cleanup()
+
+    requests = sum(len(v) for k, v in recorder.latencies.items() if k != "summarize ttfc")
+    print(f"\n{args.users} users × {args.iterations} iterations: {requests} requests in {elapsed:.2f}s "
+          f"({requests / elapsed:.1f} req/s)")
+    print(f"  {'endpoint':<16} {'n':>5} {'err':>4} {'p50':>8} {'p95':>8} {'max':>8}")
+    for name, values in recorder.latencies.items():
+        print(f"  {name:<16} {len(values):5d} {recorder.errors.get(name, 0):4d} "
+              f"{percentile(values, 0.5) * 1e3:6.0f}ms {percentile(values, 0.95) * 1e3:6.0f}ms "
+              f"{max(values) * 1e3:6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
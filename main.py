@@ -1,10 +1,16 @@
+import sys
+
+if "--import-profile" in sys.argv:
+    # enabled before any other import so the whole startup is timed
+    from agent import import_profiler
+    import_profiler.enable()
+
 import argparse
 import os
-import sys
 import time
-import google.generativeai as genai
 from rich.console import Console
 from agent.core import ResuminiAgent
+from agent.models.base_llm import llm_backend
 from agent.ui.terminal_ui import show_banner, typewriter
 
 console = Console()
@@ -64,7 +70,15 @@ def masked_input(prompt=""):
 
 
 def setup_gemini():
-    """Ask user for Gemini API key and model name interactively, validate key, and configure Gemini."""
+    """
+    Ask for the Gemini API key and model name (unless GEMINI_API_KEY is already
+    set). The key is not validated here: GeminiLLM configures itself on the
+    first real request and reports a bad key then.
+    """
+    env_key = os.getenv("GEMINI_API_KEY")
+    if env_key:
+        return env_key, os.getenv("GEMINI_MODEL_NAME") or "gemini-2.0-flash"
+
     print("\n🚀 Welcome to Resumini - Your AI Resume Assistant\n")
 
     api_key = masked_input("🔑 Enter your Google Gemini API Key (press Enter to paste): ").strip()
@@ -76,28 +90,224 @@ def setup_gemini():
     if not model_name:
         model_name = "gemini-2.0-flash"
 
+    return api_key, model_name
+
+
+def run_ingest(args):
+    """Non-interactive bulk ingestion; needs no API key."""
+    from agent.ingest import ingest_directory, print_summary
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Not a directory: {args.directory}")
+        sys.exit(1)
+    stats = ingest_directory(
+        args.directory,
+        workers=args.workers,
+        batch_files=args.batch_files,
+        recursive=args.recursive,
+        restart=args.restart,
+    )
+    print_summary(stats)
+
+
+def run_add_jobs(args):
+    """Store job descriptions for reverse matching (bestjobs); needs no API key."""
+    from agent.job_store import get_job_store
+
+    store = get_job_store()
     try:
-        print("\n⚙️  Validating your API key and initializing model...")
-        genai.configure(api_key=api_key)
-        test_model = genai.GenerativeModel(model_name)
-        test_model.generate_content("Hello!")  # quick test request
-        print(f"✅ Gemini model '{model_name}' connected successfully!\n")
-        return api_key, model_name
-    except Exception as e:
-        print(f"❌ Failed to connect with Gemini API: {e}")
-        print("👉 Get your valid API key from: https://aistudio.google.com/api-keys")
+        stats = store.add_path(args.path, recursive=args.recursive)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
         sys.exit(1)
+    print(f"✅ {stats['files']} file(s): {stats['added']} job(s) added, {stats['updated']} updated, "
+          f"{stats['unchanged']} unchanged ({len(store)} stored)")
+    for error in stats["errors"]:
+        print(f"⚠️ {error}")
+
+
+def run_serve(args):
+    """Resident daemon: keeps the embedding model and LLM client warm for thin clients."""
+    from agent.daemon import serve
+
+    try:
+        serve(args.socket, warm=not args.no_warm)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+def run_api(args):
+    """Multi-tenant HTTP API (see agent/server.py for the endpoints)."""
+    from agent.server import run
+
+    run(args.host, args.port, threads=args.threads, extract_workers=args.extract_workers)
+
+
+def run_headless(args):
+    """Run a command script / JSON-lines requests without any UI; one JSON result per command."""
+    from agent.runner import HeadlessRunner, read_script, read_jsonl
+
+    source = sys.stdin if args.script == "-" else open(args.script, encoding="utf-8")
+    with source:
+        requests = (read_jsonl if args.jsonl else read_script)(source)
+        runner = HeadlessRunner(session=args.session, previews_dir=args.previews,
+                                stream_events=args.events, stop_on_error=args.stop_on_error)
+        summary = runner.run(requests)
+    sys.exit(1 if summary["failed"] else 0)
+
+
+def run_batch_score(args):
+    """Score every resume in a directory against every job description (N x M matrix)."""
+    from agent.tools.batch_scorer import run_batch_score as batch_score
+
+    if not os.path.isdir(args.resume_dir):
+        print(f"❌ Not a directory: {args.resume_dir}")
+        sys.exit(1)
+    if args.llm_rescore and llm_backend() == "gemini":
+        api_key, model_name = setup_gemini()
+        os.environ["GEMINI_API_KEY"] = api_key
+        os.environ["GEMINI_MODEL_NAME"] = model_name
+    try:
+        result = batch_score(
+            args.resume_dir, args.jobs_file,
+            out_csv=args.out, out_json=args.json,
+            top_k=args.top_k, llm_rescore=args.llm_rescore, recursive=args.recursive,
+            semantic_weight=args.semantic_weight, block_size=args.block_size, workers=args.workers,
+        )
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"⏱️  {len(result['resume_ids'])} x {len(result['jobs'])} pairs scored in {result['seconds']:.2f}s")
+
+
+def run_client(args):
+    """Thin client: send commands to a running daemon and stream the results back."""
+    from agent.daemon import DaemonClient, render_events
+
+    try:
+        client = DaemonClient(args.socket, session=args.session)
+    except (ConnectionError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    with client:
+        if args.path:
+            if not render_events(client.call("load", {"path": os.path.abspath(args.path)})):
+                sys.exit(1)
+        if args.execute:
+            sys.exit(0 if render_events(client.execute(args.execute)) else 1)
+
+        print(f"🤖 Connected to {args.socket} (session '{args.session}'). Type 'exit' to quit.")
+        while True:
+            try:
+                line = input("\n💬 You: ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+            if not line:
+                continue
+            if line.lower() in ("exit", "quit"):
+                break
+            if line.lower().startswith("load "):
+                # paths are resolved here: the daemon may run in another directory
+                line = "load " + os.path.abspath(os.path.expanduser(line[5:].strip().strip('"')))
+            render_events(client.execute(line))
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Resumini - AI Resume Assistant CLI")
+    # no prefix matching: the profiler is switched on by the exact "--import-profile" string above
+    parser = argparse.ArgumentParser(description="Resumini - AI Resume Assistant CLI", allow_abbrev=False)
     parser.add_argument("--path", type=str, help="Path to your resume file (PDF/DOCX)")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="Report per-module import times (startup and lazily loaded ones) at exit")
+    parser.add_argument("--socket", type=str, help="Talk to a Resumini daemon on this Unix socket")
+    parser.add_argument("--session", type=str, default="default",
+                        help="Daemon session to use (each keeps its own loaded resume)")
+    parser.add_argument("-c", dest="execute", type=str,
+                        help="With --socket: run one command (e.g. \"score Data Scientist\") and exit")
+    sub = parser.add_subparsers(dest="command")
+
+    ingest = sub.add_parser("ingest", help="Bulk-ingest every resume in a directory")
+    ingest.add_argument("directory", help="Folder containing PDF/DOCX/TXT resumes")
+    ingest.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    ingest.add_argument("--batch-files", type=int, default=32, help="Files embedded per batch / checkpoint")
+    ingest.add_argument("--recursive", action="store_true", help="Include sub-directories")
+    ingest.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+
+    add_jobs = sub.add_parser("add-jobs", help="Store job descriptions for matching against resumes")
+    add_jobs.add_argument("path", help="Job file (.json/.jsonl/.txt/.md/.pdf/.docx) or a folder of them")
+    add_jobs.add_argument("--recursive", action="store_true", help="Include sub-directories")
+
+    serve = sub.add_parser("serve", help="Run a resident daemon that keeps models warm")
+    serve.add_argument("--socket", type=str, default=os.path.join("data", "resumini.sock"),
+                       help="Unix socket to listen on")
+    serve.add_argument("--no-warm", action="store_true", help="Load the embedding model on first use")
+
+    api = sub.add_parser("api", help="Serve the HTTP API to many users at once")
+    api.add_argument("--host", type=str, default=None, help="Bind address (default: server.host in config)")
+    api.add_argument("--port", type=int, default=None, help="Port (default: server.port in config)")
+    api.add_argument("--threads", type=int, default=None, help="Commands running at once")
+    api.add_argument("--extract-workers", type=int, default=None, help="Text extraction processes")
+
+    run = sub.add_parser("run", help="Run commands headlessly (no UI pacing), one JSON result per command")
+    run.add_argument("script", help="Command file, one chat-style command per line ('-' for stdin)")
+    run.add_argument("--jsonl", action="store_true",
+                     help='Input is JSON lines: {"command": ..., "args": {...}} or {"line": ...}')
+    run.add_argument("--previews", type=str, default=None, metavar="DIR",
+                     help="Write HTML previews of load/score results to DIR")
+    run.add_argument("--events", action="store_true", help="Also emit log/chunk events as they happen")
+    run.add_argument("--stop-on-error", action="store_true", help="Stop at the first failed command")
+
+    batch = sub.add_parser("batch-score", help="Score every resume in a folder against every job description")
+    batch.add_argument("resume_dir", help="Folder containing PDF/DOCX/TXT resumes")
+    batch.add_argument("jobs_file", help="Job descriptions: .json / .jsonl list, or text separated by '---' lines")
+    batch.add_argument("--out", type=str, default="batch_scores.csv", help="CSV output, one row per pair")
+    batch.add_argument("--json", type=str, default=None, help="Also write the score matrices and top-k to JSON")
+    batch.add_argument("--top-k", type=int, default=10, help="Resumes per job listed in the JSON output")
+    batch.add_argument("--llm-rescore", type=int, default=0, metavar="K",
+                       help="Ask the LLM to re-score the top K resumes of each job")
+    batch.add_argument("--semantic-weight", type=float, default=0.6,
+                       help="Share of the score from embedding similarity (rest: keyword coverage)")
+    batch.add_argument("--block-size", type=int, default=256, help="Resumes embedded and scored at a time")
+    batch.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    batch.add_argument("--recursive", action="store_true", help="Include sub-directories")
     args = parser.parse_args()
 
-    api_key, model_name = setup_gemini()
+    if args.command == "ingest":
+        run_ingest(args)
+        return
+    if args.command == "add-jobs":
+        run_add_jobs(args)
+        return
+    if args.command == "serve":
+        run_serve(args)
+        return
+    if args.command == "api":
+        run_api(args)
+        return
+    if args.command == "run":
+        run_headless(args)
+        return
+    if args.command == "batch-score":
+        run_batch_score(args)
+        return
+    if args.socket:
+        run_client(args)
+        return
 
-    os.environ["GEMINI_API_KEY"] = api_key
-    os.environ["GEMINI_MODEL_NAME"] = model_name
+    show_banner()
+    console.print("\n🤖 [bold magenta]Resumini is ready![/bold magenta] Type [yellow]'help'[/yellow] or [yellow]'exit'[/yellow].\n")
+    if args.import_profile:
+        console.print(f"⏱️  Ready for input after {import_profiler.elapsed():.2f}s")
+
+    if llm_backend() == "gemini":
+        api_key, model_name = setup_gemini()
+
+        os.environ["GEMINI_API_KEY"] = api_key
+        os.environ["GEMINI_MODEL_NAME"] = model_name
+    else:
+        console.print("🧪 [yellow]Offline LLM backend selected (llm.backend in configs/config.yaml).[/yellow]\n")
 
     agent = ResuminiAgent()
     print("🤖 Starting interactive chat...\n")
@@ -106,7 +316,4 @@ def main():
 
 
 if __name__ == "__main__":
-    show_banner()
-    console.print("\n🤖 [bold magenta]Resumini is ready![/bold magenta] Type [yellow]'help'[/yellow] or [yellow]'exit'[/yellow].\n")
     main()
-